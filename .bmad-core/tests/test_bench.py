@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthetic fixture generator and benchmark harness
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from bmad_tools.bench import OPERATIONS, format_table, run_benchmarks
+from bmad_tools.core import load_yaml, verify_manifest
+from bmad_tools.fixtures import generate_tree
+
+
+class TestFixtures(unittest.TestCase):
+    """Synthetic tree generation"""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def test_generated_tree_counts(self):
+        """Requested counts are honoured and the manifest matches the files"""
+        base = generate_tree(self.root, agents=7, tasks=11, templates=5, stories=3, workflow_steps=9)
+        self.assertEqual(len(list((base / 'agents').glob('*.md'))), 7)
+        self.assertEqual(len(list((base / 'tasks').glob('*.md'))), 11)
+        self.assertEqual(len(list((base / 'templates').glob('*.yaml'))), 5)
+        self.assertEqual(len(list((self.root / 'docs' / 'stories').glob('*.md'))), 3)
+        workflow = load_yaml(base / 'workflows' / 'synthetic-workflow.yaml')
+        self.assertEqual(len(workflow['workflow']['sequence']), 9)
+        self.assertEqual(verify_manifest(load_yaml(base / 'install-manifest.yaml'), self.root), [])
+
+    def test_generation_is_deterministic(self):
+        """Same seed, same bytes"""
+        first = generate_tree(self.root / 'a', agents=3, tasks=3, templates=3, stories=3, seed=4)
+        second = generate_tree(self.root / 'b', agents=3, tasks=3, templates=3, stories=3, seed=4)
+        for path in sorted(first.rglob('*.*')):
+            self.assertEqual(path.read_bytes(), (second / path.relative_to(first)).read_bytes(), path.name)
+
+
+class TestManifest(unittest.TestCase):
+    """Verification against the shipped install-manifest.yaml"""
+
+    def test_real_manifest(self):
+        """Unmodified installed files verify; an edited one is reported"""
+        manifest = load_yaml(Path('.bmad-core') / 'install-manifest.yaml')
+        mismatches = verify_manifest(manifest, '.')
+        self.assertNotIn('.bmad-core/agents/dev.md', mismatches)
+        self.assertLess(len(mismatches), len(manifest['files']) // 4)
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root)
+        shutil.copytree('.bmad-core', root / '.bmad-core', ignore=shutil.ignore_patterns('tests'))
+        with open(root / '.bmad-core' / 'agents' / 'dev.md', 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.assertEqual(sorted(verify_manifest(manifest, root)), sorted(mismatches + ['.bmad-core/agents/dev.md']))
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Benchmark harness at a tiny scale"""
+
+    def test_all_operations_reported(self):
+        """Every operation yields a row per scale with throughput and memory"""
+        results = run_benchmarks(scales=[5, 10], repeat=1)
+        self.assertEqual(len(results), 2 * len(OPERATIONS))
+        for row in results:
+            self.assertGreater(row['items'], 0)
+            self.assertGreater(row['peak_kib'], 0)
+            self.assertIsNotNone(row['items_per_second'])
+        self.assertIn('manifest_hashing', format_table(results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental workflow artifact build engine
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from bmad_tools.build import BuildEngine, load_build_steps
+from bmad_tools.core import load_yaml
+
+WORKFLOW = {'workflow': {'id': 'diamond', 'sequence': [
+    {'agent': 'analyst', 'creates': 'brief.md'},
+    {'agent': 'pm', 'creates': 'prd.md', 'requires': 'brief.md'},
+    {'agent': 'ux-expert', 'creates': 'spec.md', 'requires': 'brief.md'},
+    {'agent': 'architect', 'creates': 'architecture.md', 'requires': ['prd.md', 'spec.md']},
+    {'agent': 'po', 'validates': 'all_artifacts'},
+]}}
+
+
+class RecordingRunner:
+    """Writes each output from its inputs and records call order and overlap"""
+
+    def __init__(self, delay=0.0, fail=()):
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.delay = delay
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+
+    def __call__(self, step, inputs, output):
+        with self.lock:
+            self.calls.append(step['output'])
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if step['output'] in self.fail:
+            raise RuntimeError('boom')
+        body = ''.join(p.read_text() for p in inputs)
+        output.write_text(f"{step['output']}<{body}>")
+
+
+class TestBuildEngine(unittest.TestCase):
+    """Staleness, ordering, parallelism and dry runs"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.docs = self.tmp / 'docs'
+        self.state = self.tmp / 'state.json'
+
+    def engine(self):
+        return BuildEngine(WORKFLOW, self.docs, self.state)
+
+    def test_first_build_runs_everything_in_order(self):
+        """Every step runs once, after its inputs, with independent steps in parallel"""
+        runner = RecordingRunner(delay=0.05)
+        results = self.engine().build(runner)
+        self.assertEqual(set(results.values()), {'built'})
+        self.assertEqual(runner.calls[0], 'brief.md')
+        self.assertEqual(runner.calls[-1], 'architecture.md')
+        self.assertEqual(runner.max_active, 2)
+
+    def test_nothing_to_do_when_unchanged(self):
+        """A second run with no changes rebuilds nothing"""
+        self.engine().build(RecordingRunner())
+        self.assertEqual(self.engine().plan(), [])
+
+    def test_only_downstream_of_change_rebuilds(self):
+        """Editing spec.md rebuilds architecture.md but not prd.md"""
+        self.engine().build(RecordingRunner())
+        (self.docs / 'spec.md').write_text('hand edited')
+        engine = self.engine()
+        planned = engine.plan()
+        self.assertEqual([(s['output'], r) for s, r in planned],
+                         [('architecture.md', ['input changed: spec.md'])])
+        runner = RecordingRunner()
+        engine.build(runner)
+        self.assertEqual(runner.calls, ['architecture.md'])
+        self.assertIn('hand edited', (self.docs / 'architecture.md').read_text())
+
+    def test_edited_outputs_reported(self):
+        """An output changed after its step built it is reported until the step rebuilds it"""
+        self.engine().build(RecordingRunner())
+        self.assertEqual(self.engine().edited_outputs(), [])
+        (self.docs / 'spec.md').write_text('hand edited')
+        self.assertEqual([s['output'] for s in self.engine().edited_outputs()], ['spec.md'])
+        (self.docs / 'spec.md').unlink()
+        self.engine().build(RecordingRunner())
+        self.assertEqual(self.engine().edited_outputs(), [])
+
+    def test_upstream_rebuild_propagates(self):
+        """A missing upstream output marks everything after it stale"""
+        self.engine().build(RecordingRunner())
+        (self.docs / 'brief.md').unlink()
+        outputs = [s['output'] for s, _ in self.engine().plan()]
+        self.assertEqual(outputs, ['brief.md', 'prd.md', 'spec.md', 'architecture.md'])
+
+    def test_targets_limit_the_plan(self):
+        """Building one target only plans its own dependency chain"""
+        outputs = [s['output'] for s, _ in self.engine().plan(['prd.md'])]
+        self.assertEqual(outputs, ['brief.md', 'prd.md'])
+
+    def test_failure_skips_dependents(self):
+        """Steps downstream of a failure are skipped and stay stale"""
+        results = self.engine().build(RecordingRunner(fail={'prd.md'}))
+        self.assertTrue(results['step-2'].startswith('failed'))
+        self.assertTrue(results['step-4'].startswith('skipped'))
+        self.assertEqual(results['step-3'], 'built')
+        self.assertEqual([s['output'] for s, _ in self.engine().plan()], ['prd.md', 'architecture.md'])
+
+    def test_real_workflow_dependencies(self):
+        """complex-problem-solving.yaml resolves task files and producer links"""
+        steps = load_build_steps(load_yaml('.bmad-core/workflows/complex-problem-solving.yaml'))
+        by_output = {s['output']: s for s in steps}
+        self.assertEqual(by_output['root-cause-analysis.md']['depends_on'], ['step-1'])
+        self.assertTrue(by_output['domain-research.md']['optional'])
+        greenfield = load_build_steps(load_yaml('.bmad-core/workflows/greenfield-fullstack.yaml'))
+        self.assertTrue(next(s for s in greenfield if s['output'] == 'v0_prompt')['optional'])
+
+    def test_optional_steps_only_built_on_request(self):
+        """A fresh build skips optional outputs unless they are targeted by name"""
+        workflow = load_yaml('.bmad-core/workflows/complex-problem-solving.yaml')
+        engine = BuildEngine(workflow, self.docs, self.state)
+        outputs = [s['output'] for s, _ in engine.plan()]
+        self.assertIn('root-cause-analysis.md', outputs)
+        self.assertNotIn('domain-research.md', outputs)
+        self.assertIn('domain-research.md', [s['output'] for s, _ in engine.plan(['domain-research.md'])])
+
+
+if __name__ == '__main__':
+    unittest.main()
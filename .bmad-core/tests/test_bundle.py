@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for deterministic, prefix-stable bundle emission
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from bmad_tools.bundle import (
+    BundleBuilder, END_MARKER, START_MARKER, prefix_report, shared_prefix_length, strip_volatile,
+)
+from bmad_tools.core import file_hash, load_yaml
+
+
+class TestBundleLayout(unittest.TestCase):
+    """Bundle ordering and byte stability"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.base_path = Path('.bmad-core')
+
+    def test_team_bundle_is_byte_identical(self):
+        """Two builds of the same team produce the same bytes"""
+        first = BundleBuilder.for_team('team-all', self.base_path).team_bundle()
+        second = BundleBuilder.for_team('team-all', self.base_path).team_bundle()
+        self.assertEqual(first, second)
+
+    def test_declaration_order_does_not_matter(self):
+        """Agent order in the team file does not change the shared prefix"""
+        forward = BundleBuilder(['pm', 'architect', 'po'], self.base_path)
+        backward = BundleBuilder(['po', 'architect', 'pm'], self.base_path)
+        self.assertEqual(forward.shared_layer(), backward.shared_layer())
+        self.assertEqual(forward.agent_bundle('pm'), backward.agent_bundle('pm'))
+
+    def test_volatile_content_is_last(self):
+        """core-config.yaml and the story come after all stable content"""
+        builder = BundleBuilder.for_team('team-ide-minimal', self.base_path)
+        text = builder.agent_bundle('dev', story='stories/story1.md')
+        config_at = text.index(START_MARKER.format('.bmad-core/core-config.yaml'))
+        story_at = text.index(START_MARKER.format('stories/story1.md'))
+        agent_at = text.index(START_MARKER.format('.bmad-core/agents/dev.md'))
+        self.assertLess(agent_at, config_at)
+        self.assertLess(config_at, story_at)
+        self.assertTrue(text.endswith(END_MARKER.format('stories/story1.md') + '\n\n'))
+
+    def test_shared_prefix_covers_shared_layer(self):
+        """Agents of one team share at least the whole shared layer"""
+        builder = BundleBuilder.for_team('team-fullstack', self.base_path)
+        shared = len(builder.shared_layer().encode('utf-8'))
+        bundles = {a: builder.agent_bundle(a) for a in builder.agent_ids}
+        for entry in prefix_report(bundles):
+            self.assertGreaterEqual(entry['shared_prefix'], shared, entry['agent'])
+
+    def test_installed_at_is_stripped(self):
+        """Volatile manifest keys never reach the bundle"""
+        text = "version: 1\ninstalled_at: '2025-08-18T23:59:39Z'\nfiles: []\n"
+        self.assertEqual(strip_volatile(text), "version: 1\nfiles: []\n")
+
+    def test_missing_dependencies_are_reported(self):
+        """Dependencies without a file are listed instead of failing the build"""
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        (tmp / 'agents').mkdir()
+        (tmp / 'tasks').mkdir()
+        (tmp / 'tasks' / 'real.md').write_text('# Real\n')
+        (tmp / 'core-config.yaml').write_text('devStoryLocation: docs/stories\n')
+        (tmp / 'agents' / 'solo.md').write_text(
+            "# solo\n```yaml\nagent:\n  id: solo\ndependencies:\n"
+            "  tasks:\n    - real.md\n    - ghost.md\n```\n")
+
+        builder = BundleBuilder(['solo'], tmp)
+        text = builder.agent_bundle('solo')
+        self.assertIn('# Real', text)
+        self.assertEqual(builder.missing, ['.bmad-core/tasks/ghost.md'])
+
+    def test_shared_prefix_length(self):
+        """Prefix length is measured in encoded bytes"""
+        self.assertEqual(shared_prefix_length('🧠ab', '🧠ac'), 5)
+        self.assertEqual(shared_prefix_length('', 'x'), 0)
+
+    def test_file_hash_matches_installer(self):
+        """file_hash reproduces the installer's hash for an unmodified file"""
+        manifest = load_yaml(self.base_path / 'install-manifest.yaml')
+        entry = next(e for e in manifest['files'] if e['path'] == '.bmad-core/agents/dev.md')
+        self.assertEqual(file_hash(entry['path']), entry['hash'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the disk-backed LRU response cache
+"""
+
+import multiprocessing
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from bmad_tools.cache import ResponseCache, input_hash
+
+
+def _worker(path, worker):
+    with ResponseCache(path) as cache:
+        for i in range(50):
+            cache.put('dev', 't', 'm', {'worker': worker, 'i': i}, f'{worker}-{i}')
+            assert cache.get('dev', 't', 'm', {'worker': worker, 'i': i}) == f'{worker}-{i}'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    """Keys, eviction, statistics and multi-process safety"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.path = self.tmp / 'cache.sqlite'
+
+    def test_hit_and_miss(self):
+        """A stored response is returned for identical key components only"""
+        with ResponseCache(self.path) as cache:
+            self.assertIsNone(cache.get('problem-solver', 'aaa', 'bbb', {'problem': 'x'}))
+            cache.put('problem-solver', 'aaa', 'bbb', {'problem': 'x'}, 'answer')
+            self.assertEqual(cache.get('problem-solver', 'aaa', 'bbb', {'problem': 'x'}), 'answer')
+            self.assertIsNone(cache.get('problem-solver', 'changed', 'bbb', {'problem': 'x'}))
+            self.assertIsNone(cache.get('analyst', 'aaa', 'bbb', {'problem': 'x'}))
+            stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 3, 1))
+
+    def test_input_normalization(self):
+        """Key order does not change the input hash; string content is compared exactly"""
+        self.assertEqual(input_hash({'a': 'slow checkout', 'b': [1, 2]}),
+                         input_hash({'b': [1, 2], 'a': 'slow checkout'}))
+        self.assertNotEqual(input_hash({'a': 'x'}), input_hash({'a': 'y'}))
+        self.assertNotEqual(input_hash({'content': '- a\n- b'}), input_hash({'content': '- a - b'}))
+        self.assertNotEqual(input_hash({'content': '```\n  x\n```'}), input_hash({'content': '```\nx\n```'}))
+
+    def test_failed_maintenance_rolls_back(self):
+        """An error inside evict() leaves no open transaction behind"""
+        with ResponseCache(self.path) as cache:
+            cache.put('dev', 't', 'm', 'q', 'kept')
+            cache._evict = lambda cursor, now: cursor.execute('DELETE FROM entries') and 1 / 0
+            with self.assertRaises(ZeroDivisionError):
+                cache.evict()
+            self.assertEqual(cache.get('dev', 't', 'm', 'q'), 'kept')
+            cache.clear()
+            self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_lru_size_eviction(self):
+        """The least recently used entries go first when over the byte limit"""
+        clock = FakeClock()
+        with ResponseCache(self.path, max_bytes=30, clock=clock) as cache:
+            for name in ('one', 'two', 'three'):
+                clock.now += 1
+                cache.put('dev', 't', 'm', name, 'x' * 10)
+            clock.now += 1
+            cache.get('dev', 't', 'm', 'one')
+            clock.now += 1
+            cache.put('dev', 't', 'm', 'four', 'x' * 10)
+            self.assertIsNotNone(cache.get('dev', 't', 'm', 'one'))
+            self.assertIsNone(cache.get('dev', 't', 'm', 'two'))
+            self.assertEqual(cache.stats()['entries'], 3)
+
+    def test_age_eviction(self):
+        """Entries older than max_age are misses and get removed"""
+        clock = FakeClock()
+        with ResponseCache(self.path, max_age=60, clock=clock) as cache:
+            cache.put('dev', 't', 'm', 'q', 'old')
+            clock.now += 61
+            self.assertIsNone(cache.get('dev', 't', 'm', 'q'))
+            self.assertEqual(cache.stats()['entries'], 0)
+            self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_concurrent_processes(self):
+        """Several processes can write and read the same store"""
+        ctx = multiprocessing.get_context('spawn')
+        procs = [ctx.Process(target=_worker, args=(str(self.path), n)) for n in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(60)
+        self.assertTrue(all(p.exitcode == 0 for p in procs))
+        with ResponseCache(self.path) as cache:
+            stats = cache.stats()
+        self.assertEqual(stats['entries'], 200)
+        self.assertEqual(stats['hits'], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
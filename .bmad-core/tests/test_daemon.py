@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the resident .bmad-core model daemon and its fallback client
+"""
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from bmad_tools.core import load_yaml, verify_manifest
+from bmad_tools.daemon import DaemonUnavailable, QueryError, TreeModel, query, request, serve
+from bmad_tools.fixtures import generate_tree
+
+
+class TestDaemon(unittest.TestCase):
+    """Queries over the socket, refresh on change, fallback and shutdown"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # Registered first so it runs last, after every server is stopped
+        self.addCleanup(self.tmp.cleanup)
+        self.base = generate_tree(Path(self.tmp.name), agents=3, tasks=6, templates=3, stories=2, workflow_steps=4)
+        self.socket = Path(self.tmp.name) / 'bmad.sock'
+
+    def _start(self):
+        ready = threading.Event()
+        thread = threading.Thread(target=serve, args=(self.socket, self.base), kwargs={'ready': ready.set},
+                                  daemon=True)
+        thread.start()
+        self.assertTrue(ready.wait(10))
+        self.addCleanup(self._stop, thread)
+        return thread
+
+    def _stop(self, thread):
+        if self.socket.exists():
+            request('shutdown', socket_path=self.socket)
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+
+    def test_lookup_deps_and_validate_over_socket(self):
+        """A running daemon answers lookups, dependency queries and a clean validation"""
+        self._start()
+        self.assertEqual(request('list', socket_path=self.socket, kind='agent'),
+                         ['agent-00000', 'agent-00001', 'agent-00002'])
+        agent = request('lookup', socket_path=self.socket, kind='agent', name='agent-00000')
+        self.assertEqual(agent['data']['agent']['id'], 'agent-00000')
+        deps = request('deps', socket_path=self.socket, agent='agent-00000')
+        self.assertTrue(deps and all(d['exists'] for d in deps))
+        result = request('validate', socket_path=self.socket)
+        self.assertEqual((result['errors'], result['manifest_mismatches']), ([], []))
+
+    def test_changed_file_is_reparsed(self):
+        """Editing a file refreshes only that entry and shows up in the next answer"""
+        self._start()
+        request('validate', socket_path=self.socket)
+        generation = request('ping', socket_path=self.socket)['generation']
+        task = self.base / 'tasks' / 'task-00000.md'
+        task.write_text('# Rewritten\n', encoding='utf-8')
+        self.assertEqual(request('lookup', socket_path=self.socket, kind='task', name='task-00000')['data'],
+                         '# Rewritten\n')
+        self.assertEqual(request('ping', socket_path=self.socket)['generation'], generation + 1)
+        self.assertEqual(request('validate', socket_path=self.socket)['manifest_mismatches'],
+                         ['.bmad-core/tasks/task-00000.md'])
+
+    def test_errors_do_not_stop_the_daemon(self):
+        """Bad queries come back as QueryError and the daemon keeps serving"""
+        self._start()
+        with self.assertRaises(QueryError):
+            request('lookup', socket_path=self.socket, kind='agent', name='missing')
+        with self.assertRaises(QueryError):
+            request('explode', socket_path=self.socket)
+        self.assertIn('agent-00001', request('bundle', socket_path=self.socket, agent='agent-00001')['text'])
+
+    def test_fallback_matches_daemon(self):
+        """Without a daemon query() answers in-process with the same result, unless fallback is off"""
+        local = query('deps', self.base, self.socket, agent='agent-00002')
+        with self.assertRaises(DaemonUnavailable):
+            query('ping', self.base, self.socket, fallback=False)
+        self._start()
+        self.assertEqual(query('deps', self.base, self.socket, fallback=False, agent='agent-00002'), local)
+
+    def test_shutdown_removes_socket(self):
+        """A shutdown request stops the server and removes its socket"""
+        thread = self._start()
+        request('shutdown', socket_path=self.socket)
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(self.socket.exists())
+
+    def test_manifest_check_agrees_with_installer(self):
+        """On the shipped tree the daemon reports exactly the files verify_manifest reports"""
+        manifest = load_yaml(Path('.bmad-core') / 'install-manifest.yaml')
+        model = TreeModel('.bmad-core')
+        model.refresh()
+        mismatches = model.op_validate()['manifest_mismatches']
+        self.assertEqual(sorted(mismatches), sorted(verify_manifest(manifest, '.')))
+        self.assertNotIn('.bmad-core/agents/dev.md', mismatches)
+
+
+if __name__ == '__main__':
+    unittest.main()
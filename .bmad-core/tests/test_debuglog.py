@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the structured dev debug log
+"""
+
+import json
+import multiprocessing
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from bmad_tools.debuglog import DebugLog, log_dir_for, render_markdown
+
+
+def _writer(path, worker):
+    log = DebugLog(path, segment_bytes=2048, max_bytes=10 ** 9)
+    for i in range(100):
+        log.append(f'{worker}-{i}', story='1.1', agent='dev', level='failure' if i % 10 == 0 else 'info')
+
+
+def _compacting_writer(path):
+    log = DebugLog(path, segment_bytes=600, max_bytes=3000)
+    for i in range(1500):
+        log.append(f'event {i} ' + 'x' * 40, story='1.1', level='failure' if i % 3 == 0 else 'info')
+
+
+class TestDebugLog(unittest.TestCase):
+    """Appends, queries, rotation, compaction and concurrent writers"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.path = self.tmp / 'debug-log'
+
+    def test_story_and_failure_queries(self):
+        """Queries answer from the index and return records oldest first"""
+        log = DebugLog(self.path, segment_bytes=300)
+        for i in range(20):
+            log.append(f'step {i}', story='1.2' if i % 2 else '1.1', agent='dev', task='develop-story',
+                       level='failure' if i % 5 == 0 else 'info')
+        self.assertGreater(len(log.segments()), 3)
+        self.assertEqual([r['message'] for r in log.for_story('1.2')], [f'step {i}' for i in range(1, 20, 2)])
+        self.assertEqual([r['message'] for r in log.last_failures(3)], ['step 5', 'step 10', 'step 15'])
+        self.assertEqual([r['message'] for r in log.last_failures(5, story='1.1')], ['step 0', 'step 10'])
+        self.assertIn('**failure** story=1.1 agent=dev task=develop-story: step 0', render_markdown(log.last_failures(4)))
+
+    def test_compaction_keeps_failures_first(self):
+        """Over the size limit, old info records go before old failures"""
+        log = DebugLog(self.path, segment_bytes=400, max_bytes=1500)
+        log.append('keep me', story='1.1', level='failure')
+        for i in range(60):
+            log.append(f'noise {i}', story='1.1')
+        self.assertLessEqual(log.total_bytes(), 1500 + 400 + 200)
+        self.assertEqual([r['message'] for r in log.last_failures(1)], ['keep me'])
+        self.assertNotIn('noise 0', [r['message'] for r in log.for_story('1.1')])
+
+        for i in range(200):
+            log.append(f'failure {i}', level='failure')
+        self.assertNotIn('keep me', [r['message'] for r in log.last_failures(1000)])
+
+    def test_concurrent_writers(self):
+        """Records from several processes are never interleaved or lost"""
+        ctx = multiprocessing.get_context('spawn')
+        procs = [ctx.Process(target=_writer, args=(str(self.path), n)) for n in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        log = DebugLog(self.path)
+        self.assertEqual(len(log.for_story('1.1')), 400)
+        self.assertEqual(len(log.last_failures(100)), 40)
+        for segment in self.path.glob('*.jsonl'):
+            for line in segment.read_text().splitlines():
+                json.loads(line)
+
+    def test_queries_during_compaction(self):
+        """Readers never see a compacted index paired with an old segment"""
+        ctx = multiprocessing.get_context('spawn')
+        writer = ctx.Process(target=_compacting_writer, args=(str(self.path),))
+        writer.start()
+        log = DebugLog(self.path)
+        while writer.is_alive():
+            for record in log.query(story='1.1'):
+                self.assertEqual(record['story'], '1.1')
+        writer.join()
+        self.assertEqual(writer.exitcode, 0)
+
+    def test_story_with_tabs_and_newlines(self):
+        """Control characters in a story value do not break the index"""
+        log = DebugLog(self.path, segment_bytes=200, max_bytes=600)
+        odd = 'epic\t1\nstory\\2'
+        log.append('first', story=odd, level='failure')
+        log.append('second', story='1.1')
+        self.assertEqual([r['message'] for r in log.for_story(odd)], ['first'])
+        self.assertEqual([r['message'] for r in log.for_story('1.1')], ['second'])
+        for i in range(20):
+            log.append(f'noise {i}', story='1.1')
+        self.assertEqual([r['message'] for r in log.for_story(odd)], ['first'])
+
+    def test_log_dir_for_config_path(self):
+        """devDebugLog .ai/debug-log.md maps to the .ai/debug-log folder"""
+        self.assertEqual(log_dir_for('.ai/debug-log.md'), Path('.ai/debug-log'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for elicitation session record and replay
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+from bmad_tools.elicitation import SessionRecorder, read_transcript, replay, run_session
+
+
+class TestElicitationReplay(unittest.TestCase):
+    """Recording a scripted session and replaying it against template changes"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.template_path = self.tmp / 'problem-definition-tmpl.yaml'
+        shutil.copy('.bmad-core/templates/problem-definition-tmpl.yaml', self.template_path)
+        self.transcript = self.tmp / 'session.jsonl.gz'
+
+        recorder = SessionRecorder(self.template_path)
+        choices = {}
+
+        def model(path, prompt):
+            return f"draft for {path} #{len(prompt)}"
+
+        def user(path, content):
+            # First elicit section: pick option 3, then feedback, then proceed
+            seen = choices.setdefault(path, [3, 'Mention the budget', 1] if not choices else [1])
+            return seen.pop(0)
+
+        self.document = run_session(recorder.template, model, user, recorder)
+        recorder.save(self.transcript)
+
+    def _edit_template(self, mutate):
+        data = yaml.safe_load(self.template_path.read_text())
+        mutate(data)
+        self.template_path.write_text(yaml.safe_dump(data, sort_keys=False))
+
+    def test_replay_without_changes(self):
+        """An unchanged template replays to the same document with no drift"""
+        result = replay(self.transcript, self.template_path)
+        self.assertTrue(result['ok'], result['drift'])
+        self.assertEqual(result['document'], self.document)
+
+    def test_transcript_records_choices_and_feedback(self):
+        """Numbered options and free-text feedback are both captured"""
+        header, events = read_transcript(self.transcript)
+        self.assertEqual(header['template'], 'problem-definition-v1')
+        kinds = [e['t'] for e in events if e['s'] == 'problem-statement']
+        self.assertEqual(kinds, ['p', 'r', 'c', 'p', 'r', 'f', 'p', 'r', 'c'])
+
+    def test_changed_section_is_reported(self):
+        """Editing one section's instruction points drift at that section only"""
+        def mutate(data):
+            data['sections'][1]['sections'][0]['instruction'] = 'Describe the current state briefly.'
+        self._edit_template(mutate)
+        result = replay(self.transcript, self.template_path)
+        self.assertFalse(result['ok'])
+        self.assertEqual(result['drift'], [{'section': 'problem-statement/current-state', 'kind': 'changed'}])
+
+    def test_added_and_removed_sections_are_reported(self):
+        """New and deleted sections are drift; the rest of the session still replays"""
+        def mutate(data):
+            data['sections'].insert(0, {'id': 'preface', 'title': 'Preface', 'instruction': 'Say hi'})
+            del data['sections'][-1]
+        removed = yaml.safe_load(self.template_path.read_text())['sections'][-1]['id']
+        self._edit_template(mutate)
+        result = replay(self.transcript, self.template_path)
+        kinds = {(d['section'], d['kind']) for d in result['drift']}
+        self.assertIn(('preface', 'added'), kinds)
+        self.assertIn((removed, 'removed'), kinds)
+        self.assertEqual(result['document']['problem-statement'], self.document['problem-statement'])
+
+
+if __name__ == '__main__':
+    unittest.main()
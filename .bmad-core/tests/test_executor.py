@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent plan-step executor against a local stub endpoint
+"""
+
+import asyncio
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import yaml
+
+from bmad_tools.cache import ResponseCache
+from bmad_tools.core import extract_yaml_block
+from bmad_tools.executor import LLMClient, PlanExecutor, load_plan
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI-style chat completion stub that echoes the step title"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = body['messages'][-1]['content']
+        title = next(line for line in prompt.split('\n') if line.startswith('Step '))
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.calls.append((time.monotonic(), title, prompt))
+            fail = server.fail_next > 0
+            server.fail_next -= fail
+            stall = server.stall_next > 0
+            server.stall_next -= stall
+        time.sleep(server.delay + (0.5 if stall else 0))
+        with server.lock:
+            server.in_flight -= 1
+
+        if fail:
+            status, payload = 503, {'error': 'busy'}
+        else:
+            status, payload = 200, {'choices': [{'message': {'role': 'assistant', 'content': f'done: {title}'}}]}
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPlanExecutor(unittest.TestCase):
+    """Scheduling, pooling and limits"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.server.calls = []
+        self.server.delay = 0.05
+        self.server.fail_next = 0
+        self.server.stall_next = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}/v1'
+
+    def _run(self, plans, timeout=120.0, **kwargs):
+        async def go():
+            client = LLMClient(self.base_url, max_connections=kwargs.get('concurrency', 4), timeout=timeout)
+            executor = PlanExecutor(client, 'stub', backoff=0.01, **kwargs)
+            try:
+                return await executor.run_many(plans), client
+            finally:
+                await client.aclose()
+        return asyncio.run(go())
+
+    def _plan(self, plan_id, steps):
+        return load_plan({'thinking_plan': {'plan_id': plan_id, 'steps': steps}, 'problem': 'Slow checkout'})
+
+    def test_independent_steps_run_concurrently(self):
+        """Steps without prerequisites overlap up to the concurrency limit"""
+        plan = self._plan('wicked', [{'step': i, 'title': f'T{i}'} for i in range(1, 9)])
+        results, client = self._run([plan], concurrency=4)
+        self.assertTrue(all(r['status'] == 'completed' for r in results['wicked'].values()))
+        self.assertEqual(self.server.max_in_flight, 4)
+        self.assertLessEqual(client.connections_opened, 4)
+        self.assertEqual(client.requests_sent, 8)
+
+    def test_prerequisites_are_respected(self):
+        """A step starts only after its prerequisites and receives their output"""
+        plan = self._plan('chain', [
+            {'step': 1, 'title': 'Define'},
+            {'step': 2, 'title': 'Causes', 'prerequisites': ['step-1']},
+            {'step': 3, 'title': 'Options', 'prerequisites': ['step-1']},
+            {'step': 4, 'title': 'Decide', 'prerequisites': ['step-2', 'step-3']},
+        ])
+        results, _ = self._run([plan], concurrency=4)
+        order = [title for _, title, _ in sorted(self.server.calls)]
+        self.assertTrue(order[0].endswith('Define'))
+        self.assertTrue(order[-1].endswith('Decide'))
+        decide_prompt = [p for _, t, p in self.server.calls if t.endswith('Decide')][0]
+        self.assertIn('Output of step-2:\ndone: Step 2 of 4: Causes', decide_prompt)
+        self.assertIn('Problem: Slow checkout', decide_prompt)
+        self.assertEqual(results['chain']['step-4']['output'], 'done: Step 4 of 4: Decide')
+
+    def test_rate_limit_spaces_requests(self):
+        """Request starts are spaced by the configured rate"""
+        self.server.delay = 0
+        plan = self._plan('rated', [{'step': i, 'title': f'T{i}'} for i in range(1, 5)])
+        self._run([plan], concurrency=4, rate_limit=20)
+        starts = sorted(t for t, _, _ in self.server.calls)
+        self.assertGreaterEqual(starts[-1] - starts[0], 3 * 0.05 * 0.8)
+
+    def test_retry_and_skip(self):
+        """Transient errors are retried; dependents of failed steps are skipped"""
+        self.server.fail_next = 1
+        plan = self._plan('retry', [{'step': 1, 'title': 'Only'}])
+        results, _ = self._run([plan], max_retries=1)
+        self.assertEqual(results['retry']['step-1']['status'], 'completed')
+
+        self.server.fail_next = 10
+        plan = self._plan('broken', [{'step': 1, 'title': 'A'}, {'step': 2, 'title': 'B', 'prerequisites': [1]}])
+        results, _ = self._run([plan], max_retries=0)
+        self.assertEqual(results['broken']['step-1']['status'], 'failed')
+        self.assertEqual(results['broken']['step-2']['status'], 'skipped')
+
+    def test_timeouts_are_retried(self):
+        """A request that times out is retried like a 503 instead of failing the step"""
+        self.server.stall_next = 1
+        plan = self._plan('slow', [{'step': 1, 'title': 'Only'}])
+        results, _ = self._run([plan], timeout=0.3, max_retries=1)
+        self.assertEqual(results['slow']['step-1']['status'], 'completed')
+        self.assertEqual(len(self.server.calls), 2)
+
+        self.server.stall_next = 1
+        results, _ = self._run([self._plan('slow', [{'step': 1, 'title': 'Only'}])], timeout=0.3, max_retries=0)
+        self.assertIn('timed out', results['slow']['step-1']['error'])
+
+    def test_many_plans_share_the_pool(self):
+        """Several plans run together over one pooled client"""
+        plans = [self._plan(f'p{n}', [{'step': 1, 'title': 'A'}, {'step': 2, 'title': 'B', 'prerequisites': [1]}])
+                 for n in range(6)]
+        results, client = self._run(plans, concurrency=3)
+        self.assertEqual(len(results), 6)
+        self.assertEqual(client.requests_sent, 12)
+        self.assertLessEqual(client.connections_opened, 3)
+
+    def test_cached_rerun_makes_no_requests(self):
+        """An unchanged rerun is served entirely from the response cache"""
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        plan = self._plan('rerun', [{'step': 1, 'title': 'A'}, {'step': 2, 'title': 'B', 'prerequisites': [1]}])
+        with ResponseCache(tmp / 'cache.sqlite') as cache:
+            first, _ = self._run([plan], cache=cache)
+            second, client = self._run([plan], cache=cache)
+        self.assertEqual(client.requests_sent, 0)
+        self.assertTrue(all(r.get('cached') for r in second['rerun'].values()))
+        self.assertEqual(first['rerun']['step-2']['output'], second['rerun']['step-2']['output'])
+
+
+class TestPlanLoading(unittest.TestCase):
+    """Plan parsing from the create-thinking-plan task examples"""
+
+    def test_simple_plan_from_task_file(self):
+        """The Simple plan example in create-thinking-plan.md loads with its prerequisites"""
+        content = Path('.bmad-core/tasks/create-thinking-plan.md').read_text()
+        plan = load_plan(yaml.safe_load(extract_yaml_block(content)))
+        self.assertEqual([s['id'] for s in plan['steps']], ['step-1', 'step-2', 'step-3'])
+        self.assertEqual(plan['steps'][2]['prerequisites'], ['step-2'])
+
+    def test_cycles_are_rejected(self):
+        """Cyclic prerequisites raise ValueError"""
+        with self.assertRaises(ValueError):
+            load_plan({'steps': [{'step': 1, 'prerequisites': [2]}, {'step': 2, 'prerequisites': [1]}]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the fault-tree engine used by root-cause-investigation
+"""
+
+import itertools
+import random
+import time
+import unittest
+
+from bmad_tools.faulttree import FaultTree
+
+TREE = {
+    'fault_tree': {
+        'top_event': 'Checkout unavailable',
+        'gates': {
+            'TOP': {'type': 'or', 'inputs': ['DB', 'LB', 'dns']},
+            'DB': {'type': 'and', 'inputs': ['db_primary', 'db_replica']},
+            'LB': {'type': 'vote', 'k': 2, 'inputs': ['lb1', 'lb2', 'lb3']},
+        },
+        'events': {
+            'db_primary': {'probability': 0.01, 'description': 'Primary DB down'},
+            'db_replica': {'probability': 0.02},
+            'lb1': {'probability': 0.05},
+            'lb2': {'probability': 0.05},
+            'lb3': {'probability': 0.05},
+            'dns': {'probability': 0.001},
+        },
+    }
+}
+
+
+def brute_force(tree, names, fails):
+    """Top-event probability by enumerating every state of the basic events"""
+    probability = dict(zip(tree.order, tree.probability))
+    total = 0.0
+    for bits in itertools.product([False, True], repeat=len(names)):
+        state = dict(zip(names, bits))
+        if fails(state):
+            weight = 1.0
+            for name in names:
+                weight *= probability[name] if state[name] else 1 - probability[name]
+            total += weight
+    return total
+
+
+class TestFaultTree(unittest.TestCase):
+    """Probability, cut sets and importance on a small tree"""
+
+    def setUp(self):
+        self.tree = FaultTree.from_dict(TREE)
+
+    def test_top_probability_is_exact(self):
+        """BDD probability equals full state enumeration"""
+        def fails(s):
+            return s['dns'] or (s['db_primary'] and s['db_replica']) or s['lb1'] + s['lb2'] + s['lb3'] >= 2
+        expected = brute_force(self.tree, self.tree.order, fails)
+        self.assertAlmostEqual(self.tree.top_probability(), expected, places=12)
+
+    def test_minimal_cut_sets(self):
+        """k-of-n gates expand into pairs and cut sets come out most probable first"""
+        cut_sets = self.tree.minimal_cut_sets()
+        found = {frozenset(events) for events, _ in cut_sets}
+        self.assertEqual(found, {frozenset(s) for s in (
+            ['dns'], ['db_primary', 'db_replica'], ['lb1', 'lb2'], ['lb1', 'lb3'], ['lb2', 'lb3'])})
+        probabilities = [p for _, p in cut_sets]
+        self.assertEqual(probabilities, sorted(probabilities, reverse=True))
+        self.assertEqual(self.tree.cut_set_counts(), {1: 1, 2: 4})
+
+    def test_importance_matches_conditional_probabilities(self):
+        """Birnbaum is P(top | failed) - P(top | working); RAW follows from it"""
+        rows = {r['event']: r for r in self.tree.importance()}
+        events = TREE['fault_tree']['events']
+        for name in ('dns', 'db_primary', 'lb1'):
+            conditional = []
+            for p in (1.0, 0.0):
+                data = {'fault_tree': dict(TREE['fault_tree'], events=dict(events, **{name: {'probability': p}}))}
+                conditional.append(FaultTree.from_dict(data).top_probability())
+            self.assertAlmostEqual(rows[name]['birnbaum'], conditional[0] - conditional[1], places=12)
+            self.assertAlmostEqual(rows[name]['raw'], conditional[0] / self.tree.top_probability(), places=9)
+        self.assertEqual(self.tree.importance()[0]['event'][:2], 'lb')
+
+    def test_analysis_uses_task_output_format(self):
+        """failure_paths carry path_id, basic_events, probability and critical"""
+        fta = self.tree.analysis()['fault_tree_analysis']
+        self.assertEqual(fta['top_event'], 'Checkout unavailable')
+        db_path = next(p for p in fta['failure_paths'] if 'db_primary' in p['basic_events'])
+        self.assertEqual(db_path['description'], 'Primary DB down AND db_replica')
+        self.assertFalse(db_path['critical'])
+        self.assertTrue(all(p['path_id'].startswith('PATH-') for p in fta['failure_paths']))
+
+    def test_invalid_tree_rejected(self):
+        """Unknown inputs and gate types raise ValueError"""
+        with self.assertRaises(ValueError):
+            FaultTree({'TOP': {'type': 'or', 'inputs': ['missing']}}, {})
+        with self.assertRaises(ValueError):
+            FaultTree({'TOP': {'type': 'xor', 'inputs': ['a']}}, {'a': {'probability': 0.1}})
+
+    def test_cycle_rejected(self):
+        """A cycle between gates raises ValueError naming its gates instead of hanging"""
+        gates = {
+            'TOP': {'type': 'or', 'inputs': ['A', 'c']},
+            'A': {'type': 'and', 'inputs': ['B', 'a']},
+            'B': {'type': 'or', 'inputs': ['A', 'b']},
+        }
+        events = {name: {'probability': 0.1} for name in 'abc'}
+        with self.assertRaises(ValueError) as raised:
+            FaultTree(gates, events, top='TOP')
+        self.assertIn('A -> B -> A', str(raised.exception))
+
+
+class TestLargeTree(unittest.TestCase):
+    """Thousands of events with astronomically many cut sets"""
+
+    def test_large_tree_stays_fast(self):
+        """4096 events are analysed without enumerating every cut set"""
+        rng = random.Random(1)
+        gates, events = {}, {}
+
+        def build(depth):
+            name = f'n{len(gates) + len(events)}'
+            if depth == 0:
+                events[name] = {'probability': rng.uniform(1e-4, 1e-2)}
+            else:
+                gates[name] = {'type': rng.choice(['and', 'or', 'or', 'vote']), 'k': 2}
+                gates[name]['inputs'] = [build(depth - 1) for _ in range(4)]
+            return name
+
+        build(6)
+        start = time.perf_counter()
+        tree = FaultTree(gates, events)
+        top = tree.top_probability()
+        counts = tree.cut_set_counts()
+        best = tree.minimal_cut_sets(10)
+        importance = tree.importance()
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(events), 4096)
+        self.assertTrue(0 < top < 1)
+        self.assertGreater(sum(counts.values()), 10 ** 6)
+        self.assertEqual(len(best), 10)
+        self.assertEqual(len(importance), 4096)
+        self.assertLess(elapsed, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for near-duplicate clustering of brainstorming ideas
+"""
+
+import contextlib
+import io
+import random
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from bmad_tools.ideas import _normalize, cluster, condense, load_ideas, main, parse_markdown
+
+SESSION_MD = """# Brainstorming Session Results
+
+## Technique Sessions
+
+### SCAMPER - 15 min
+
+**Description:** Substitute, combine, adapt
+
+#### Ideas Generated:
+
+1. Add a dark mode to the app
+2. Offer a loyalty points program
+
+#### Insights Discovered:
+
+- Users want personalization
+
+### Mind Mapping - 10 min
+
+#### Ideas Generated:
+
+1. Dark mode for the app!
+2. Partner with local gyms
+"""
+
+
+def _jaccard(a, b):
+    grams = [{t[i:i + 4] for i in range(len(t) - 3)} for t in (_normalize(a), _normalize(b))]
+    return len(grams[0] & grams[1]) / len(grams[0] | grams[1])
+
+
+class TestIdeaClustering(unittest.TestCase):
+    """Grouping quality, document parsing, scale and CLI output"""
+
+    def test_near_duplicates_merge(self):
+        """Rewordings of one idea merge; unrelated ideas stay apart"""
+        clusters = cluster(['Add dark mode to the app', 'Dark mode for the app', 'Loyalty points program',
+                            'Offer a loyalty points program', 'Partner with local gyms', 'Voice control'])
+        self.assertEqual([c['members'] for c in clusters], [[0, 1], [2, 3], [4], [5]])
+        self.assertEqual(clusters[0]['variants'], ['Dark mode for the app'])
+
+    def test_entries_without_text_are_skipped(self):
+        """Mappings with no idea text and blank YAML entries are not clustered"""
+        summary = condense(['Voice control', {'technique': 'SCAMPER'}, {'idea': '  '}, None, {'idea': 'Voice control'}])
+        self.assertEqual((summary['total_ideas'], summary['distinct_ideas']), (2, 1))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'ideas.yaml'
+            path.write_text('- {technique: SCAMPER}\n- {text: Partner with gyms}\n- \n- Voice control\n',
+                            encoding='utf-8')
+            self.assertEqual([i['idea'] for i in load_ideas(path)], ['Partner with gyms', 'Voice control'])
+
+    def test_matches_exact_jaccard(self):
+        """Every pair with true shingle Jaccard >= 0.8 ends up in the same cluster"""
+        rng = random.Random(3)
+        words = [''.join(rng.choice('abcdefghij') for _ in range(rng.randint(3, 8))) for _ in range(400)]
+        ideas = []
+        for _ in range(150):
+            base = rng.sample(words, 8)
+            ideas.append(' '.join(base))
+            ideas.append(' '.join(base[:7] + [rng.choice(words)]))
+        label = {}
+        for n, c in enumerate(cluster(ideas)):
+            label.update(dict.fromkeys(c['members'], n))
+        for i in range(len(ideas)):
+            for j in range(i + 1, len(ideas)):
+                if _jaccard(ideas[i], ideas[j]) >= 0.8:
+                    self.assertEqual(label[i], label[j], (ideas[i], ideas[j]))
+
+    def test_chained_ideas_do_not_collapse(self):
+        """Sliding word windows, each similar only to its neighbours, do not chain into one cluster"""
+        rng = random.Random(7)
+        words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(5, 9)))
+                 for _ in range(60)]
+        ideas = [' '.join(words[k:k + 12]) for k in range(40)]
+        self.assertLess(_jaccard(ideas[0], ideas[12]), 0.1)
+        clusters = cluster(ideas)
+        self.assertGreater(len(clusters), 5)
+        for c in clusters:
+            for i in c['members']:
+                self.assertGreater(_jaccard(ideas[i], c['idea']), 0.4, (ideas[i], c['idea']))
+
+    def test_session_document_parsing(self):
+        """Only "Ideas Generated" items are read, tagged with the technique heading"""
+        ideas = parse_markdown(SESSION_MD)
+        self.assertEqual([(i['idea'], i['technique']) for i in ideas], [
+            ('Add a dark mode to the app', 'SCAMPER'), ('Offer a loyalty points program', 'SCAMPER'),
+            ('Dark mode for the app!', 'Mind Mapping'), ('Partner with local gyms', 'Mind Mapping')])
+        self.assertEqual(condense(ideas)['ideas'][0]['techniques'], ['Mind Mapping', 'SCAMPER'])
+
+    def test_large_session_is_fast(self):
+        """20000 reordered, recased copies of about 2000 ideas collapse back to them within seconds"""
+        rng = random.Random(5)
+        words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 9)))
+                 for _ in range(5000)]
+        bases = [rng.sample(words, 6) for _ in range(2000)]
+        ideas, used = [], set()
+        for _ in range(20000):
+            n = rng.randrange(len(bases))
+            used.add(n)
+            base = list(bases[n])
+            rng.shuffle(base)
+            ideas.append(rng.choice([str.upper, str.lower, str.title])(' '.join(base)) + rng.choice(['', '!', '.']))
+        start = time.perf_counter()
+        summary = condense(ideas)
+        self.assertLess(time.perf_counter() - start, 10)
+        self.assertEqual(summary['distinct_ideas'], len(used))
+        self.assertEqual(sum(i['count'] for i in summary['ideas']), 20000)
+
+    def test_cli_renders_condensed_list(self):
+        """The markdown output gives the totals line and one numbered line per distinct idea"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'brainstorming-session-results.md'
+            path.write_text(SESSION_MD, encoding='utf-8')
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                self.assertEqual(main([str(path)]), 0)
+        self.assertEqual(out.getvalue().split('\n'), [
+            '**Total Ideas Generated:** 4 (3 distinct)', '',
+            '1. Add a dark mode to the app (x2; Mind Mapping, SCAMPER)',
+            '2. Offer a loyalty points program (SCAMPER)',
+            '3. Partner with local gyms (Mind Mapping)', ''])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the MCDA engine used by decision-analysis
+"""
+
+import time
+import unittest
+
+import numpy as np
+
+from bmad_tools.mcda import DecisionProblem, ahp, analyze, load_problem, monte_carlo, render_matrix, topsis, weighted_sum
+
+DECISION = {
+    'criteria_definition': [
+        {'name': 'Cost', 'weight': 0.4, 'direction': 'minimize'},
+        {'name': 'Performance', 'weight': 0.35, 'direction': 'maximize'},
+        {'name': 'Team Fit', 'weight': 0.25},
+    ],
+    'alternatives_analysis': [
+        {'alternative': 'Monolith', 'raw_scores': {'Cost': 100, 'Performance': 6, 'Team Fit': 9}},
+        {'alternative': 'Microservices', 'raw_scores': {'Cost': 300, 'Performance': 9, 'Team Fit': 4}},
+        {'alternative': 'Modular Monolith', 'raw_scores': {'Cost': 150, 'Performance': 8, 'Team Fit': 8}},
+    ],
+}
+
+
+class TestScoring(unittest.TestCase):
+    """Weighted sum, TOPSIS and AHP against hand-computed values"""
+
+    def setUp(self):
+        self.problem = load_problem(DECISION)
+
+    def test_weighted_sum_matches_task_formula(self):
+        """Min-max normalization with reversed minimize criteria, then sum(w * s)"""
+        # Cost: 1, 0, 0.75  Performance: 0, 1, 2/3  Team Fit: 1, 0, 0.8
+        expected = [0.4 + 0.25, 0.35, 0.4 * 0.75 + 0.35 * 2 / 3 + 0.25 * 0.8]
+        np.testing.assert_allclose(weighted_sum(self.problem), expected)
+
+    def test_normalized_scores_used_as_given(self):
+        """Task `scores` are already 0-1 with minimize reversed, so they are not rescaled or reversed again"""
+        problem = load_problem({
+            'criteria_definition': [{'name': 'Cost', 'weight': 0.5, 'direction': 'minimize'},
+                                    {'name': 'Quality', 'weight': 0.5}],
+            'alternatives_analysis': [
+                {'alternative': 'Cheap', 'scores': {'Cost': 1.0, 'Quality': 0.5}},
+                {'alternative': 'Pricey', 'scores': {'Cost': 0.0, 'Quality': 0.6}},
+            ],
+        })
+        np.testing.assert_allclose(weighted_sum(problem), [0.75, 0.3])
+        self.assertGreater(*topsis(problem))
+
+    def test_topsis_batch_matches_single(self):
+        """Batched weights score the same as one weight vector at a time"""
+        weights = np.random.default_rng(0).dirichlet(np.ones(3), size=5)
+        batch = topsis(self.problem, weights)
+        for w, row in zip(weights, batch):
+            np.testing.assert_allclose(topsis(self.problem, w), row)
+
+    def test_ahp_weights_and_consistency(self):
+        """Saaty's 3x3 example is consistent; a circular preference is not"""
+        result = ahp([[1, 3, 5], [1 / 3, 1, 3], [1 / 5, 1 / 3, 1]])
+        np.testing.assert_allclose(result['weights'], [0.637, 0.258, 0.105], atol=1e-3)
+        self.assertTrue(result['consistent'])
+        self.assertFalse(ahp([[1, 9, 1 / 9], [1 / 9, 1, 9], [9, 1 / 9, 1]])['consistent'])
+
+        weighted = load_problem(dict(DECISION, pairwise=[[1, 3, 5], [1 / 3, 1, 3], [1 / 5, 1 / 3, 1]]))
+        np.testing.assert_allclose(weighted.weights, result['weights'])
+
+
+class TestSensitivity(unittest.TestCase):
+    """Monte Carlo weight uncertainty and the rendered matrix"""
+
+    def test_dominant_option_always_wins(self):
+        """An option best on every criterion wins every draw"""
+        problem = DecisionProblem(['A', 'B'], ['x', 'y'], [[9, 9], [1, 1]], [0.5, 0.5], ['maximize'] * 2)
+        result = monte_carlo(problem, draws=2000, seed=1)
+        np.testing.assert_allclose(result['win_probability'], [1.0, 0.0])
+        self.assertEqual(result['robustness'], 'high')
+        self.assertEqual(list(result['rank_p95']), [1, 2])
+
+    def test_many_draws_are_fast(self):
+        """20,000 draws over a 40 x 30 matrix take well under a second per method"""
+        rng = np.random.default_rng(0)
+        problem = DecisionProblem([f'A{i}' for i in range(40)], [f'C{j}' for j in range(30)],
+                                  rng.random((40, 30)), rng.random(30), ['maximize', 'minimize'] * 15)
+        for method in ('weighted-sum', 'topsis'):
+            start = time.perf_counter()
+            result = monte_carlo(problem, method, draws=20000, seed=2)
+            self.assertLess(time.perf_counter() - start, 1.0)
+            self.assertAlmostEqual(result['win_probability'].sum(), 1.0)
+
+    def test_rendered_matrix(self):
+        """The markdown matrix lists every option with weights in the header"""
+        problem = load_problem(DECISION)
+        result = analyze(problem, draws=5000, seed=3)
+        text = render_matrix(problem, result)
+        self.assertIn('| Solution | Cost (0.40) | Performance (0.35) | Team Fit (0.25) |', text)
+        self.assertIn('| Modular Monolith | 150 | 8 | 8 |', text)
+        self.assertEqual(result['baseline_best'], 'Modular Monolith')
+        self.assertEqual({t['criterion'] for t in result['thresholds']}, {'Cost', 'Performance', 'Team Fit'})
+
+
+if __name__ == '__main__':
+    unittest.main()
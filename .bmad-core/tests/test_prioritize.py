@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the time-budgeted test-scenario prioritizer used by test-design
+"""
+
+import contextlib
+import io
+import itertools
+import random
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from bmad_tools.prioritize import knapsack, load_rules, load_scenarios, main, parse_runtime, select
+
+DESIGN_MD = """# Test Design: Story 1.3
+
+### AC1: Checkout charges the saved card
+
+| ID           | Level       | Priority | Test                      | Justification            |
+| ------------ | ----------- | -------- | ------------------------- | ------------------------ |
+| 1.3-UNIT-001 | Unit        | P0       | Validate card format      | Pure validation logic    |
+| 1.3-INT-001  | Integration | P0       | Service charges gateway   | Multi-component flow     |
+
+### AC2: Receipt is emailed
+
+| ID          | Level | Priority | Test                   | Runtime |
+| ----------- | ----- | -------- | ---------------------- | ------- |
+| 1.3-E2E-001 | E2E   | P1       | User receives receipt  | 2m      |
+"""
+
+
+class TestRules(unittest.TestCase):
+    """Rules parsed from the core data files"""
+
+    def setUp(self):
+        self.rules = load_rules()
+
+    def test_priorities_inferred_from_matrix(self):
+        """Matrix examples map scenarios to P0-P3; unmatched ones default to P2"""
+        cases = {'Process payment with saved card': 'P0', 'User registration flow sends email': 'P1',
+                 'Admin settings panel toggles theme': 'P2', 'Debug utilities dump state': 'P3',
+                 'Widget renders': 'P2'}
+        for description, priority in cases.items():
+            self.assertEqual(self.rules.score({'description': description})['priority'], priority, description)
+
+    def test_levels_and_runtimes_from_framework(self):
+        """Test IDs give the level; level speed gives the default runtime"""
+        unit = self.rules.score({'id': '1.3-UNIT-001', 'priority': 'P1'})
+        e2e = self.rules.score({'id': '1.3-E2E-001', 'priority': 'P1'})
+        self.assertEqual((unit['level'], e2e['level']), ('unit', 'e2e'))
+        self.assertLess(unit['runtime'], e2e['runtime'])
+        self.assertEqual(unit['inferred'], ['runtime'])
+        self.assertEqual(self.rules.score({'description': 'Database operations and transactions'})['level'],
+                         'integration')
+
+    def test_adjustments_and_risks_raise_value(self):
+        """Increase criteria and mitigated risks add value; decrease criteria remove it"""
+        base = self.rules.score({'priority': 'P1', 'description': 'Search results page'})['value']
+        risky = self.rules.score({'priority': 'P1', 'description': 'Search security vulnerability potential',
+                                  'mitigates_risks': ['SEC-001']})['value']
+        flagged = self.rules.score({'priority': 'P1', 'description': 'Search behind feature flag protected'})['value']
+        self.assertEqual(risky, base * 2 * 1.25)
+        self.assertEqual(flagged, base / 2)
+
+
+class TestSelection(unittest.TestCase):
+    """Knapsack optimality, budgets and inputs"""
+
+    def test_knapsack_is_optimal(self):
+        """Dynamic programming matches brute force on small instances"""
+        rng = random.Random(0)
+        for _ in range(100):
+            n = rng.randint(1, 9)
+            values = [rng.randint(1, 50) for _ in range(n)]
+            costs = [rng.randint(1, 20) for _ in range(n)]
+            capacity = rng.randint(1, 60)
+            best = max(sum(values[i] for i in combo) for r in range(n + 1)
+                       for combo in itertools.combinations(range(n), r)
+                       if sum(costs[i] for i in combo) <= capacity)
+            chosen = knapsack(values, costs, capacity)
+            self.assertLessEqual(sum(costs[i] for i in chosen), capacity)
+            self.assertEqual(sum(values[i] for i in chosen), best)
+
+    def test_thousands_of_scenarios_within_budget(self):
+        """5000 scenarios are cut within the budget, in execution order, quickly"""
+        rng = random.Random(1)
+        scenarios = [{'id': f"1.{i % 40}-{rng.choice(['UNIT', 'INT', 'E2E'])}-{i:03d}",
+                      'priority': rng.choice(['P0', 'P1', 'P2', 'P3']), 'runtime': rng.uniform(0.1, 120)}
+                     for i in range(5000)]
+        start = time.perf_counter()
+        selection = select(load_rules().score_all(scenarios), 3600)
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertLessEqual(selection['runtime'], 3600)
+        order = [(s['priority'], ['unit', 'integration', 'e2e'].index(s['level'])) for s in selection['selected']]
+        self.assertEqual(order, sorted(order))
+        self.assertGreater(selection['by_priority']['P0'][0], selection['by_priority']['P1'][0])
+
+    def test_shared_runtime_step_is_exact(self):
+        """400 one-second scenarios fill a 300 s budget exactly instead of losing some to rounding"""
+        scored = load_rules().score_all([{'id': f'1.1-UNIT-{i:03d}', 'priority': 'P2', 'runtime': 1}
+                                         for i in range(400)])
+        selection = select(scored, 300)
+        self.assertEqual((len(selection['selected']), selection['runtime']), (300, 300))
+        mixed = load_rules().score_all([{'id': '1.1-UNIT-001', 'priority': 'P1', 'runtime': '1.5s'},
+                                        {'id': '1.1-UNIT-002', 'priority': 'P1', 'runtime': '250ms'},
+                                        {'id': '1.1-UNIT-003', 'priority': 'P2', 'runtime': 1.25}])
+        self.assertEqual(select(mixed, 1.75)['runtime'], 1.75)
+
+    def test_markdown_design_and_stages(self):
+        """Scenario tables load with their AC and runtime; each stage gets its own cut"""
+        self.assertEqual(parse_runtime('2m'), 120)
+        self.assertEqual(parse_runtime('500ms'), 0.5)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'design.md'
+            path.write_text(DESIGN_MD, encoding='utf-8')
+            scenarios = load_scenarios(path)
+            self.assertEqual([s['requirement'] for s in scenarios], ['AC1', 'AC1', 'AC2'])
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                self.assertEqual(main([str(path), '--stage', 'commit=15s', '--stage', 'nightly=1h', '--ids']), 0)
+        self.assertEqual(out.getvalue().split('\n'), [
+            '# commit', '1.3-UNIT-001', '1.3-INT-001',
+            '# nightly', '1.3-UNIT-001', '1.3-INT-001', '1.3-E2E-001', ''])
+
+    def test_zero_and_negative_budgets(self):
+        """A zero budget selects nothing; negative budgets are rejected"""
+        scored = load_rules().score_all([{'id': '1.1-UNIT-001', 'priority': 'P0'},
+                                         {'id': '1.1-E2E-001', 'priority': 'P1'}])
+        empty = select(scored, 0)
+        self.assertEqual((empty['selected'], empty['runtime'], len(empty['dropped'])), ([], 0, 2))
+        with self.assertRaises(ValueError):
+            select(scored, -1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'design.md'
+            path.write_text(DESIGN_MD, encoding='utf-8')
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                self.assertEqual(main([str(path), '--stage', 'smoke=0', '--ids']), 0)
+            self.assertEqual(out.getvalue(), '\n')
+            with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                main([str(path), '--stage', 'smoke=-5'])
+
+
+if __name__ == '__main__':
+    unittest.main()
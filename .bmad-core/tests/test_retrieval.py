@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for relevance-ranked shard selection
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from bmad_tools.retrieval import ShardIndex, select_context, shard_locations, split_sections
+
+
+class TestShardSelection(unittest.TestCase):
+    """Index building and budgeted selection over a small sharded project"""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        arch = self.root / 'docs' / 'architecture'
+        prd = self.root / 'docs' / 'prd'
+        arch.mkdir(parents=True)
+        prd.mkdir(parents=True)
+        (arch / 'coding-standards.md').write_text('# Coding Standards\n\nUse type hints everywhere.\n')
+        (arch / 'database-schema.md').write_text(
+            '# Database Schema\n\n## Orders table\n\nOrders reference customers by customer_id.\n\n'
+            '## Audit table\n\nAudit rows are append only.\n')
+        (arch / 'frontend-architecture.md').write_text(
+            '# Frontend\n\n## Components\n\nReact components live in src/ui and use hooks.\n')
+        (prd / 'epic-1-checkout.md').write_text(
+            '# Epic 1 Checkout\n\n## Story 1.1\n\nCustomers can place orders and see an order summary.\n')
+        self.config = {
+            'architecture': {'architectureSharded': True, 'architectureShardedLocation': 'docs/architecture'},
+            'prd': {'prdSharded': True, 'prdShardedLocation': 'docs/prd'},
+        }
+        self.index = ShardIndex(self.root)
+        self.index.update(shard_locations(self.config))
+
+    def test_split_sections_ignores_code_fences(self):
+        """Headings inside fenced code are not section boundaries"""
+        sections = split_sections('# A\ntext\n```\n# not a heading\n```\n## B\nmore\n')
+        self.assertEqual([h for h, _ in sections], ['A', 'A > B'])
+
+    def test_relevant_sections_ranked_first(self):
+        """Order-related sections outrank unrelated ones"""
+        results = self.index.search('Persist orders for each customer')
+        self.assertEqual(results[0]['heading'], 'Database Schema > Orders table')
+        self.assertNotIn('Frontend > Components', [r['heading'] for r in results])
+
+    def test_always_files_are_guaranteed(self):
+        """Always-load files are included even when they exceed the budget"""
+        always = ['docs/architecture/coding-standards.md']
+        selection = select_context('orders customers', self.index, always, budget=1, project_root=self.root)
+        self.assertEqual([a['file'] for a in selection['always']], always)
+        self.assertEqual(selection['sections'], [])
+
+    def test_budget_is_respected(self):
+        """Selected sections never push the total over budget"""
+        always = ['docs/architecture/coding-standards.md']
+        selection = select_context('orders customers order summary', self.index, always,
+                                   budget=40, project_root=self.root)
+        self.assertLessEqual(selection['tokens'], 40)
+        self.assertTrue(selection['sections'])
+        files = {s['file'] for s in selection['sections']}
+        self.assertNotIn('docs/architecture/coding-standards.md', files)
+
+    def test_incremental_update_and_persistence(self):
+        """Only changed shards are re-indexed and the index round-trips through JSON"""
+        index_path = self.root / '.ai' / 'shard-index.json'
+        self.index.save(index_path)
+        reloaded = ShardIndex.load(index_path, self.root)
+        self.assertEqual(reloaded.update(shard_locations(self.config)), [])
+
+        (self.root / 'docs' / 'architecture' / 'database-schema.md').write_text('# Database Schema\n\nNothing.\n')
+        (self.root / 'docs' / 'prd' / 'epic-1-checkout.md').unlink()
+        changed = reloaded.update(shard_locations(self.config))
+        self.assertEqual(sorted(changed), ['docs/architecture/database-schema.md', 'docs/prd/epic-1-checkout.md'])
+        self.assertEqual(reloaded.search('orders'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
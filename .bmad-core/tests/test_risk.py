@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the Monte Carlo risk engine used by risk-profile
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from bmad_tools.risk import RiskRegister, parse_impact, parse_probability, risk_summary, simulate
+
+REGISTER = {
+    'risks': [
+        {'id': 'SEC-001', 'title': 'XSS on profile form', 'probability': 0.4, 'impact': 'high', 'group': 'auth'},
+        {'id': 'SEC-002', 'title': 'Session fixation', 'probability': 'low',
+         'impact': {'low': 2, 'mode': 3, 'high': 3}, 'group': 'auth'},
+        {'id': 'PERF-001', 'title': 'Slow dashboard', 'probability': 'medium', 'impact': {'low': 1, 'high': 3}},
+    ],
+    'correlation': {'auth': 0.6},
+}
+
+
+class TestParsing(unittest.TestCase):
+    """Register values in numbers, level names and ranges"""
+
+    def test_levels_and_ranges(self):
+        """Level names map to the task's bands and ranges keep their shape"""
+        self.assertEqual(parse_probability('High (3)'), 0.85)
+        self.assertEqual(parse_probability('0.25'), 0.25)
+        self.assertEqual(parse_impact('medium'), (2.0, 2.0, 2.0, False))
+        self.assertEqual(parse_impact({'low': 1, 'high': 3}), (1.0, 2.0, 3.0, True))
+        with self.assertRaises(ValueError):
+            parse_probability(1.5)
+        with self.assertRaises(ValueError):
+            parse_impact({'low': 1, 'mode': 4, 'high': 3})
+
+    def test_csv_register(self):
+        """CSV rows with impact ranges load like YAML risks"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'risks.csv'
+            path.write_text('id,title,probability,impact,impact_low,impact_high,group\n'
+                            'DATA-001,Backup failure,low,3,2,3,storage\n'
+                            'OPS-001,Deploy rollback,0.2,medium,,,\n', encoding='utf-8')
+            register = RiskRegister.load(path)
+        data, ops = register.risks
+        self.assertEqual((data['category'], data['group'], data['probability']), ('data', 'storage', 0.15))
+        self.assertAlmostEqual(data['impact_mean'], 8 / 3)
+        self.assertEqual((ops['impact_mean'], ops['score']), (2.0, 2))
+
+    def test_csv_correlation_groups(self):
+        """A CSV correlation column ties a group together; a group without one is flagged"""
+        header = 'id,probability,impact,group,correlation\n'
+        rows = ''.join(f'TECH-{i},0.2,1,g,{{}}\n' for i in range(10))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'risks.csv'
+            path.write_text(header + rows.format(*[''] * 10), encoding='utf-8')
+            independent = RiskRegister.load(path)
+            overridden = RiskRegister.load(path, {'g': 0.8})
+            path.write_text(header + rows.format(*['0.8'] * 10), encoding='utf-8')
+            correlated = RiskRegister.load(path)
+        self.assertEqual(len(independent.warnings), 1)
+        self.assertEqual(correlated.warnings, [])
+        p99 = [simulate(r, draws=50_000, seed=2)['exposure']['p99'] for r in (independent, correlated, overridden)]
+        self.assertGreater(p99[1], p99[0] + 2)
+        self.assertEqual(p99[1], p99[2])
+
+
+class TestSimulation(unittest.TestCase):
+    """Exposure, correlation, tail contributions and reproducibility"""
+
+    def test_expected_loss_matches_probability_times_impact(self):
+        """Mean loss per risk converges to p x mean impact"""
+        result = simulate(RiskRegister.from_dict(REGISTER), draws=100_000, seed=1)
+        for r in result['risks']:
+            self.assertAlmostEqual(r['expected'], r['probability'] * r['impact_mean'], delta=0.02)
+        self.assertAlmostEqual(sum(r['tail_contribution'] for r in result['risks']),
+                               result['exposure']['tail_mean'], places=6)
+
+    def test_correlation_fattens_the_tail(self):
+        """Correlated risks keep their marginals but fire together more often"""
+        risks = [{'id': f'TECH-{i}', 'probability': 0.2, 'impact': 1, 'group': 'g'} for i in range(10)]
+        independent = simulate(RiskRegister(risks), draws=50_000, seed=2)
+        correlated = simulate(RiskRegister(risks, {'g': 0.8}), draws=50_000, seed=2)
+        self.assertAlmostEqual(independent['exposure']['mean'], correlated['exposure']['mean'], delta=0.05)
+        self.assertGreater(correlated['exposure']['p99'], independent['exposure']['p99'] + 2)
+
+    def test_same_seed_same_result_across_workers(self):
+        """Per-chunk seeds make a process pool reproduce the single-process run"""
+        register = RiskRegister.from_dict(REGISTER)
+        single = simulate(register, draws=20_000, seed=7, jobs=1)
+        pooled = simulate(register, draws=20_000, seed=7, jobs=2)
+        self.assertEqual(single, pooled)
+
+    def test_gate_follows_scores_and_appetite(self):
+        """Score 6 gives CONCERNS; exceeding the fail appetite escalates to FAIL"""
+        register = RiskRegister.from_dict(REGISTER)
+        result = simulate(register, draws=20_000, seed=3)
+        gate = risk_summary(result)
+        self.assertEqual(gate['gate'], 'CONCERNS')
+        summary = gate['risk_summary']
+        self.assertEqual(summary['totals'], {'critical': 0, 'high': 1, 'medium': 1, 'low': 1})
+        self.assertEqual(summary['highest']['id'], 'SEC-001')
+        self.assertEqual(summary['recommendations']['must_fix'], ['XSS on profile form'])
+        self.assertEqual(risk_summary(result, {'fail': 0.5})['gate'], 'FAIL')
+
+
+if __name__ == '__main__':
+    unittest.main()
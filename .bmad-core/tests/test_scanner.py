@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental codebase scanner
+"""
+
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from bmad_tools.scanner import CodebaseScanner, render_source_tree, render_tech_stack
+
+PROJECT = {
+    'package.json': json.dumps({'name': 'shop', 'main': 'web/src/index.js',
+                                'dependencies': {'express': '^4.18.2', 'react': '18.2.0'},
+                                'devDependencies': {'jest': '^29.0.0'}}),
+    'web/src/index.js': "const express = require('express');\nconst routes = require('./routes');\n",
+    'web/src/routes.js': "import { helper } from '../../shared/util.js';\nexport default {};\n",
+    'shared/util.js': "export function helper() {}\n",
+    'service/requirements.txt': "fastapi==0.110.0\nsqlalchemy>=2.0  # orm\n",
+    'service/app.py': "from fastapi import FastAPI\nfrom service import models\n\napp = FastAPI()\n",
+    'service/models.py': "import sqlalchemy\n",
+    'service/tests/test_app.py': "import pytest\nfrom service import app\n",
+    'node_modules/express/index.js': "module.exports = {};\n",
+}
+
+
+class TestCodebaseScanner(unittest.TestCase):
+    """Detection, module structure and incremental rescans"""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        for rel, content in PROJECT.items():
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+    def scanner(self, **kwargs):
+        return CodebaseScanner(self.root, **kwargs)
+
+    def test_detects_stack_and_structure(self):
+        """Languages, frameworks, entry points and module dependencies"""
+        scanner = self.scanner(jobs=1)
+        scanner.update()
+        report = scanner.report()
+        self.assertEqual(set(report['languages']), {'JavaScript', 'Python'})
+        self.assertEqual({f['name']: f['version'] for f in report['frameworks']},
+                         {'Express': '^4.18.2', 'React': '18.2.0', 'Jest': '^29.0.0',
+                          'FastAPI': '==0.110.0', 'SQLAlchemy': '>=2.0'})
+        self.assertEqual(report['entry_points'], ['service/app.py', 'web/src/index.js'])
+        self.assertEqual(report['modules']['web']['depends_on'], ['shared'])
+        self.assertEqual(report['modules']['service']['tests'], 1)
+        self.assertNotIn('node_modules', report['modules'])
+        self.assertIn('| Backend | Express | ^4.18.2 | from package.json |', render_tech_stack(report))
+        self.assertIn('`web/src/index.js`', render_source_tree(report))
+
+    def test_rescan_touches_only_changed_files(self):
+        """The cache survives a restart; edits and deletions are picked up"""
+        scanner = self.scanner(jobs=1)
+        changed, _ = scanner.update()
+        self.assertEqual(len(changed), 8)
+        scanner.save()
+
+        scanner = self.scanner(jobs=1)
+        self.assertEqual(scanner.update(), ([], []))
+
+        time.sleep(0.01)
+        (self.root / 'shared/util.js').write_text("export function helper() { return 1; }\n")
+        (self.root / 'service/models.py').unlink()
+        changed, removed = scanner.update()
+        self.assertEqual((changed, removed), (['shared/util.js'], ['service/models.py']))
+
+    def test_parallel_matches_sequential(self):
+        """Worker processes produce the same report as a single process"""
+        for i in range(300):
+            (self.root / 'shared' / f'mod{i}.js').write_text(f"import x from './mod{(i + 1) % 300}.js';\n")
+        sequential = self.scanner(jobs=1, cache_path=self.root / 'seq.json')
+        parallel = self.scanner(jobs=3, cache_path=self.root / 'par.json')
+        sequential.update()
+        parallel.update()
+        self.assertEqual(sequential.files, parallel.files)
+        self.assertEqual(parallel.report()['modules']['shared']['files'], 301)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the declarative artifact schemas
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from bmad_tools.fixtures import generate_tree
+from bmad_tools.schema import validate_text, validate_tree
+
+BROKEN_AGENT = """# broken
+
+```yaml
+agent:
+  name: Broken
+  id: broken
+persona:
+  style: terse
+commands: []
+dependencies:
+  tasks: create-doc.md
+```
+"""
+
+BROKEN_TEMPLATE = """template:
+  id: t
+  name: T
+  version: 1
+  output:
+    format: markdown
+workflow:
+  mode: interactive
+sections:
+  - id: top
+    sections:
+      - title: no id here
+        elicit: maybe
+"""
+
+BROKEN_WORKFLOW = """workflow:
+  id: w
+  name: W
+  sequence:
+    - agent: pm
+      creates: prd.md
+      requires: brief.md
+    - agent: architect
+      creates: architecture.md
+      requires: prd.md
+"""
+
+
+class TestSchemaValidation(unittest.TestCase):
+    """Error collection, locations and whole-tree validation"""
+
+    def test_shipped_tree_is_valid(self):
+        """Every agent, template, workflow and team in .bmad-core passes"""
+        self.assertEqual([str(e) for e in validate_tree()], [])
+
+    def test_agent_errors_are_all_reported_with_lines(self):
+        """All problems are collected, with lines relative to the markdown file"""
+        errors = {(e.path, e.line): e.message for e in validate_text('agent', BROKEN_AGENT, 'broken.md')}
+        self.assertEqual(errors[('agent.title', 5)], 'required key missing')
+        self.assertEqual(errors[('persona.role', 8)], 'required key missing')
+        self.assertEqual(errors[('commands', 9)], 'expected at least 1 item(s)')
+        self.assertEqual(errors[('dependencies.tasks', 11)], 'expected list, got str')
+        self.assertEqual(len(errors), 4)
+
+    def test_nested_template_sections(self):
+        """Section rules apply recursively at any depth"""
+        errors = {e.path: (e.line, e.message) for e in validate_text('template', BROKEN_TEMPLATE)}
+        self.assertEqual(errors['sections[0].sections[0].id'], (12, 'required key missing'))
+        self.assertEqual(errors['sections[0].sections[0].elicit'], (13, 'expected bool, got str'))
+
+    def test_workflow_sequence_dependencies(self):
+        """A required artifact must be created by an earlier step"""
+        errors = validate_text('workflow', BROKEN_WORKFLOW, 'w.yaml')
+        self.assertEqual([(e.path, e.line) for e in errors], [('workflow.sequence[0].requires', 7)])
+        self.assertIn("'brief.md'", errors[0].message)
+
+    def test_invalid_yaml_reports_line(self):
+        """Parse errors become a single located error instead of an exception"""
+        errors = validate_text('team', 'bundle:\n  name: x\nagents: [a\n')
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].message.startswith('invalid YAML'))
+
+    def test_parallel_matches_sequential(self):
+        """Worker processes give the same errors on a large synthetic tree"""
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        base = generate_tree(tmp, agents=600, templates=500, stories=1)
+        (base / 'agents' / 'agent-00000.md').write_text(BROKEN_AGENT)
+        sequential = validate_tree(base)
+        self.assertEqual(len(sequential), 4)
+        self.assertEqual([str(e) for e in validate_tree(base, jobs=2)], [str(e) for e in sequential])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for section-level concurrent editing of story files
+"""
+
+import multiprocessing
+import tempfile
+import unittest
+from pathlib import Path
+
+from bmad_tools.story import EditConflict, StoryFile, parse_sections, render_sections, template_rules
+
+STORY = """# Story 1.1: Login
+
+## Status
+
+Approved
+
+## Story
+
+**As a** user, **I want** to log in, **so that** I see my data
+
+## Acceptance Criteria
+
+1. Login works
+
+## Dev Notes
+
+### Relevant Source Tree
+
+```bash
+# not a heading
+```
+
+### Testing
+
+Use pytest.
+
+## Change Log
+
+| Date | Version | Description | Author |
+| ---- | ------- | ----------- | ------ |
+
+## Dev Agent Record
+
+### File List
+
+## QA Results
+"""
+
+
+def _editor(path, worker):
+    story = StoryFile(path)
+    for n in range(20):
+        story.append('change-log', f'| 2025-01-01 | 0.{n} | Edit {worker}-{n} | dev |', 'dev')
+        if worker == 0:
+            content, version = story.read('file-list')
+            story.edit('file-list', f'{content}\n- src/file{n}.py'.strip(), version, 'dev')
+        else:
+            content, version = story.read('qa-results')
+            story.edit('qa-results', f'{content}\n- finding {n}'.strip(), version, 'qa')
+
+
+class TestStoryFile(unittest.TestCase):
+    """Parsing, optimistic concurrency, permissions and parallel writers"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / '1.1.login.md'
+        self.path.write_text(STORY, encoding='utf-8')
+        self.story = StoryFile(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sections_round_trip(self):
+        """Template titles map to ids; unknown subheadings and fenced comments stay in their section"""
+        sections = parse_sections(STORY, template_rules())
+        self.assertEqual(render_sections(sections), STORY)
+        self.assertEqual([s['id'] for s in sections[1:]], [
+            'status', 'story', 'acceptance-criteria', 'dev-notes', 'testing-standards', 'change-log',
+            'dev-agent-record', 'file-list', 'qa-results'])
+        self.assertIn('# not a heading', self.story.read('dev-notes')[0])
+
+    def test_disjoint_edits_from_one_snapshot_merge(self):
+        """Dev and QA both edit from the same read and both changes land"""
+        seen = self.story.versions()
+        self.story.edit('file-list', '- src/login.py', seen['file-list'], 'dev')
+        self.story.edit('qa-results', 'Gate: PASS', seen['qa-results'], 'qa')
+        text = self.path.read_text(encoding='utf-8')
+        self.assertIn('### File List\n\n- src/login.py\n\n## QA Results\n\nGate: PASS\n', text)
+        self.assertIn('1. Login works', text)
+
+    def test_stale_edit_rejects_whole_batch(self):
+        """A stale base raises EditConflict and writes nothing; identical content is not a conflict"""
+        seen = self.story.versions()
+        self.story.edit('file-list', '- src/login.py', seen['file-list'], 'dev')
+        before = self.path.read_text(encoding='utf-8')
+        with self.assertRaises(EditConflict) as caught:
+            self.story.apply([{'section': 'status', 'content': 'InProgress', 'base': seen['status']},
+                              {'section': 'file-list', 'content': '- other.py', 'base': seen['file-list']}], 'dev')
+        self.assertEqual([c['section'] for c in caught.exception.conflicts], ['file-list'])
+        self.assertEqual(self.path.read_text(encoding='utf-8'), before)
+        self.story.edit('file-list', '- src/login.py', seen['file-list'], 'dev')
+
+    def test_edit_keeps_file_mode(self):
+        """Rewriting the story keeps its permission bits"""
+        self.path.chmod(0o664)
+        self.story.edit('status', 'InProgress', self.story.versions()['status'], 'dev')
+        self.assertEqual(self.path.stat().st_mode & 0o777, 0o664)
+
+    def test_editors_from_template(self):
+        """Roles come from the template's editors; dev cannot touch QA Results or the Story"""
+        seen = self.story.versions()
+        with self.assertRaises(PermissionError):
+            self.story.edit('qa-results', 'PASS', seen['qa-results'], 'dev')
+        with self.assertRaises(PermissionError):
+            self.story.edit('story', 'rewritten', seen['story'], 'dev')
+        self.story.edit('status', 'Review', seen['status'], 'dev')
+        self.assertEqual(self.story.read('status')[0], 'Review')
+
+    def test_missing_section_inserted_in_template_order(self):
+        """Appending to an absent subsection creates it in template order"""
+        self.story.append('completion-notes', '- Implemented login', 'dev')
+        ids = [s['id'] for s in parse_sections(self.path.read_text(encoding='utf-8'), template_rules())[1:]]
+        self.assertEqual(ids[-3:], ['completion-notes', 'file-list', 'qa-results'])
+        self.assertIn('### Completion Notes List\n\n- Implemented login\n\n### File List',
+                      self.path.read_text(encoding='utf-8'))
+
+    def test_parallel_agents(self):
+        """Concurrent processes appending and editing different sections lose nothing"""
+        ctx = multiprocessing.get_context('spawn')
+        procs = [ctx.Process(target=_editor, args=(str(self.path), n)) for n in range(2)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(60)
+            self.assertEqual(p.exitcode, 0)
+        change_log = self.story.read('change-log')[0]
+        self.assertEqual(sum(1 for line in change_log.split('\n') if 'Edit ' in line), 40)
+        self.assertEqual(self.story.read('file-list')[0].count('src/file'), 20)
+        self.assertEqual(self.story.read('qa-results')[0].count('finding'), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the requirements-to-test traceability index
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from bmad_tools.trace import TraceIndex, classify, parse_story
+
+REQUIREMENTS = """# Requirements
+
+## Functional
+
+- FR1: Users can sign up with email
+- FR2: Users can reset their password
+- NFR1: Login completes in under 1s
+"""
+
+EPIC = """# Epic 1 Accounts
+
+Covers FR1 and FR2.
+"""
+
+STORY = """# Story 1.1: Sign up
+
+## Status
+
+Approved
+
+## Story
+
+As a visitor I want to sign up (FR1).
+
+## Acceptance Criteria
+
+1. A visitor can create an account with email and password
+2. Duplicate emails are rejected
+3. A confirmation email is sent
+
+## Tasks / Subtasks
+
+1. Build the form (AC: 1)
+"""
+
+UNIT_TEST = """
+def test_signup_creates_account():
+    # 1.1-AC1
+    pass
+
+def test_duplicate_email():
+    # covers 1.1-AC2 and 1.1-UNIT-002
+    pass
+"""
+
+E2E_TEST = """
+it('signs up end to end', () => {
+  // 1.1-AC1
+});
+"""
+
+
+class TestTraceIndex(unittest.TestCase):
+    """Incremental indexing and epic coverage queries"""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        self._write('docs/prd/requirements.md', REQUIREMENTS)
+        self._write('docs/prd/epic-1-accounts.md', EPIC)
+        self._write('docs/stories/1.1.sign-up.md', STORY)
+        self._write('tests/unit/test_signup.py', UNIT_TEST)
+        self._write('tests/e2e/signup.spec.ts', E2E_TEST)
+        self.index = TraceIndex(self.root / '.ai' / 'trace.sqlite', self.root)
+        self.addCleanup(self.index.close)
+
+    def _write(self, rel, content):
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    def _update(self):
+        return self.index.update(['docs/prd'], ['docs/stories'], ['tests'])
+
+    def test_epic_coverage(self):
+        """AC coverage levels and uncovered requirements for an epic"""
+        self._update()
+        coverage = self.index.epic_coverage(1)
+        levels = {e['ac']: e['coverage'] for e in coverage['stories']['1.1']}
+        self.assertEqual(levels, {'AC1': 'full', 'AC2': 'unit', 'AC3': 'none'})
+        self.assertEqual(coverage['uncovered_requirements'], ['FR2'])
+
+    def test_gate_trace_block(self):
+        """gate_trace matches the trace block of the qa-gate schema"""
+        self._update()
+        trace = self.index.gate_trace('1.1')['trace']
+        self.assertEqual(trace['totals'], {'requirements': 3, 'full': 1, 'partial': 1, 'none': 1})
+        self.assertEqual([u['ac'] for u in trace['uncovered']], ['AC3'])
+
+    def test_incremental_update(self):
+        """Only changed files are re-parsed; deleted files drop their links"""
+        self.assertEqual(len(self._update()), 5)
+        self.assertEqual(self._update(), [])
+
+        self._write('tests/unit/test_signup.py', UNIT_TEST + "\ndef test_email():\n    # 1.1-AC3\n    pass\n")
+        self.assertEqual(self._update(), ['tests/unit/test_signup.py'])
+        levels = {e['ac']: e['coverage'] for e in self.index.epic_coverage(1)['stories']['1.1']}
+        self.assertEqual(levels['AC3'], 'unit')
+
+        (self.root / 'tests/e2e/signup.spec.ts').unlink()
+        self.assertEqual(self._update(), ['tests/e2e/signup.spec.ts'])
+        levels = {e['ac']: e['coverage'] for e in self.index.epic_coverage(1)['stories']['1.1']}
+        self.assertEqual(levels['AC1'], 'unit')
+
+    def test_parsing_helpers(self):
+        """Story parsing and coverage classification"""
+        story_id, epic, title, criteria, refs = parse_story('1.1.sign-up.md', STORY)
+        self.assertEqual((story_id, epic, title), ('1.1', 1, 'Sign up'))
+        self.assertEqual([ac for ac, _ in criteria], ['AC1', 'AC2', 'AC3'])
+        self.assertEqual(refs, ['FR1'])
+        self.assertEqual(classify([{'level': 'e2e'}]), 'integration')
+        self.assertEqual(classify([]), 'none')
+
+
+if __name__ == '__main__':
+    unittest.main()
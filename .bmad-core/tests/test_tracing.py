@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for span tracing and its instrumentation of the core loaders
+"""
+
+import json
+import shutil
+import tempfile
+import threading
+import time
+import timeit
+import unittest
+from pathlib import Path
+
+from bmad_tools import tracing
+from bmad_tools.core import BMAD_CORE, load_yaml, simulate_workflow, verify_manifest
+from bmad_tools.tracing import NULL_SPAN, span, traced
+
+
+@traced('square', 'test')
+def square(x):
+    return x * x
+
+
+class TestTracing(unittest.TestCase):
+    """Recording, export and the disabled fast path"""
+
+    def tearDown(self):
+        tracing.disable()
+
+    def test_nesting_and_self_time(self):
+        """Parents get children's time as total, not self time"""
+        with tracing.tracing() as tracer:
+            with span('outer', 'test'):
+                time.sleep(0.01)
+                with span('inner', 'test', item=1):
+                    time.sleep(0.02)
+        rows = {r['name']: r for r in tracer.hotspots()}
+        self.assertGreaterEqual(rows['outer']['total_ms'], 30)
+        self.assertLess(rows['outer']['self_ms'], rows['inner']['self_ms'])
+        self.assertEqual(tracer.hotspots()[0]['name'], 'inner')
+
+    def test_chrome_export(self):
+        """Complete events with microsecond timestamps, one thread_name per thread"""
+        barrier = threading.Barrier(3)
+
+        def work(n):
+            square(n)
+            barrier.wait()  # keep threads alive so their idents are not reused
+
+        with tracing.tracing() as tracer:
+            threads = [threading.Thread(target=work, args=(n,)) for n in range(3)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        tracer.write_chrome(tmp / 'trace.json')
+        events = json.loads((tmp / 'trace.json').read_text())['traceEvents']
+        complete = [e for e in events if e['ph'] == 'X']
+        self.assertEqual([e['name'] for e in complete], ['square'] * 3)
+        self.assertEqual(len({e['tid'] for e in complete}), 3)
+        self.assertEqual(len([e for e in events if e['ph'] == 'M']), 3)
+        self.assertTrue(all(e['dur'] >= 0 and e['ts'] >= 0 for e in complete))
+
+    def test_core_functions_are_instrumented(self):
+        """Loaders, manifest checks and workflow simulation emit spans"""
+        workflow = load_yaml(BMAD_CORE / 'workflows' / 'complex-problem-solving.yaml')
+        with tracing.tracing() as tracer:
+            simulate_workflow(workflow)
+            verify_manifest({'files': [{'path': '.bmad-core/core-config.yaml', 'hash': 'x'}]})
+            load_yaml(BMAD_CORE / 'core-config.yaml')
+        names = {r['name'] for r in tracer.hotspots()}
+        self.assertLessEqual({'simulate_workflow', 'verify_manifest', 'file_hash', 'load_yaml', 'read_text'}, names)
+
+    def test_disabled_is_nearly_free(self):
+        """With tracing off nothing is recorded and the wrapper adds well under a microsecond"""
+        self.assertIs(span('x'), NULL_SPAN)
+        plain = lambda x: x * x  # noqa: E731
+        runs = 200000
+        base = min(timeit.repeat(lambda: plain(3), number=runs, repeat=5))
+        wrapped = min(timeit.repeat(lambda: square(3), number=runs, repeat=5))
+        self.assertLess((wrapped - base) / runs, 1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
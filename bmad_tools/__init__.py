@@ -0,0 +1,3 @@
+"""
+Local tooling for working with a BMad .bmad-core tree
+"""
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the core .bmad-core operations at several scales
+
+For every scale a synthetic tree is generated (see fixtures.py) and each
+operation is timed over the whole tree: YAML extraction from agent files,
+template validation with check_elicit_recursive, manifest hashing and
+workflow simulation. Results report wall time, throughput and peak Python
+heap (tracemalloc) so scaling curves can be compared between runs.
+"""
+
+import argparse
+import gc
+import json
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from bmad_tools.core import check_elicit_recursive, load_agent, load_yaml, simulate_workflow, verify_manifest
+from bmad_tools.fixtures import generate_tree
+
+DEFAULT_SCALES = [100, 1000]
+
+
+def op_yaml_extraction(root, base):
+    """Parse the YAML block of every agent"""
+    paths = sorted((base / 'agents').glob('*.md'))
+    for path in paths:
+        load_agent(path)
+    return len(paths)
+
+
+def op_template_validation(root, base):
+    """Load every template and check it has an elicitation point"""
+    paths = sorted((base / 'templates').glob('*.yaml'))
+    for path in paths:
+        data = load_yaml(path)
+        check_elicit_recursive(data.get('sections', []))
+    return len(paths)
+
+
+def op_manifest_hashing(root, base):
+    """Re-hash every file listed in install-manifest.yaml"""
+    manifest = load_yaml(base / 'install-manifest.yaml')
+    mismatches = verify_manifest(manifest, root)
+    if mismatches:
+        raise AssertionError(f"{len(mismatches)} manifest mismatches in a fresh fixture")
+    return len(manifest['files'])
+
+
+def op_workflow_simulation(root, base):
+    """Simulate every workflow sequence"""
+    steps = 0
+    for path in sorted((base / 'workflows').glob('*.yaml')):
+        workflow = load_yaml(path)
+        _, problems = simulate_workflow(workflow)
+        if problems:
+            raise AssertionError(f"{path.name}: unmet requirements {problems[:3]}")
+        steps += len(workflow['workflow']['sequence'])
+    return steps
+
+
+OPERATIONS = {
+    'yaml_extraction': op_yaml_extraction,
+    'template_validation': op_template_validation,
+    'manifest_hashing': op_manifest_hashing,
+    'workflow_simulation': op_workflow_simulation,
+}
+
+
+def measure(operation, root, base, repeat=3):
+    """Best-of-repeat wall time plus peak traced memory of one extra run"""
+    best = None
+    items = 0
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        items = operation(root, base)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        operation(root, base)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'items': items,
+        'seconds': round(best, 6),
+        'items_per_second': round(items / best, 1) if best else None,
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, operations=None, repeat=3, seed=0, workdir=None):
+    """Benchmark the selected operations at each scale; returns a list of result rows"""
+    operations = operations or list(OPERATIONS)
+    results = []
+    for scale in scales:
+        root = Path(tempfile.mkdtemp(prefix=f'bmad-bench-{scale}-', dir=workdir))
+        try:
+            start = time.perf_counter()
+            base = generate_tree(root, agents=scale, tasks=scale, templates=scale,
+                                 stories=scale, workflow_steps=scale, seed=seed)
+            generate_seconds = time.perf_counter() - start
+            for name in operations:
+                row = {'operation': name, 'scale': scale, 'generate_seconds': round(generate_seconds, 3)}
+                row.update(measure(OPERATIONS[name], root, base, repeat))
+                results.append(row)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def format_table(results):
+    """Plain-text table of benchmark rows"""
+    header = f"{'operation':<22}{'scale':>8}{'items':>8}{'seconds':>12}{'items/s':>14}{'peak KiB':>12}"
+    lines = [header, '-' * len(header)]
+    for row in results:
+        lines.append(f"{row['operation']:<22}{row['scale']:>8}{row['items']:>8}{row['seconds']:>12.4f}"
+                     f"{row['items_per_second'] or 0:>14.1f}{row['peak_kib']:>12.1f}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark .bmad-core operations on synthetic trees')
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help='number of agents/tasks/templates/stories/workflow steps per run')
+    parser.add_argument('--operations', nargs='+', choices=sorted(OPERATIONS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scales, args.operations, args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_table(results))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Make-style incremental rebuild of workflow artifacts
+
+Workflow steps declare what they produce (`creates`) and consume (`requires`).
+After every successful step the engine records the content hash of each
+input artifact, of the step's task file and template, and of the produced
+artifact. On the next run a step is stale when its output is missing, when
+any of those hashes changed, or when a step it depends on is stale. Only
+stale steps run: in dependency order, with independent steps in parallel.
+Optional steps (`optional: true` or `creates: x (optional)`) whose output does
+not exist yet are only built when named as a target. An output whose hash no
+longer matches the one recorded for it was edited or damaged after its step
+ran: it is reported, but kept, and feeds the steps after it as a changed
+input. `--dry-run` lists what would rebuild and why.
+"""
+
+import argparse
+import json
+import re
+import shlex
+import subprocess
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from bmad_tools.core import BMAD_CORE, IMPLICIT_ARTIFACTS, file_hash, load_yaml, step_requires, workflow_steps
+
+DEFAULT_STATE = Path('.ai') / 'build-state.json'
+
+
+def artifact_name(value):
+    """Strip annotations such as 'v0_prompt (optional)' down to the artifact name"""
+    return re.sub(r'\s*\(.*\)\s*$', '', str(value)).strip()
+
+
+def _hash_or_none(path):
+    try:
+        return file_hash(path)
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+
+
+def _resolve_file(base_path, folders, name):
+    if not name:
+        return None
+    for folder in folders:
+        for candidate in (name, f'{name}.md', f'{name}.yaml'):
+            path = Path(base_path) / folder / candidate
+            if path.is_file():
+                return path
+    return None
+
+
+def load_build_steps(workflow, base_path=BMAD_CORE):
+    """Buildable steps (those that create an artifact) with resolved dependencies"""
+    steps = []
+    producers = {}
+    for index, step in workflow_steps(workflow):
+        if not step.get('creates'):
+            continue
+        output = artifact_name(step['creates'])
+        requires = [artifact_name(r) for r in step_requires(step) if r not in IMPLICIT_ARTIFACTS]
+        task = step.get('task') or step.get('uses')
+        build_step = {
+            'id': f'step-{index}',
+            'agent': step['agent'],
+            'output': output,
+            'requires': requires,
+            'optional': bool(step.get('optional', False)) or '(optional)' in str(step['creates']),
+            'task': task,
+            'task_path': _resolve_file(base_path, ('tasks', 'checklists'), task),
+            'template_path': _resolve_file(base_path, ('templates',), step.get('template')),
+            'depends_on': sorted({producers[r] for r in requires if r in producers}),
+        }
+        steps.append(build_step)
+        producers[output] = build_step['id']
+    return steps
+
+
+class BuildEngine:
+    """Incremental rebuild of the artifacts of one workflow"""
+
+    def __init__(self, workflow, artifact_dir='docs', state_path=DEFAULT_STATE, base_path=BMAD_CORE):
+        if not isinstance(workflow, dict):
+            workflow = load_yaml(workflow)
+        self.workflow_id = (workflow.get('workflow') or {}).get('id', 'workflow')
+        self.steps = load_build_steps(workflow, base_path)
+        self.by_id = {s['id']: s for s in self.steps}
+        self.artifact_dir = Path(artifact_dir)
+        self.state_path = Path(state_path)
+        self.state = self._load_state()
+        self._lock = threading.Lock()
+
+    def _load_state(self):
+        if self.state_path.exists():
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get(self.workflow_id, {})
+        return {}
+
+    def _save_state(self):
+        data = {}
+        if self.state_path.exists():
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        data[self.workflow_id] = self.state
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        tmp.replace(self.state_path)
+
+    def output_path(self, step):
+        return self.artifact_dir / step['output']
+
+    def signature(self, step):
+        """Current hashes of everything the step's output depends on"""
+        return {
+            'inputs': {r: _hash_or_none(self.artifact_dir / r) for r in step['requires']},
+            'task': _hash_or_none(step['task_path']) if step['task_path'] else step['task'],
+            'template': _hash_or_none(step['template_path']) if step['template_path'] else None,
+        }
+
+    def _own_reasons(self, step):
+        record = self.state.get(step['id'])
+        if not self.output_path(step).exists():
+            return ['output missing']
+        if record is None:
+            return ['never built']
+        current = self.signature(step)
+        reasons = []
+        for name, digest in current['inputs'].items():
+            if record['inputs'].get(name) != digest:
+                reasons.append(f'input changed: {name}')
+        if record.get('task') != current['task']:
+            reasons.append('task changed')
+        if record.get('template') != current['template']:
+            reasons.append('template changed')
+        return reasons
+
+    def edited_outputs(self):
+        """Steps whose existing output no longer matches the hash recorded when they built it"""
+        edited = []
+        for step in self.steps:
+            recorded = (self.state.get(step['id']) or {}).get('output')
+            current = _hash_or_none(self.output_path(step))
+            if recorded and current and recorded != current:
+                edited.append(step)
+        return edited
+
+    def plan(self, targets=None):
+        """Stale steps in dependency order as [(step, reasons)]
+
+        targets limits the plan to the named artifacts and what they depend on.
+        """
+        wanted = None
+        if targets:
+            wanted = set()
+            pending = [s['id'] for s in self.steps if s['output'] in set(targets)]
+            while pending:
+                step_id = pending.pop()
+                if step_id not in wanted:
+                    wanted.add(step_id)
+                    pending.extend(self.by_id[step_id]['depends_on'])
+
+        explicit = set(targets or [])
+        stale = {}
+        for step in self.steps:
+            if wanted is not None and step['id'] not in wanted:
+                continue
+            reasons = self._own_reasons(step)
+            # Optional steps whose output never existed are only built when targeted by name
+            if step['optional'] and reasons == ['output missing'] and step['output'] not in explicit:
+                continue
+            upstream = [d for d in step['depends_on'] if d in stale]
+            reasons += [f"upstream rebuild: {self.by_id[d]['output']}" for d in upstream]
+            if reasons:
+                stale[step['id']] = reasons
+        return [(self.by_id[step_id], reasons) for step_id, reasons in stale.items()]
+
+    def _record(self, step):
+        with self._lock:
+            record = self.signature(step)
+            record['output'] = _hash_or_none(self.output_path(step))
+            self.state[step['id']] = record
+            self._save_state()
+
+    def build(self, runner, targets=None, jobs=4):
+        """Run stale steps with runner(step, input_paths, output_path); returns {step id: status}"""
+        planned = self.plan(targets)
+        todo = {step['id'] for step, _ in planned}
+        waiting = {step['id']: {d for d in step['depends_on'] if d in todo} for step, _ in planned}
+        results = {}
+        self.artifact_dir.mkdir(parents=True, exist_ok=True)
+
+        def run(step):
+            inputs = [self.artifact_dir / r for r in step['requires']]
+            runner(step, inputs, self.output_path(step))
+            if not self.output_path(step).exists():
+                raise RuntimeError(f"{step['id']} did not produce {step['output']}")
+            self._record(step)
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            running = {}
+            while waiting or running:
+                for step_id in [s for s, deps in waiting.items() if not deps]:
+                    del waiting[step_id]
+                    running[pool.submit(run, self.by_id[step_id])] = step_id
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step_id = running.pop(future)
+                    error = future.exception()
+                    results[step_id] = 'built' if error is None else f'failed: {error}'
+                    if error is None:
+                        for deps in waiting.values():
+                            deps.discard(step_id)
+                    else:
+                        self._skip_dependents(step_id, waiting, results)
+        return results
+
+    def _skip_dependents(self, failed_id, waiting, results):
+        blocked = [failed_id]
+        while blocked:
+            current = blocked.pop()
+            for step_id in [s for s, deps in waiting.items() if current in deps]:
+                del waiting[step_id]
+                results[step_id] = f"skipped: {self.by_id[current]['output']} not rebuilt"
+                blocked.append(step_id)
+
+
+def command_runner(template):
+    """Runner that executes a shell command template for each step
+
+    Placeholders: {agent} {task} {output} {inputs} {step}
+    """
+    def run(step, inputs, output):
+        command = template.format(
+            agent=shlex.quote(step['agent']),
+            task=shlex.quote(step['task'] or ''),
+            output=shlex.quote(str(output)),
+            inputs=' '.join(shlex.quote(str(p)) for p in inputs),
+            step=step['id'],
+        )
+        subprocess.run(command, shell=True, check=True)
+    return run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rebuild stale workflow artifacts')
+    parser.add_argument('workflow', help='workflow YAML, e.g. .bmad-core/workflows/complex-problem-solving.yaml')
+    parser.add_argument('targets', nargs='*', help='only rebuild these artifacts and their dependencies')
+    parser.add_argument('--artifact-dir', default='docs')
+    parser.add_argument('--state', default=str(DEFAULT_STATE))
+    parser.add_argument('--command', help='shell command per step; placeholders {agent} {task} {output} {inputs}')
+    parser.add_argument('--jobs', type=int, default=4)
+    parser.add_argument('--dry-run', action='store_true', help='list what would rebuild and why')
+    args = parser.parse_args(argv)
+
+    engine = BuildEngine(args.workflow, args.artifact_dir, args.state)
+    for step in engine.edited_outputs():
+        print(f"⚠️ {step['output']} changed since {step['id']} built it; keeping the edited version")
+    if args.dry_run or not args.command:
+        planned = engine.plan(args.targets)
+        for step, reasons in planned:
+            print(f"🔄 {step['id']} {step['agent']} -> {step['output']}: {'; '.join(reasons)}")
+        if not planned:
+            print("✅ Everything is up to date")
+        return 0
+
+    results = engine.build(command_runner(args.command), args.targets, args.jobs)
+    for step_id, status in results.items():
+        mark = '✅' if status == 'built' else '❌'
+        print(f"{mark} {step_id} -> {engine.by_id[step_id]['output']}: {status}")
+    return 0 if all(s == 'built' for s in results.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
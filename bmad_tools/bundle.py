@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Deterministic, prefix-stable context bundles for agents and agent teams
+
+Layout of every bundle, most stable first:
+
+1. team shared layer - dependencies used by two or more agents of the team,
+   in canonical (type, name) order, identical for every agent of the team
+2. agent layer - agent definition followed by its remaining dependencies
+3. volatile layer - core-config.yaml and the current story, always last
+
+Identical inputs always produce byte-identical output, so a provider-side
+prompt-prefix cache can reuse everything up to the first agent-specific byte.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from bmad_tools.core import (
+    BMAD_CORE, DEPENDENCY_TYPES, agent_dependencies, dependency_path,
+    load_agent, load_yaml, read_text, resolve_team_agents,
+)
+
+START_MARKER = '==================== START: {} ===================='
+END_MARKER = '==================== END: {} ===================='
+
+# Top-level YAML keys that change between installs without changing meaning
+VOLATILE_KEYS = ['installed_at']
+
+
+def canonical_key(dep):
+    """Sort key giving dependencies a fixed order independent of declaration order"""
+    dep_type, name = dep
+    rank = DEPENDENCY_TYPES.index(dep_type) if dep_type in DEPENDENCY_TYPES else len(DEPENDENCY_TYPES)
+    return (rank, dep_type, name)
+
+
+def strip_volatile(content):
+    """Drop volatile top-level YAML keys such as installed_at"""
+    pattern = r'^(?:%s):.*\n?' % '|'.join(re.escape(k) for k in VOLATILE_KEYS)
+    return re.sub(pattern, '', content, flags=re.MULTILINE)
+
+
+def render_section(label, content):
+    """Wrap one file in start/end markers with normalized whitespace"""
+    body = '\n'.join(line.rstrip() for line in content.split('\n')).strip('\n')
+    return f"{START_MARKER.format(label)}\n{body}\n{END_MARKER.format(label)}\n\n"
+
+
+class BundleBuilder:
+    """Assemble bundles for the agents of one team"""
+
+    def __init__(self, agent_ids, base_path=BMAD_CORE, shared_min_agents=2):
+        self.base_path = Path(base_path)
+        self.agent_ids = list(agent_ids)
+        self.team_name = None
+        self.workflows = []
+        self.missing = []
+        self._agents = {a: load_agent(self.base_path / 'agents' / f'{a}.md') for a in self.agent_ids}
+        self._sections = {}
+
+        usage = {}
+        for agent_id in self.agent_ids:
+            for dep in set(agent_dependencies(self._agents[agent_id])):
+                usage[dep] = usage.get(dep, 0) + 1
+        shared = [dep for dep, count in usage.items() if count >= shared_min_agents]
+        self.shared = sorted(shared, key=canonical_key)
+
+    @classmethod
+    def for_team(cls, team_name, base_path=BMAD_CORE, **kwargs):
+        """Builder for a team defined in agent-teams/<team_name>.yaml"""
+        team_name = team_name[:-5] if team_name.endswith('.yaml') else team_name
+        team = load_yaml(Path(base_path) / 'agent-teams' / f'{team_name}.yaml') or {}
+        builder = cls(resolve_team_agents(team, base_path), base_path, **kwargs)
+        builder.team_name = team_name
+        builder.workflows = sorted(team.get('workflows') or [])
+        return builder
+
+    def _label(self, path):
+        return (Path(BMAD_CORE.name) / Path(path).relative_to(self.base_path)).as_posix()
+
+    def _section(self, path):
+        """Rendered section for a file under base_path, cached per builder"""
+        path = Path(path)
+        if path not in self._sections:
+            if not path.exists():
+                label = self._label(path)
+                if label not in self.missing:
+                    self.missing.append(label)
+                self._sections[path] = ''
+            else:
+                content = read_text(path)
+                if path.suffix in ('.yaml', '.yml'):
+                    content = strip_volatile(content)
+                self._sections[path] = render_section(self._label(path), content)
+        return self._sections[path]
+
+    def _deps(self, deps):
+        return ''.join(self._section(dependency_path(t, n, self.base_path)) for t, n in deps)
+
+    def shared_layer(self):
+        """Content shared by every bundle of this team"""
+        parts = []
+        if self.team_name:
+            parts.append(self._section(self.base_path / 'agent-teams' / f'{self.team_name}.yaml'))
+        parts.append(self._deps(self.shared))
+        return ''.join(parts)
+
+    def agent_layer(self, agent_id):
+        """Agent definition plus the dependencies not already in the shared layer"""
+        shared = set(self.shared)
+        own = sorted(set(agent_dependencies(self._agents[agent_id])) - shared, key=canonical_key)
+        return self._section(self.base_path / 'agents' / f'{agent_id}.md') + self._deps(own)
+
+    def volatile_layer(self, story=None):
+        """Per-project data: core-config.yaml and the current story"""
+        parts = [self._section(self.base_path / 'core-config.yaml')]
+        if story:
+            story = Path(story)
+            if story.exists():
+                parts.append(render_section(story.as_posix(), read_text(story)))
+            elif story.as_posix() not in self.missing:
+                self.missing.append(story.as_posix())
+        return ''.join(parts)
+
+    def agent_bundle(self, agent_id, story=None):
+        """Bundle for a single agent of the team"""
+        return self.shared_layer() + self.agent_layer(agent_id) + self.volatile_layer(story)
+
+    def team_bundle(self, story=None):
+        """Bundle holding every agent of the team in canonical order"""
+        parts = [self.shared_layer()]
+        for agent_id in sorted(self.agent_ids):
+            parts.append(self.agent_layer(agent_id))
+        for workflow in self.workflows:
+            parts.append(self._section(dependency_path('workflows', workflow, self.base_path)))
+        parts.append(self.volatile_layer(story))
+        return ''.join(parts)
+
+
+def shared_prefix_length(a, b):
+    """Length in bytes of the common prefix of two bundles"""
+    a, b = a.encode('utf-8'), b.encode('utf-8')
+    return len(os.path.commonprefix([a, b]))
+
+
+def prefix_report(bundles):
+    """Per-agent size and best shared prefix against the other bundles"""
+    report = []
+    for agent_id in sorted(bundles):
+        size = len(bundles[agent_id].encode('utf-8'))
+        best = max((shared_prefix_length(bundles[agent_id], other)
+                    for other_id, other in bundles.items() if other_id != agent_id), default=0)
+        report.append({
+            'agent': agent_id,
+            'bytes': size,
+            'shared_prefix': best,
+            'reuse': round(best / size, 4) if size else 0.0,
+        })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--team', default='team-fullstack', help='team name under agent-teams/')
+    parser.add_argument('--agent', help='emit a single-agent bundle instead of the team bundle')
+    parser.add_argument('--story', help='story file appended to the volatile layer')
+    parser.add_argument('--base-path', default=str(BMAD_CORE))
+    parser.add_argument('--output', help='write the bundle here instead of stdout')
+    parser.add_argument('--report', action='store_true', help='print the shared-prefix report as JSON')
+    args = parser.parse_args(argv)
+
+    builder = BundleBuilder.for_team(args.team, args.base_path)
+
+    if args.report:
+        bundles = {a: builder.agent_bundle(a, args.story) for a in builder.agent_ids}
+        print(json.dumps({'team': builder.team_name,
+                          'shared_layer_bytes': len(builder.shared_layer().encode('utf-8')),
+                          'agents': prefix_report(bundles),
+                          'missing': builder.missing}, indent=2))
+        return 0
+
+    text = builder.agent_bundle(args.agent, args.story) if args.agent else builder.team_bundle(args.story)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    for label in builder.missing:
+        print(f"⚠️  Missing dependency: {label}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
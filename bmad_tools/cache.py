@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Disk-backed LRU cache for agent task responses
+
+Entries are keyed by agent id, task file hash, template hash and a hash of
+the inputs (key order normalized, string content byte-exact), so a rerun of
+an unchanged workflow step with the same inputs returns the stored response
+instead of calling the model again.
+
+The store is a single SQLite database in WAL mode, which makes it safe to
+share between concurrent processes. Eviction is least-recently-used, bounded
+by total response size, entry count and entry age. Hit/miss counters are kept
+in the same database so statistics cover every process using the cache.
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from bmad_tools.core import file_hash
+
+DEFAULT_PATH = Path('.ai') / 'response-cache.sqlite'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    task_hash TEXT NOT NULL,
+    template_hash TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+
+def normalize_input(value):
+    """Canonical form of task inputs: mappings with sorted keys; strings are kept exactly
+
+    Whitespace in prompts is significant (code blocks, lists, indentation), so
+    only the order of mapping keys is normalized.
+    """
+    if isinstance(value, dict):
+        return {str(k): normalize_input(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [normalize_input(v) for v in value]
+    return value
+
+
+def input_hash(inputs):
+    """Hash of the normalized inputs"""
+    canonical = json.dumps(normalize_input(inputs), sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def path_hash(path):
+    """Manifest-style hash of a task or template file, or '' when there is none"""
+    return file_hash(path) if path else ''
+
+
+class ResponseCache:
+    """LRU response cache stored in SQLite"""
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE,
+                 max_entries=None, clock=time.time):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def make_key(agent_id, task_hash, template_hash, inputs_hash):
+        """Cache key combining the four identity components"""
+        return hashlib.sha256('\0'.join([agent_id, task_hash, template_hash, inputs_hash]).encode()).hexdigest()
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction under the instance lock, rolled back on any exception"""
+        with self._lock:
+            cursor = self._db.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                yield cursor
+                cursor.execute('COMMIT')
+            except BaseException:
+                cursor.execute('ROLLBACK')
+                raise
+
+    def _bump(self, cursor, name, amount=1):
+        cursor.execute('INSERT INTO stats (name, value) VALUES (?, ?) '
+                       'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value', (name, amount))
+
+    def get(self, agent_id, task_hash, template_hash, inputs):
+        """Cached response for these inputs, or None"""
+        key = self.make_key(agent_id, task_hash, template_hash, input_hash(inputs))
+        now = self.clock()
+        with self._transaction() as cursor:
+            row = cursor.execute('SELECT response, created FROM entries WHERE key = ?', (key,)).fetchone()
+            if row and self.max_age is not None and now - row[1] > self.max_age:
+                cursor.execute('DELETE FROM entries WHERE key = ?', (key,))
+                self._bump(cursor, 'evictions')
+                row = None
+            if row:
+                cursor.execute('UPDATE entries SET accessed = ?, hits = hits + 1 WHERE key = ?', (now, key))
+                self._bump(cursor, 'hits')
+            else:
+                self._bump(cursor, 'misses')
+        return row[0] if row else None
+
+    def put(self, agent_id, task_hash, template_hash, inputs, response):
+        """Store a response and evict entries beyond the configured limits"""
+        inputs_hash = input_hash(inputs)
+        key = self.make_key(agent_id, task_hash, template_hash, inputs_hash)
+        now = self.clock()
+        with self._transaction() as cursor:
+            cursor.execute(
+                'INSERT OR REPLACE INTO entries '
+                '(key, agent, task_hash, template_hash, input_hash, response, size, created, accessed) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, agent_id, task_hash, template_hash, inputs_hash, response,
+                 len(response.encode('utf-8')), now, now))
+            self._evict(cursor, now)
+        return key
+
+    def _evict(self, cursor, now):
+        evicted = 0
+        if self.max_age is not None:
+            evicted += cursor.execute('DELETE FROM entries WHERE created < ?', (now - self.max_age,)).rowcount
+        count, total = cursor.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        if (self.max_bytes is not None and total > self.max_bytes) or \
+                (self.max_entries is not None and count > self.max_entries):
+            doomed = []
+            for key, size in cursor.execute('SELECT key, size FROM entries ORDER BY accessed ASC, created ASC'):
+                over_bytes = self.max_bytes is not None and total > self.max_bytes
+                over_count = self.max_entries is not None and count > self.max_entries
+                if not (over_bytes or over_count):
+                    break
+                doomed.append((key,))
+                total -= size
+                count -= 1
+            cursor.executemany('DELETE FROM entries WHERE key = ?', doomed)
+            evicted += len(doomed)
+        if evicted:
+            self._bump(cursor, 'evictions', evicted)
+
+    def evict(self):
+        """Apply age and size limits now"""
+        with self._transaction() as cursor:
+            self._evict(cursor, self.clock())
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            counters = dict(self._db.execute('SELECT name, value FROM stats').fetchall())
+            entries, size = self._db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        hits, misses = counters.get('hits', 0), counters.get('misses', 0)
+        return {
+            'hits': hits,
+            'misses': misses,
+            'evictions': counters.get('evictions', 0),
+            'hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            'entries': entries,
+            'bytes': size,
+        }
+
+    def clear(self):
+        """Drop all entries and counters"""
+        with self._transaction() as cursor:
+            cursor.execute('DELETE FROM entries')
+            cursor.execute('DELETE FROM stats')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect or maintain the agent response cache')
+    parser.add_argument('command', choices=['stats', 'evict', 'clear'])
+    parser.add_argument('--path', default=str(DEFAULT_PATH))
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_BYTES)
+    parser.add_argument('--max-age', type=float, default=DEFAULT_MAX_AGE, help='seconds')
+    args = parser.parse_args(argv)
+
+    with ResponseCache(args.path, args.max_bytes, args.max_age) as cache:
+        if args.command == 'evict':
+            cache.evict()
+        elif args.command == 'clear':
+            cache.clear()
+        print(json.dumps(cache.stats(), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
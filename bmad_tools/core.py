@@ -0,0 +1,158 @@
+"""
+Shared loaders for the .bmad-core tree (agents, teams, config, manifest)
+"""
+
+import hashlib
+from pathlib import Path
+
+import yaml
+
+from bmad_tools.tracing import traced
+
+BMAD_CORE = Path('.bmad-core')
+
+# Folders an agent's `dependencies` block may point into
+DEPENDENCY_TYPES = ['data', 'utils', 'checklists', 'templates', 'tasks', 'workflows']
+
+# Use the libyaml bindings when PyYAML was built with them
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+@traced('read_text', 'io', lambda path: {'path': path})
+def read_text(path):
+    """Read a file as text with normalized line endings"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read().replace('\r\n', '\n')
+
+
+@traced('file_hash', 'io', lambda path: {'path': path})
+def file_hash(path):
+    """Short content hash in the format used by install-manifest.yaml (sha256, 16 hex digits)"""
+    with open(path, 'rb') as f:
+        content = f.read()
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+def extract_yaml_block(content):
+    """Return the first ```yaml fenced block of a markdown document, or None"""
+    yaml_start = content.find('```yaml')
+    if yaml_start == -1:
+        return None
+    yaml_end = content.find('```', yaml_start + 6)
+    if yaml_end == -1:
+        return None
+    return content[yaml_start + 7:yaml_end]
+
+
+@traced('load_yaml', 'yaml', lambda path: {'path': path})
+def load_yaml(path):
+    """Load a YAML file"""
+    return yaml.load(read_text(path), Loader=SafeLoader)
+
+
+@traced('load_agent', 'yaml', lambda path: {'path': path})
+def load_agent(path):
+    """Parse the YAML definition embedded in an agent markdown file"""
+    block = extract_yaml_block(read_text(path))
+    if block is None:
+        raise ValueError(f"No YAML block found in {path}")
+    return yaml.load(block, Loader=SafeLoader) or {}
+
+
+def load_core_config(base_path=BMAD_CORE):
+    """Load core-config.yaml"""
+    return load_yaml(Path(base_path) / 'core-config.yaml') or {}
+
+
+def list_agents(base_path=BMAD_CORE):
+    """Sorted ids of every agent defined under agents/"""
+    return sorted(p.stem for p in (Path(base_path) / 'agents').glob('*.md'))
+
+
+def resolve_team_agents(team, base_path=BMAD_CORE):
+    """Expand a team's agent list (including '*') into agent ids, de-duplicated"""
+    agents = []
+    for agent_id in team.get('agents', []) or []:
+        expanded = list_agents(base_path) if agent_id == '*' else [agent_id]
+        for name in expanded:
+            if name not in agents:
+                agents.append(name)
+    return agents
+
+
+def agent_dependencies(agent_config):
+    """List (type, name) dependency pairs declared by an agent definition"""
+    deps = agent_config.get('dependencies') or {}
+    pairs = []
+    for dep_type, names in deps.items():
+        for name in names or []:
+            pairs.append((dep_type, name))
+    return pairs
+
+
+def dependency_path(dep_type, name, base_path=BMAD_CORE):
+    """Resolve a dependency to its file, following the .md/.yaml workflow alias"""
+    path = Path(base_path) / dep_type / name
+    if not path.exists() and dep_type == 'workflows' and path.suffix == '.md':
+        path = path.with_suffix('.yaml')
+    return path
+
+
+def check_elicit_recursive(sections):
+    """True if any section, at any depth, has elicit: true"""
+    for section in sections or []:
+        if section.get('elicit', False):
+            return True
+        if 'sections' in section:
+            if check_elicit_recursive(section['sections']):
+                return True
+    return False
+
+
+@traced('verify_manifest', 'rule')
+def verify_manifest(manifest, root='.'):
+    """Paths whose on-disk hash no longer matches install-manifest.yaml (missing files included)"""
+    mismatches = []
+    for entry in manifest.get('files', []) or []:
+        path = Path(root) / entry['path']
+        try:
+            if file_hash(path) != entry.get('hash'):
+                mismatches.append(entry['path'])
+        except FileNotFoundError:
+            mismatches.append(entry['path'])
+    return mismatches
+
+
+# Pseudo-artifacts that workflows require without any step creating them
+IMPLICIT_ARTIFACTS = ['all_validations', 'all_documents']
+
+
+def workflow_steps(workflow):
+    """Agent steps of a workflow definition, as (index, step) with 1-based index"""
+    sequence = (workflow.get('workflow') or {}).get('sequence') or []
+    return [(i, step) for i, step in enumerate(sequence, 1) if isinstance(step, dict) and 'agent' in step]
+
+
+def step_requires(step):
+    """The `requires` of a workflow step as a list"""
+    requires = step.get('requires', [])
+    if isinstance(requires, str):
+        requires = [requires]
+    return list(requires or [])
+
+
+@traced('simulate_workflow', 'workflow')
+def simulate_workflow(workflow):
+    """Walk a workflow sequence; returns (created artifacts, [(step, missing requirement)])"""
+    artifacts = set()
+    problems = []
+    for i, step in workflow_steps(workflow):
+        if not step.get('optional', False):
+            for req in step_requires(step):
+                if req not in IMPLICIT_ARTIFACTS and req not in artifacts:
+                    problems.append((i, req))
+        creates = step.get('creates')
+        if creates:
+            artifacts.add(creates)
+    return artifacts, problems
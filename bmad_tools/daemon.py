@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Resident daemon keeping the parsed .bmad-core tree in memory
+
+`serve` loads every agent, task, template, workflow, team, core-config.yaml
+and install-manifest.yaml once and answers queries on a Unix socket. Before
+each request the tree is re-stat'ed and only files whose mtime or size changed
+are re-read; parsed data, schema errors and content hashes are memoized per
+file, bundles per tree generation.
+
+The protocol is one JSON object per line in each direction:
+
+    {"id": 1, "op": "lookup", "args": {"kind": "agent", "name": "dev"}}
+    {"id": 1, "ok": true, "result": {...}}
+
+Operations: ping, list, lookup, deps, validate, bundle, shutdown. `query()`
+(and every CLI command except serve) uses the daemon when one is listening
+and otherwise runs the same operation in-process, so callers such as editor
+integrations and git hooks never depend on it running.
+
+    python -m bmad_tools.daemon serve &
+    python -m bmad_tools.daemon validate
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+import yaml
+
+from bmad_tools.core import (
+    BMAD_CORE, SafeLoader, agent_dependencies, dependency_path, extract_yaml_block, file_hash, read_text,
+)
+
+DEFAULT_SOCKET = Path('.ai') / 'bmad-daemon.sock'
+KINDS = {
+    'agent': ('agents', '.md'),
+    'task': ('tasks', '.md'),
+    'template': ('templates', '.yaml'),
+    'workflow': ('workflows', '.yaml'),
+    'team': ('agent-teams', '.yaml'),
+    'checklist': ('checklists', '.md'),
+    'data': ('data', '.md'),
+    'util': ('utils', '.md'),
+}
+ROOT_FILES = {'core-config.yaml': 'config', 'install-manifest.yaml': 'manifest'}
+IGNORED_DIRS = {'__pycache__', 'tests', 'node_modules'}
+
+
+class QueryError(Exception):
+    """A query that cannot be answered (unknown op, missing file, invalid YAML)"""
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening on the socket"""
+
+
+class TreeModel:
+    """Parsed view of a .bmad-core tree, refreshed per file on change"""
+
+    def __init__(self, base_path=BMAD_CORE):
+        self.base_path = Path(base_path)
+        self.entries = {}
+        self.generation = 0
+        self._bundles = {}
+
+    def refresh(self):
+        """Re-stat the tree; drop entries whose file changed or vanished. Returns changed relative paths"""
+        seen, changed = set(), []
+        for folder, dirs, files in os.walk(self.base_path):
+            dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS and not d.startswith('.'))
+            for name in files:
+                path = os.path.join(folder, name)
+                rel = Path(path).relative_to(self.base_path).as_posix()
+                if self._kind(rel) is None:
+                    continue
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                seen.add(rel)
+                stamp = (st.st_mtime_ns, st.st_size)
+                entry = self.entries.get(rel)
+                if entry is None or entry['stamp'] != stamp:
+                    self.entries[rel] = {'stamp': stamp, 'path': Path(path)}
+                    changed.append(rel)
+        removed = [rel for rel in self.entries if rel not in seen]
+        for rel in removed:
+            del self.entries[rel]
+        if changed or removed:
+            self.generation += 1
+            self._bundles.clear()
+        return changed + removed
+
+    def warm(self):
+        """Parse every entry now so the first queries are answered from memory"""
+        self.refresh()
+        for rel in self.entries:
+            try:
+                self.parsed(rel)
+            except QueryError:
+                pass
+            self.schema_errors(rel)
+        return len(self.entries)
+
+    @staticmethod
+    def _kind(rel):
+        if rel in ROOT_FILES:
+            return ROOT_FILES[rel]
+        folder, _, name = rel.partition('/')
+        for kind, (kind_folder, _) in KINDS.items():
+            if folder == kind_folder and name and name.endswith(('.md', '.yaml', '.yml')):
+                return kind
+        return None
+
+    def _entry(self, rel):
+        entry = self.entries.get(rel)
+        if entry is None:
+            raise QueryError(f"{rel} not found in {self.base_path}")
+        return entry
+
+    def text(self, rel):
+        entry = self._entry(rel)
+        if 'text' not in entry:
+            entry['text'] = read_text(entry['path'])
+        return entry['text']
+
+    def parsed(self, rel):
+        """Agent YAML block, YAML document, or text for markdown files"""
+        entry = self._entry(rel)
+        if 'parsed' not in entry:
+            text = self.text(rel)
+            kind = self._kind(rel)
+            try:
+                if kind == 'agent':
+                    block = extract_yaml_block(text)
+                    entry['parsed'] = (yaml.load(block, Loader=SafeLoader) or {}) if block else None
+                elif rel.endswith(('.yaml', '.yml')):
+                    entry['parsed'] = yaml.load(text, Loader=SafeLoader)
+                else:
+                    entry['parsed'] = text
+            except yaml.YAMLError as e:
+                entry['parsed'] = None
+                entry['parse_error'] = str(e)
+        if entry.get('parse_error'):
+            raise QueryError(f"{rel}: {entry['parse_error']}")
+        return entry['parsed']
+
+    def hash(self, rel):
+        entry = self._entry(rel)
+        if 'hash' not in entry:
+            entry['hash'] = file_hash(entry['path'])
+        return entry['hash']
+
+    def schema_errors(self, rel):
+        """Schema errors of one file as dicts, memoized until the file changes"""
+        from bmad_tools.schema import kind_of, validate_text
+
+        entry = self._entry(rel)
+        if 'errors' not in entry:
+            kind = kind_of(entry['path'], self.base_path)
+            entry['errors'] = ([e.as_dict() for e in validate_text(kind, self.text(rel), str(entry['path']))]
+                               if kind else [])
+        return entry['errors']
+
+    def resolve(self, kind, name):
+        if kind not in KINDS:
+            raise QueryError(f"kind must be one of {', '.join(KINDS)}")
+        folder, suffix = KINDS[kind]
+        for candidate in (name, f'{name}{suffix}', f'{name}.yml'):
+            rel = f'{folder}/{candidate}'
+            if rel in self.entries:
+                return rel
+        raise QueryError(f"no {kind} named {name}")
+
+    # Operations
+
+    def op_ping(self):
+        return {'pid': os.getpid(), 'base_path': str(self.base_path), 'entries': len(self.entries),
+                'generation': self.generation}
+
+    def op_list(self, kind):
+        if kind not in KINDS:
+            raise QueryError(f"kind must be one of {', '.join(KINDS)}")
+        prefix = KINDS[kind][0] + '/'
+        return sorted(Path(rel).stem for rel in self.entries if rel.startswith(prefix) and '/' not in rel[len(prefix):])
+
+    def op_lookup(self, kind, name):
+        rel = self.resolve(kind, name)
+        return {'path': str(self.entries[rel]['path']), 'data': self.parsed(rel)}
+
+    def op_deps(self, agent):
+        config = self.parsed(self.resolve('agent', agent)) or {}
+        found = []
+        for dep_type, name in agent_dependencies(config):
+            path = dependency_path(dep_type, name, self.base_path)
+            rel = path.relative_to(self.base_path).as_posix()
+            found.append({'type': dep_type, 'name': name, 'path': str(path), 'exists': rel in self.entries})
+        return found
+
+    def op_validate(self, files=None):
+        """Schema errors for the given files (default: every file) and install-manifest drift"""
+        if files:
+            rels = [Path(f).resolve().relative_to(self.base_path.resolve()).as_posix() for f in files]
+        else:
+            rels = sorted(self.entries)
+        errors = [e for rel in rels for e in self.schema_errors(rel)]
+        checked = sum(1 for rel in rels if self._kind(rel) in ('agent', 'template', 'workflow', 'team'))
+        result = {'checked': checked, 'errors': errors}
+        if not files and 'install-manifest.yaml' in self.entries:
+            result['manifest_mismatches'] = self._manifest_mismatches()
+        return result
+
+    def _manifest_mismatches(self):
+        manifest = self.parsed('install-manifest.yaml') or {}
+        root = self.base_path.parent
+        mismatches = []
+        for item in manifest.get('files', []) or []:
+            path = root / item['path']
+            try:
+                rel = path.relative_to(self.base_path).as_posix()
+            except ValueError:
+                rel = None
+            try:
+                actual = self.hash(rel) if rel in self.entries else file_hash(path)
+            except FileNotFoundError:
+                actual = None
+            if actual != item.get('hash'):
+                mismatches.append(item['path'])
+        return mismatches
+
+    def op_bundle(self, agent=None, team=None, story=None):
+        """Bundle text for one agent (optionally of a team) or a whole team, memoized per generation"""
+        from bmad_tools.bundle import BundleBuilder
+
+        if not agent and not team:
+            raise QueryError('bundle needs an agent or a team')
+        story_stamp = None
+        if story and os.path.exists(story):
+            st = os.stat(story)
+            story_stamp = (st.st_mtime_ns, st.st_size)
+        key = (agent, team, story, story_stamp)
+        if key not in self._bundles:
+            try:
+                if team:
+                    builder = BundleBuilder.for_team(team, self.base_path)
+                    text = builder.agent_bundle(agent, story) if agent else builder.team_bundle(story)
+                else:
+                    builder = BundleBuilder([agent], self.base_path)
+                    text = builder.agent_bundle(agent, story)
+            except (FileNotFoundError, KeyError, ValueError) as e:
+                raise QueryError(str(e))
+            self._bundles[key] = {'text': text, 'missing': builder.missing}
+        return self._bundles[key]
+
+
+def dispatch(model, op, args=None):
+    """Run one operation against a model; the daemon and the in-process fallback share this"""
+    handler = getattr(model, f'op_{op}', None)
+    if handler is None:
+        raise QueryError(f"unknown op '{op}'")
+    model.refresh()
+    try:
+        return handler(**(args or {}))
+    except TypeError as e:
+        raise QueryError(f"{op}: {e}")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                op = request.get('op')
+                if op == 'shutdown':
+                    response = {'ok': True, 'result': None}
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                else:
+                    with self.server.lock:
+                        response = {'ok': True, 'result': dispatch(self.server.model, op, request.get('args'))}
+            except QueryError as e:
+                response = {'ok': False, 'error': str(e)}
+            except Exception as e:  # keep serving; report the failure to the caller
+                response = {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+            response['id'] = request.get('id') if isinstance(request, dict) else None
+            self.wfile.write((json.dumps(response, ensure_ascii=False, default=str) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, model):
+        self.model = model
+        self.lock = threading.Lock()
+        self.socket_path = Path(socket_path)
+        super().__init__(str(socket_path), _Handler)
+        os.chmod(socket_path, 0o600)
+
+
+def serve(socket_path=DEFAULT_SOCKET, base_path=BMAD_CORE, ready=None):
+    """Run the daemon until a shutdown request or SIGTERM"""
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        try:
+            request('ping', socket_path=socket_path)
+            raise RuntimeError(f"a daemon is already listening on {socket_path}")
+        except DaemonUnavailable:
+            socket_path.unlink()
+    model = TreeModel(base_path)
+    model.warm()
+    server = DaemonServer(socket_path, model)
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    if ready:
+        ready()
+    try:
+        server.serve_forever(poll_interval=0.2)
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+
+
+def request(op, socket_path=DEFAULT_SOCKET, timeout=10.0, **args):
+    """Send one request to a running daemon; raises DaemonUnavailable or QueryError"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise DaemonUnavailable(str(e))
+        sock.sendall((json.dumps({'id': 1, 'op': op, 'args': args}) + '\n').encode('utf-8'))
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise DaemonUnavailable('daemon closed the connection')
+    response = json.loads(line)
+    if not response.get('ok'):
+        raise QueryError(response.get('error'))
+    return response['result']
+
+
+_local_models = {}
+
+
+def query(op, base_path=BMAD_CORE, socket_path=DEFAULT_SOCKET, fallback=True, **args):
+    """Ask the daemon, or answer in-process when it is not running and fallback is allowed"""
+    try:
+        return request(op, socket_path=socket_path, **args)
+    except DaemonUnavailable:
+        if not fallback:
+            raise
+    key = str(Path(base_path).resolve())
+    if key not in _local_models:
+        _local_models[key] = TreeModel(base_path)
+    # Round-trip through JSON so both paths return the same types
+    return json.loads(json.dumps(dispatch(_local_models[key], op, args), default=str))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Resident .bmad-core model daemon and its client')
+    parser.add_argument('--socket', default=str(DEFAULT_SOCKET))
+    parser.add_argument('--base-path', default=str(BMAD_CORE))
+    parser.add_argument('--no-fallback', action='store_true', help='fail instead of running in-process')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('serve', help='run the daemon in the foreground')
+    sub.add_parser('status')
+    sub.add_parser('stop')
+    p = sub.add_parser('validate', help='schema errors and manifest drift')
+    p.add_argument('files', nargs='*')
+    p = sub.add_parser('lookup')
+    p.add_argument('kind', choices=sorted(KINDS))
+    p.add_argument('name')
+    p = sub.add_parser('list')
+    p.add_argument('kind', choices=sorted(KINDS))
+    p = sub.add_parser('deps')
+    p.add_argument('agent')
+    p = sub.add_parser('bundle')
+    p.add_argument('--agent')
+    p.add_argument('--team')
+    p.add_argument('--story')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        try:
+            serve(args.socket, args.base_path,
+                  ready=lambda: print(f"✅ Serving {args.base_path} on {args.socket}", file=sys.stderr))
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        return 0
+    if args.command in ('status', 'stop'):
+        try:
+            info = request('ping', socket_path=args.socket)
+            if args.command == 'stop':
+                request('shutdown', socket_path=args.socket)
+                print(f"✅ Stopped daemon (pid {info['pid']})")
+            else:
+                print(f"✅ Daemon pid {info['pid']} serving {info['base_path']} ({info['entries']} files)")
+            return 0
+        except DaemonUnavailable:
+            print(f"❌ No daemon on {args.socket}")
+            return 1
+
+    op_args = {k: v for k, v in vars(args).items() if k in ('files', 'kind', 'name', 'agent', 'team', 'story')}
+    op = {'validate': 'validate', 'lookup': 'lookup', 'list': 'list', 'deps': 'deps', 'bundle': 'bundle'}[args.command]
+    start = time.perf_counter()
+    try:
+        result = query(op, args.base_path, args.socket, not args.no_fallback, **op_args)
+    except (QueryError, DaemonUnavailable) as e:
+        print(f"❌ {e}")
+        return 1
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if op == 'validate':
+        for error in result['errors']:
+            print(f"❌ {error['file']}:{error['line']}: {error['path'] or '<root>'}: {error['message']}")
+        for path in result.get('manifest_mismatches', []):
+            print(f"❌ {path}: hash differs from install-manifest.yaml")
+        if not result['errors'] and not result.get('manifest_mismatches'):
+            print(f"✅ {result['checked']} files valid ({elapsed:.1f} ms)")
+        return 1 if result['errors'] or result.get('manifest_mismatches') else 0
+    if op == 'bundle':
+        sys.stdout.write(result['text'])
+        return 0
+    print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
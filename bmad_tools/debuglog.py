@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Structured, rotating dev debug log (core-config.yaml `devDebugLog`)
+
+Instead of one ever-growing markdown file, every event is a JSON record in an
+append-only segment file under a folder named after `devDebugLog`
+(`.ai/debug-log.md` -> `.ai/debug-log/`). Records carry the story, agent and
+task they belong to plus a level (info, warning, failure).
+
+- Each segment has a small tab-separated sidecar index (offset, length,
+  level, story) so "entries for story X" and "last N failures" seek straight
+  to the matching records.
+- The active segment rotates once it exceeds `segment_bytes`; when the whole
+  log exceeds `max_bytes`, the oldest segments are compacted down to their
+  warnings and failures and, if still too large, dropped.
+- Appends and compaction take an exclusive `fcntl` lock and queries a shared
+  one, so several agents can write at once and a reader never pairs a
+  compacted index with the old segment.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are not serialized
+    fcntl = None
+
+from bmad_tools.core import BMAD_CORE, load_core_config
+
+LEVELS = ['info', 'warning', 'failure']
+KEEP_ON_COMPACT = {'warning', 'failure'}
+DEFAULT_SEGMENT_BYTES = 1024 * 1024
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+SEGMENT_RE = re.compile(r'^segment-(\d{6})\.jsonl$')
+INDEX_ESCAPES = {'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'}
+INDEX_UNESCAPES = {v: k for k, v in INDEX_ESCAPES.items()}
+
+
+def _index_field(value):
+    """Story value for the tab-separated index, with tabs and newlines escaped"""
+    return re.sub(r'[\\\t\n\r]', lambda m: INDEX_ESCAPES[m.group()], str(value or ''))
+
+
+def _index_value(field):
+    return re.sub(r'\\[\\tnr]', lambda m: INDEX_UNESCAPES[m.group()], field)
+
+
+def log_dir_for(debug_log_path):
+    """Folder holding the structured log for a devDebugLog path"""
+    path = Path(debug_log_path)
+    return path.with_suffix('') if path.suffix else path
+
+
+class DebugLog:
+    """Append-only segmented JSONL log with per-segment indexes"""
+
+    def __init__(self, path, segment_bytes=DEFAULT_SEGMENT_BYTES, max_bytes=DEFAULT_MAX_BYTES, clock=time.time):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.clock = clock
+
+    @classmethod
+    def from_config(cls, base_path=BMAD_CORE, project_root='.', **kwargs):
+        """The log configured by devDebugLog in core-config.yaml"""
+        config = load_core_config(base_path)
+        return cls(Path(project_root) / log_dir_for(config.get('devDebugLog', '.ai/debug-log.md')), **kwargs)
+
+    @contextmanager
+    def _locked(self, shared=False):
+        with open(self.path / '.lock', 'a') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def segments(self):
+        """Segment numbers, oldest first"""
+        return sorted(int(m.group(1)) for m in (SEGMENT_RE.match(p.name) for p in self.path.iterdir()) if m)
+
+    def _segment(self, number):
+        return self.path / f'segment-{number:06d}.jsonl'
+
+    def _index(self, number):
+        return self.path / f'segment-{number:06d}.idx'
+
+    def append(self, message, story=None, agent=None, task=None, level='info', **data):
+        """Write one record; returns it"""
+        if level not in LEVELS:
+            raise ValueError(f"level must be one of {', '.join(LEVELS)}")
+        record = {'ts': round(self.clock(), 3), 'level': level, 'story': story, 'agent': agent,
+                  'task': task, 'message': message}
+        if data:
+            record['data'] = data
+        line = (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+        with self._locked():
+            segments = self.segments()
+            number = segments[-1] if segments else 1
+            segment = self._segment(number)
+            if segment.exists() and segment.stat().st_size >= self.segment_bytes:
+                number += 1
+                segment = self._segment(number)
+            fd = os.open(segment, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                offset = os.lseek(fd, 0, os.SEEK_END)
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            with open(self._index(number), 'a', encoding='utf-8') as idx:
+                idx.write(f"{offset}\t{len(line)}\t{level}\t{_index_field(story)}\n")
+            if number not in segments:
+                self._enforce_size()
+        return record
+
+    def _read_index(self, number):
+        try:
+            with open(self._index(number), 'r', encoding='utf-8') as idx:
+                return [(int(o), int(n), lvl, _index_value(story)) for o, n, lvl, story in
+                        (line.rstrip('\n').split('\t') for line in idx if line.strip())]
+        except FileNotFoundError:
+            return []
+
+    def _read_records(self, number, entries):
+        records = []
+        with open(self._segment(number), 'rb') as f:
+            for offset, length, _, _ in entries:
+                f.seek(offset)
+                records.append(json.loads(f.read(length)))
+        return records
+
+    def query(self, story=None, level=None, limit=None):
+        """Matching records, oldest first; limit keeps the newest N"""
+        found = []
+        with self._locked(shared=True):
+            for number in reversed(self.segments()):
+                entries = [e for e in self._read_index(number)
+                           if (story is None or e[3] == str(story)) and (level is None or e[2] == level)]
+                if limit is not None:
+                    entries = entries[-(limit - len(found)):] if limit > len(found) else []
+                found = self._read_records(number, entries) + found
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def for_story(self, story):
+        """Every record tagged with a story"""
+        return self.query(story=story)
+
+    def last_failures(self, n=10, story=None):
+        """The newest n failure records"""
+        return self.query(story=story, level='failure', limit=n)
+
+    def total_bytes(self):
+        return sum(self._segment(n).stat().st_size for n in self.segments())
+
+    def compact(self):
+        """Shrink the log below max_bytes, oldest segments first"""
+        with self._locked():
+            self._enforce_size()
+
+    def _enforce_size(self):
+        segments = self.segments()
+        total = sum(self._segment(n).stat().st_size for n in segments)
+        # First pass keeps warnings and failures; second pass drops whole segments
+        for drop in (False, True):
+            for number in segments[:-1]:
+                if total <= self.max_bytes:
+                    return
+                before = self._segment(number).stat().st_size if self._segment(number).exists() else 0
+                if drop:
+                    self._segment(number).unlink(missing_ok=True)
+                    self._index(number).unlink(missing_ok=True)
+                    total -= before
+                else:
+                    total -= before - self._compact_segment(number)
+
+    def _compact_segment(self, number):
+        entries = [e for e in self._read_index(number) if e[2] in KEEP_ON_COMPACT]
+        records = self._read_records(number, entries)
+        tmp_segment = self._segment(number).with_suffix('.tmp')
+        tmp_index = self._index(number).with_suffix('.idxtmp')
+        offset = 0
+        with open(tmp_segment, 'wb') as seg, open(tmp_index, 'w', encoding='utf-8') as idx:
+            for record in records:
+                line = (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+                seg.write(line)
+                idx.write(f"{offset}\t{len(line)}\t{record['level']}\t{_index_field(record.get('story'))}\n")
+                offset += len(line)
+        tmp_segment.replace(self._segment(number))
+        tmp_index.replace(self._index(number))
+        return offset
+
+
+def render_markdown(records):
+    """Compact markdown view of records for pasting into agent context"""
+    lines = []
+    for r in records:
+        stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(r['ts']))
+        tags = ' '.join(f"{k}={r[k]}" for k in ('story', 'agent', 'task') if r.get(k))
+        lines.append(f"- {stamp} **{r['level']}** {tags}: {r['message']}")
+    return '\n'.join(lines) + ('\n' if lines else '')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Append to or query the structured dev debug log')
+    parser.add_argument('command', choices=['append', 'story', 'failures', 'compact'])
+    parser.add_argument('message', nargs='?', help='message for append')
+    parser.add_argument('--story')
+    parser.add_argument('--agent')
+    parser.add_argument('--task')
+    parser.add_argument('--level', default='info', choices=LEVELS)
+    parser.add_argument('-n', type=int, default=10, help='number of failures to show')
+    parser.add_argument('--path', help='log folder (default: from devDebugLog)')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    log = DebugLog(args.path) if args.path else DebugLog.from_config()
+    if args.command == 'append':
+        if not args.message:
+            parser.error('append needs a message')
+        log.append(args.message, args.story, args.agent, args.task, args.level)
+        return 0
+    if args.command == 'compact':
+        log.compact()
+        print(f"✅ Debug log is {log.total_bytes()} bytes in {len(log.segments())} segments")
+        return 0
+    if args.command == 'story':
+        if not args.story:
+            parser.error('story needs --story')
+        records = log.for_story(args.story)
+    else:
+        records = log.last_failures(args.n, args.story)
+    print(json.dumps(records, indent=2, ensure_ascii=False) if args.json else render_markdown(records), end='')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
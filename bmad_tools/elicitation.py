@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Record and replay interactive elicitation sessions (create-doc.md / advanced-elicitation.md)
+
+A session walks a YAML template section by section. For each section the
+model drafts content; for `elicit: true` sections the user then picks from
+the numbered 1-9 menu (1 = proceed) or types feedback, and every choice leads
+to another model turn until the user proceeds.
+
+`SessionRecorder` captures that exchange as a compact JSON Lines transcript:
+prompts, responses, numbered choices and free-text feedback, together with a
+fingerprint of every template section. `replay` re-runs the session from the
+transcript alone, with no model or user involved, and reports drift: sections
+whose definition changed, sections added or removed, and recorded prompts
+that no longer match what the current template produces.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from bmad_tools.core import file_hash, load_yaml
+
+TRANSCRIPT_VERSION = 1
+PROCEED = 1
+
+
+def flatten_sections(sections, parent=''):
+    """Depth-first list of (section path, section) pairs, paths joined with '/'"""
+    flat = []
+    for section in sections or []:
+        path = f"{parent}/{section['id']}" if parent else section['id']
+        flat.append((path, section))
+        flat.extend(flatten_sections(section.get('sections'), path))
+    return flat
+
+
+def section_fingerprint(section):
+    """Hash of a section's own definition, excluding its child sections"""
+    own = {k: v for k, v in section.items() if k != 'sections'}
+    canonical = json.dumps(own, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def section_prompt(section):
+    """Drafting prompt for one section, derived only from the template"""
+    lines = [f"Section: {section.get('title', section['id'])}"]
+    if section.get('instruction'):
+        lines += ['', section['instruction'].strip()]
+    if section.get('template'):
+        lines += ['', 'Format:', section['template'].strip()]
+    return '\n'.join(lines)
+
+
+def elicitation_prompt(section, choice):
+    """Follow-up prompt after the user picks a menu option or gives feedback"""
+    title = section.get('title', section['id'])
+    if isinstance(choice, int):
+        return f"Apply elicitation option {choice} to section: {title}"
+    return f"User feedback on section {title}:\n{choice}"
+
+
+def run_session(template, model, user, recorder=None):
+    """Drive a template through model and user callables; returns {section path: final content}
+
+    model(path, prompt) -> text; user(path, content) -> int menu option or feedback text
+    """
+    document = {}
+    for path, section in flatten_sections(template.get('sections')):
+        prompt = section_prompt(section)
+        if recorder:
+            recorder.prompt(path, prompt)
+        content = model(path, prompt)
+        if recorder:
+            recorder.response(path, content)
+        if section.get('elicit', False):
+            while True:
+                choice = user(path, content)
+                if recorder:
+                    recorder.choice(path, choice)
+                if choice == PROCEED:
+                    break
+                prompt = elicitation_prompt(section, choice)
+                if recorder:
+                    recorder.prompt(path, prompt)
+                content = model(path, prompt)
+                if recorder:
+                    recorder.response(path, content)
+        document[path] = content
+    return document
+
+
+class SessionRecorder:
+    """Collects session events for one template"""
+
+    def __init__(self, template_path, task_path=None):
+        self.template_path = Path(template_path)
+        template = load_yaml(self.template_path)
+        meta = template.get('template') or {}
+        self.header = {
+            'type': 'session',
+            'version': TRANSCRIPT_VERSION,
+            'template': meta.get('id', self.template_path.stem),
+            'template_version': meta.get('version'),
+            'template_hash': file_hash(self.template_path),
+            'task_hash': file_hash(task_path) if task_path else None,
+            'sections': {path: section_fingerprint(s) for path, s in flatten_sections(template.get('sections'))},
+        }
+        self.template = template
+        self.events = []
+
+    def prompt(self, section, text):
+        self.events.append({'t': 'p', 's': section, 'x': text})
+
+    def response(self, section, text):
+        self.events.append({'t': 'r', 's': section, 'x': text})
+
+    def choice(self, section, choice):
+        if isinstance(choice, int):
+            self.events.append({'t': 'c', 's': section, 'o': choice})
+        else:
+            self.events.append({'t': 'f', 's': section, 'x': choice})
+
+    def save(self, path):
+        """Write the transcript; a .gz suffix gzips it"""
+        write_transcript(path, self.header, self.events)
+
+
+def write_transcript(path, header, events):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [json.dumps(header, ensure_ascii=False, separators=(',', ':'), sort_keys=True)]
+    lines += [json.dumps(e, ensure_ascii=False, separators=(',', ':')) for e in events]
+    data = ('\n'.join(lines) + '\n').encode('utf-8')
+    if path.suffix == '.gz':
+        data = gzip.compress(data, mtime=0)
+    path.write_bytes(data)
+
+
+def read_transcript(path):
+    """(header, events) from a transcript file"""
+    data = Path(path).read_bytes()
+    if str(path).endswith('.gz'):
+        data = gzip.decompress(data)
+    lines = [json.loads(line) for line in data.decode('utf-8').splitlines() if line.strip()]
+    if not lines or lines[0].get('type') != 'session':
+        raise ValueError(f"{path}: not an elicitation transcript")
+    return lines[0], lines[1:]
+
+
+class ReplayMismatch(Exception):
+    """The replayed session asked for something the transcript does not hold"""
+
+
+class _Replayer:
+    """Serves recorded responses and choices in order, noting drift instead of stopping"""
+
+    def __init__(self, events):
+        self.queues = {}
+        for event in events:
+            self.queues.setdefault(event['s'], []).append(event)
+        self.drift = []
+
+    def _note(self, section, kind, detail=None):
+        entry = {'section': section, 'kind': kind}
+        if detail:
+            entry['detail'] = detail
+        if entry not in self.drift:
+            self.drift.append(entry)
+
+    def _next(self, section, kinds):
+        queue = self.queues.get(section)
+        if not queue:
+            self._note(section, 'unrecorded')
+            return None
+        if queue[0]['t'] not in kinds:
+            raise ReplayMismatch(f"{section}: expected {'/'.join(kinds)} event, found {queue[0]['t']}")
+        return queue.pop(0)
+
+    def model(self, section, prompt):
+        recorded = self._next(section, ('p',))
+        if recorded is None:
+            return ''
+        if recorded['x'] != prompt:
+            self._note(section, 'prompt-changed')
+        response = self._next(section, ('r',))
+        return response['x'] if response else ''
+
+    def user(self, section, content):
+        event = self._next(section, ('c', 'f'))
+        if event is None:
+            return PROCEED
+        return event['o'] if event['t'] == 'c' else event['x']
+
+
+def template_drift(header, template):
+    """Sections added, removed or changed since the transcript was recorded"""
+    current = {path: section_fingerprint(s) for path, s in flatten_sections(template.get('sections'))}
+    recorded = header.get('sections', {})
+    drift = []
+    for path in recorded:
+        if path not in current:
+            drift.append({'section': path, 'kind': 'removed'})
+        elif current[path] != recorded[path]:
+            drift.append({'section': path, 'kind': 'changed'})
+    for path in current:
+        if path not in recorded:
+            drift.append({'section': path, 'kind': 'added'})
+    return drift
+
+
+def replay(transcript_path, template_path):
+    """Replay a transcript against the current template
+
+    Returns {'document', 'drift', 'ok'}; ok is False when any drift was found.
+    """
+    header, events = read_transcript(transcript_path)
+    template = load_yaml(template_path)
+
+    drift = template_drift(header, template)
+    replayer = _Replayer(events)
+    document = {}
+    try:
+        document = run_session(template, replayer.model, replayer.user)
+    except ReplayMismatch as e:
+        replayer.drift.append({'section': str(e).split(':')[0], 'kind': 'replay-failed', 'detail': str(e)})
+    for section, queue in replayer.queues.items():
+        if queue:
+            replayer.drift.append({'section': section, 'kind': 'unconsumed-events',
+                                   'detail': f"{len(queue)} events left"})
+
+    # Structural drift explains the replay symptoms of the same section; report each section once
+    flagged = {d['section'] for d in drift}
+    for d in replayer.drift:
+        if d['section'] not in flagged:
+            drift.append(d)
+            flagged.add(d['section'])
+    return {'document': document, 'drift': drift, 'ok': not drift}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay a recorded elicitation session')
+    parser.add_argument('transcript')
+    parser.add_argument('template', help='template YAML to replay against')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    result = replay(args.transcript, args.template)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        for d in result['drift']:
+            print(f"❌ {d['section']}: {d['kind']}" + (f" ({d['detail']})" if d.get('detail') else ''))
+        if result['ok']:
+            print(f"✅ Replayed {len(result['document'])} sections without drift")
+    return 0 if result['ok'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
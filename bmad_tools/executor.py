@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Headless executor for iterative thinking plans (create-thinking-plan.md / execute-step.md)
+
+Each plan step becomes one chat-completion request against an
+OpenAI-compatible endpoint. Steps start as soon as the steps named in their
+`prerequisites` have completed, so independent steps run concurrently. All
+requests of all plans in a run share one pooled keep-alive HTTP client, a
+global concurrency limit and an optional requests-per-second rate limit.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import ssl
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import yaml
+
+from bmad_tools.cache import ResponseCache, path_hash
+from bmad_tools.core import BMAD_CORE, SafeLoader, extract_yaml_block, read_text
+
+DEFAULT_SYSTEM_PROMPT = (
+    "You are Sage, a systematic problem solver executing one step of an iterative "
+    "thinking plan. Answer the step's focus question using the listed methods, build "
+    "on the outputs of earlier steps, and make sure every validation criterion is met."
+)
+
+EXECUTE_STEP_TASK = BMAD_CORE / 'tasks' / 'execute-step.md'
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """Raised when the endpoint returns an error or an unusable response"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class TransientError(LLMError):
+    """A timeout or dropped connection; always worth retrying"""
+
+
+class RateLimiter:
+    """Spaces request starts so no more than `rate` begin per second"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = None
+
+    async def wait(self):
+        if not self.interval:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class LLMClient:
+    """Minimal async HTTP/1.1 client with a keep-alive connection pool"""
+
+    def __init__(self, base_url, api_key=None, max_connections=8, timeout=120.0):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.secure = parts.scheme == 'https'
+        self.port = parts.port or (443 if self.secure else 80)
+        self.prefix = parts.path.rstrip('/')
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.requests_sent = 0
+        self.connections_opened = 0
+        self._idle = []
+        self._slots = None
+
+    async def _acquire(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_connections)
+        await self._slots.acquire()
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        try:
+            context = ssl.create_default_context() if self.secure else None
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, ssl=context), self.timeout)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.connections_opened += 1
+        return reader, writer, False
+
+    def _release(self, reader, writer, reuse):
+        if reuse:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        self._slots.release()
+
+    async def _exchange(self, reader, writer, path, body):
+        headers = [
+            f"POST {self.prefix}{path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            "Connection: keep-alive",
+        ]
+        if self.api_key:
+            headers.append(f"Authorization: Bearer {self.api_key}")
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by server")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        reuse = response_headers.get('connection', '').lower() != 'close'
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            payload = b''.join(chunks)
+        elif 'content-length' in response_headers:
+            payload = await reader.readexactly(int(response_headers['content-length']))
+        else:
+            payload = await reader.read()
+            reuse = False
+        return status, payload, reuse
+
+    async def post_json(self, path, data):
+        """POST a JSON body and return (status, decoded JSON or raw text)"""
+        body = json.dumps(data).encode('utf-8')
+        for attempt in range(2):
+            try:
+                reader, writer, reused = await self._acquire()
+            except asyncio.TimeoutError as e:
+                raise TransientError(f"connect timed out after {self.timeout}s") from e
+            except OSError as e:
+                raise TransientError(f"connection failed: {e}") from e
+            try:
+                status, payload, reuse = await asyncio.wait_for(
+                    self._exchange(reader, writer, path, body), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                self._release(reader, writer, False)
+                # A pooled connection may have been closed by the server while idle
+                if reused and attempt == 0:
+                    continue
+                raise TransientError(f"connection failed: {e}") from e
+            except asyncio.TimeoutError as e:
+                self._release(reader, writer, False)
+                raise TransientError(f"request timed out after {self.timeout}s") from e
+            except BaseException:
+                self._release(reader, writer, False)
+                raise
+            self._release(reader, writer, reuse)
+            self.requests_sent += 1
+            try:
+                return status, json.loads(payload.decode('utf-8'))
+            except ValueError:
+                return status, payload.decode('utf-8', 'replace')
+
+    async def chat(self, messages, model, **params):
+        """Run one chat completion and return the assistant message text"""
+        status, data = await self.post_json('/chat/completions', dict(params, model=model, messages=messages))
+        if status != 200:
+            raise LLMError(f"HTTP {status}: {str(data)[:200]}", status)
+        try:
+            return data['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"unexpected response shape: {str(data)[:200]}", status) from e
+
+    async def aclose(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+def _step_id(value):
+    """Normalize step references (1, '1', 'step-1') to 'step-1'"""
+    value = str(value).strip()
+    return value if value.startswith('step-') else f'step-{value}'
+
+
+def load_plan(source):
+    """Load a thinking plan from a YAML file, a markdown file with a YAML block, or a dict"""
+    if isinstance(source, dict):
+        data = source
+    else:
+        text = read_text(source)
+        if str(source).endswith('.md'):
+            text = extract_yaml_block(text) or text
+        data = yaml.load(text, Loader=SafeLoader) or {}
+
+    plan = dict(data.get('thinking_plan') or data.get('plan_metadata') or {})
+    steps = (data.get('thinking_plan') or {}).get('steps') or data.get('thinking_steps') or data.get('steps') or []
+    if not plan.get('plan_id'):
+        plan['plan_id'] = 'plan' if isinstance(source, dict) else Path(source).stem
+    plan['problem'] = (data.get('problem_context') or {}).get('statement') or data.get('problem', '')
+
+    parsed = []
+    for position, step in enumerate(steps, 1):
+        number = step.get('step', position)
+        parsed.append({
+            'id': _step_id(number),
+            'number': number,
+            'title': step.get('title', f'Step {number}'),
+            'focus_question': step.get('focus_question', ''),
+            'methods': list(step.get('methods') or []),
+            'validation_criteria': list(step.get('validation_criteria') or []),
+            'prerequisites': [_step_id(p) for p in step.get('prerequisites') or []],
+        })
+    plan['steps'] = parsed
+    check_plan(plan)
+    return plan
+
+
+def check_plan(plan):
+    """Reject unknown prerequisites and dependency cycles"""
+    ids = {step['id'] for step in plan['steps']}
+    for step in plan['steps']:
+        for req in step['prerequisites']:
+            if req not in ids:
+                raise ValueError(f"{plan['plan_id']}: {step['id']} requires unknown {req}")
+    remaining = {step['id']: set(step['prerequisites']) for step in plan['steps']}
+    while remaining:
+        ready = [s for s, reqs in remaining.items() if not reqs]
+        if not ready:
+            raise ValueError(f"{plan['plan_id']}: dependency cycle among {sorted(remaining)}")
+        for s in ready:
+            del remaining[s]
+        for reqs in remaining.values():
+            reqs.difference_update(ready)
+
+
+def build_messages(plan, step, prior, system_prompt=DEFAULT_SYSTEM_PROMPT):
+    """Chat messages for one step, including the outputs it depends on"""
+    lines = []
+    if plan.get('problem'):
+        lines += [f"Problem: {plan['problem']}", '']
+    lines.append(f"Step {step['number']} of {len(plan['steps'])}: {step['title']}")
+    if step['focus_question']:
+        lines.append(f"Focus question: {step['focus_question']}")
+    if step['methods']:
+        lines.append(f"Methods: {', '.join(step['methods'])}")
+    if step['validation_criteria']:
+        lines.append('Validation criteria:')
+        lines += [f"- {c}" for c in step['validation_criteria']]
+    for req in step['prerequisites']:
+        lines += ['', f"Output of {req}:", prior[req]]
+    return [{'role': 'system', 'content': system_prompt}, {'role': 'user', 'content': '\n'.join(lines)}]
+
+
+class PlanExecutor:
+    """Run plan steps against an LLM client, respecting prerequisites and limits"""
+
+    def __init__(self, client, model, concurrency=4, rate_limit=None, max_retries=3,
+                 backoff=1.0, system_prompt=DEFAULT_SYSTEM_PROMPT, cache=None,
+                 agent_id='problem-solver', task_path=EXECUTE_STEP_TASK, template_path=None, **params):
+        self.client = client
+        self.model = model
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate_limit)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.system_prompt = system_prompt
+        self.params = params
+        self.cache = cache
+        self.agent_id = agent_id
+        self.task_hash = path_hash(task_path) if task_path and Path(task_path).exists() else ''
+        self.template_hash = path_hash(template_path)
+        self._slots = None
+
+    def _cache_parts(self, messages):
+        inputs = {'model': self.model, 'params': self.params, 'messages': messages}
+        return self.agent_id, self.task_hash, self.template_hash, inputs
+
+    async def _call(self, messages):
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.wait()
+            try:
+                try:
+                    return await self.client.chat(messages, self.model, **self.params)
+                except (asyncio.TimeoutError, ConnectionError) as e:
+                    raise TransientError(f"{type(e).__name__}: {e}") from e
+            except TransientError:
+                if attempt == self.max_retries:
+                    raise
+            except LLMError as e:
+                if attempt == self.max_retries or (e.status is not None and e.status not in RETRY_STATUSES):
+                    raise
+            await asyncio.sleep(self.backoff * (2 ** attempt))
+
+    async def _run_step(self, plan, step, done, results):
+        outputs = {}
+        for req in step['prerequisites']:
+            await done[req].wait()
+            if results[req]['status'] != 'completed':
+                results[step['id']] = {'status': 'skipped', 'error': f"prerequisite {req} {results[req]['status']}"}
+                done[step['id']].set()
+                return
+            outputs[req] = results[req]['output']
+
+        messages = build_messages(plan, step, outputs, self.system_prompt)
+        start = time.perf_counter()
+        try:
+            # SQLite may wait on other processes' locks, so keep it off the event loop
+            cached = await asyncio.to_thread(self.cache.get, *self._cache_parts(messages)) if self.cache else None
+            if cached is not None:
+                results[step['id']] = {'status': 'completed', 'output': cached, 'cached': True}
+            else:
+                async with self._slots:
+                    output = await self._call(messages)
+                if self.cache:
+                    await asyncio.to_thread(self.cache.put, *self._cache_parts(messages), output)
+                results[step['id']] = {'status': 'completed', 'output': output}
+        except Exception as e:
+            results[step['id']] = {'status': 'failed', 'error': str(e)}
+        results[step['id']]['seconds'] = round(time.perf_counter() - start, 3)
+        done[step['id']].set()
+
+    async def run(self, plan):
+        """Execute one plan; returns {step id: result} in plan order"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        done = {step['id']: asyncio.Event() for step in plan['steps']}
+        results = {}
+        await asyncio.gather(*(self._run_step(plan, step, done, results) for step in plan['steps']))
+        ordered = {}
+        for step in plan['steps']:
+            ordered[step['id']] = dict(results[step['id']], title=step['title'])
+        return ordered
+
+    async def run_many(self, plans):
+        """Execute several plans concurrently over the shared client and limits"""
+        results = await asyncio.gather(*(self.run(plan) for plan in plans))
+        return {plan['plan_id']: result for plan, result in zip(plans, results)}
+
+
+def write_results(results, output_dir):
+    """Write each completed step to <output_dir>/<plan_id>/<step>.md plus a summary JSON"""
+    output_dir = Path(output_dir)
+    for plan_id, steps in results.items():
+        folder = output_dir / plan_id
+        folder.mkdir(parents=True, exist_ok=True)
+        for step_id, result in steps.items():
+            if result['status'] == 'completed':
+                (folder / f'{step_id}.md').write_text(f"# {result['title']}\n\n{result['output']}\n", encoding='utf-8')
+        summary = {s: {k: v for k, v in r.items() if k != 'output'} for s, r in steps.items()}
+        (folder / 'summary.json').write_text(json.dumps(summary, indent=2), encoding='utf-8')
+
+
+async def _main_async(args):
+    plans = [load_plan(p) for p in args.plans]
+    client = LLMClient(args.base_url, os.environ.get(args.api_key_env), max_connections=args.concurrency)
+    cache = ResponseCache(args.cache) if args.cache else None
+    executor = PlanExecutor(client, args.model, concurrency=args.concurrency, rate_limit=args.rate_limit,
+                            max_retries=args.max_retries, cache=cache, temperature=args.temperature)
+    try:
+        return await executor.run_many(plans)
+    finally:
+        await client.aclose()
+        if cache:
+            cache.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Execute thinking plans against an OpenAI-compatible endpoint')
+    parser.add_argument('plans', nargs='+', help='thinking plan files (.yaml or .md with a YAML block)')
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000/v1')
+    parser.add_argument('--model', default='local-model')
+    parser.add_argument('--api-key-env', default='OPENAI_API_KEY', help='environment variable holding the API key')
+    parser.add_argument('--concurrency', type=int, default=4, help='maximum requests in flight')
+    parser.add_argument('--rate-limit', type=float, help='maximum requests started per second')
+    parser.add_argument('--max-retries', type=int, default=3)
+    parser.add_argument('--temperature', type=float, default=0.2)
+    parser.add_argument('--output-dir', default='thinking-runs')
+    parser.add_argument('--cache', help='response cache database, e.g. .ai/response-cache.sqlite')
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(_main_async(args))
+    write_results(results, args.output_dir)
+    failed = 0
+    for plan_id, steps in results.items():
+        for step_id, result in steps.items():
+            mark = '✅' if result['status'] == 'completed' else '❌'
+            failed += result['status'] != 'completed'
+            status = 'cached' if result.get('cached') else result['status']
+            print(f"{mark} {plan_id} {step_id}: {result['title']} ({status})")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Fault-tree analysis engine for root-cause-investigation.md (Method 3)
+
+A fault tree in YAML (AND / OR / k-of-n gates over basic events with
+failure probabilities) is compiled into a reduced ordered binary decision
+diagram. The BDD gives the exact top-event probability and, with one
+backward pass, the Birnbaum importance of every basic event. Minimal cut sets
+are extracted with Rauzy's algorithm into a zero-suppressed diagram (ZDD), so
+they are counted and ranked without ever expanding the tree into sum-of-
+products form - trees with thousands of events stay tractable.
+
+    fault_tree:
+      top_event: Checkout unavailable
+      top: TOP                         # optional; defaults to the unreferenced gate
+      gates:
+        TOP: {type: or, inputs: [DB, LB]}
+        DB:  {type: and, inputs: [db_primary, db_replica]}
+        LB:  {type: vote, k: 2, inputs: [lb1, lb2, lb3]}
+      events:
+        db_primary: {probability: 0.01, description: Primary DB down}
+"""
+
+import argparse
+import heapq
+import json
+import sys
+
+from bmad_tools.core import load_yaml
+
+GATE_TYPES = {'and', 'or', 'vote', 'atleast', 'k-of-n'}
+FALSE, TRUE = 0, 1
+
+
+class FaultTree:
+    """Gates and basic events of one tree, with a BDD/ZDD compiled on demand"""
+
+    def __init__(self, gates, events, top=None, top_event=None):
+        self.gates = gates
+        self.events = events
+        self.top_event = top_event
+        self.top = top or self._find_top()
+        self._validate()
+        self.order = self._variable_order()
+        self.level = {name: i for i, name in enumerate(self.order)}
+        self.probability = [float(events[name]['probability']) for name in self.order]
+
+        # BDD node table; 0 and 1 are the terminals
+        terminal_level = len(self.order)
+        self._var = [terminal_level, terminal_level]
+        self._low = [0, 1]
+        self._high = [0, 1]
+        self._unique = {}
+        self._ite_cache = {}
+        # ZDD node table for cut-set families; 0 = {} and 1 = {{}}
+        self._zvar = [terminal_level, terminal_level]
+        self._zlow = [0, 1]
+        self._zhigh = [0, 1]
+        self._zunique = {}
+
+        self.root = self._build()
+        self._cut_sets = None
+
+    @classmethod
+    def from_dict(cls, data):
+        tree = data.get('fault_tree', data)
+        return cls(tree.get('gates') or {}, tree.get('events') or {}, tree.get('top'), tree.get('top_event'))
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_dict(load_yaml(path))
+
+    def _find_top(self):
+        referenced = {i for gate in self.gates.values() for i in gate.get('inputs', [])}
+        candidates = [name for name in self.gates if name not in referenced]
+        if len(candidates) != 1:
+            raise ValueError(f"cannot infer the top gate (candidates: {candidates}); set 'top'")
+        return candidates[0]
+
+    def _validate(self):
+        for name, gate in self.gates.items():
+            kind = str(gate.get('type', '')).lower()
+            if kind not in GATE_TYPES:
+                raise ValueError(f"gate {name}: type must be one of {', '.join(sorted(GATE_TYPES))}")
+            if not gate.get('inputs'):
+                raise ValueError(f"gate {name}: no inputs")
+            for child in gate['inputs']:
+                if child not in self.gates and child not in self.events:
+                    raise ValueError(f"gate {name}: unknown input '{child}'")
+            if kind in ('vote', 'atleast', 'k-of-n') and not 1 <= int(gate.get('k', 0)) <= len(gate['inputs']):
+                raise ValueError(f"gate {name}: k must be between 1 and the number of inputs")
+        for name, event in self.events.items():
+            p = event.get('probability') if isinstance(event, dict) else None
+            if not isinstance(p, (int, float)) or not 0 <= p <= 1:
+                raise ValueError(f"event {name}: probability must be a number in [0, 1]")
+        if self.top not in self.gates and self.top not in self.events:
+            raise ValueError(f"top '{self.top}' is not a gate or event")
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        """Depth-first search over the gates; a gate met again while still being visited closes a cycle"""
+        done, visiting = set(), set()
+        for start in self.gates:
+            if start in done:
+                continue
+            path, stack = [], [(start, iter(self.gates[start]['inputs']))]
+            visiting.add(start)
+            path.append(start)
+            while stack:
+                name, children = stack[-1]
+                child = next((c for c in children if c in self.gates and c not in done), None)
+                if child is None:
+                    stack.pop()
+                    path.pop()
+                    visiting.discard(name)
+                    done.add(name)
+                elif child in visiting:
+                    cycle = path[path.index(child):] + [child]
+                    raise ValueError(f"gates form a cycle: {' -> '.join(cycle)}")
+                else:
+                    visiting.add(child)
+                    path.append(child)
+                    stack.append((child, iter(self.gates[child]['inputs'])))
+
+    def _variable_order(self):
+        """Basic events in depth-first order of first use, which keeps related events adjacent"""
+        order, seen, stack, visiting = [], set(), [self.top], set()
+        while stack:
+            name = stack.pop()
+            if name in self.events:
+                if name not in seen:
+                    seen.add(name)
+                    order.append(name)
+                continue
+            if name in visiting:
+                continue
+            visiting.add(name)
+            stack.extend(reversed(self.gates[name]['inputs']))
+        return order
+
+    # BDD primitives
+
+    def _mk(self, level, low, high):
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = len(self._var)
+            self._var.append(level)
+            self._low.append(low)
+            self._high.append(high)
+            self._unique[key] = node
+        return node
+
+    def _ite(self, f, g, h):
+        if f == TRUE:
+            return g
+        if f == FALSE:
+            return h
+        if g == h:
+            return g
+        if g == TRUE and h == FALSE:
+            return f
+        key = (f, g, h)
+        cached = self._ite_cache.get(key)
+        if cached is not None:
+            return cached
+        level = min(self._var[f], self._var[g], self._var[h])
+        f0, f1 = self._cofactors(f, level)
+        g0, g1 = self._cofactors(g, level)
+        h0, h1 = self._cofactors(h, level)
+        result = self._mk(level, self._ite(f0, g0, h0), self._ite(f1, g1, h1))
+        self._ite_cache[key] = result
+        return result
+
+    def _cofactors(self, node, level):
+        if self._var[node] != level:
+            return node, node
+        return self._low[node], self._high[node]
+
+    def _and(self, f, g):
+        return self._ite(f, g, FALSE)
+
+    def _or(self, f, g):
+        return self._ite(f, TRUE, g)
+
+    def _at_least(self, k, inputs):
+        """BDD for 'at least k of inputs', built as a threshold recurrence"""
+        n = len(inputs)
+        # row[j] = at least j of inputs[i:], computed from the last input backwards
+        row = [TRUE] + [FALSE] * k
+        for i in range(n - 1, -1, -1):
+            row = [TRUE] + [self._ite(inputs[i], row[j - 1], row[j]) for j in range(1, k + 1)]
+        return row[k]
+
+    def _build(self):
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, 4 * len(self.order) + 1000))
+        try:
+            built = {name: self._mk(self.level[name], FALSE, TRUE) for name in self.order}
+            pending = [self.top]
+            while pending:
+                name = pending[-1]
+                if name in built:
+                    pending.pop()
+                    continue
+                missing = [c for c in self.gates[name]['inputs'] if c not in built]
+                if missing:
+                    pending.extend(missing)
+                    continue
+                pending.pop()
+                gate = self.gates[name]
+                kind = gate['type'].lower()
+                inputs = [built[c] for c in gate['inputs']]
+                if kind == 'and':
+                    result = TRUE
+                    for node in inputs:
+                        result = self._and(result, node)
+                elif kind == 'or':
+                    result = FALSE
+                    for node in inputs:
+                        result = self._or(result, node)
+                else:
+                    result = self._at_least(int(gate['k']), inputs)
+                built[name] = result
+            return built[self.top]
+        finally:
+            sys.setrecursionlimit(limit)
+
+    @property
+    def bdd_size(self):
+        """Nodes reachable from the root, terminals included"""
+        return len(self._reachable())
+
+    # Quantification
+
+    def _node_probabilities(self):
+        """P(node = 1) for every BDD node; children always have smaller ids"""
+        prob = [0.0, 1.0]
+        for node in range(2, len(self._var)):
+            p = self.probability[self._var[node]]
+            prob.append(p * prob[self._high[node]] + (1 - p) * prob[self._low[node]])
+        return prob
+
+    def top_probability(self):
+        """Exact probability of the top event"""
+        return self._node_probabilities()[self.root]
+
+    def birnbaum(self):
+        """dP(top)/dp_i for every basic event, from one backward pass over the BDD"""
+        prob = self._node_probabilities()
+        reach = {self.root: 1.0}
+        result = [0.0] * len(self.order)
+        # Parents have larger ids than children, so descending ids is a topological order
+        for node in sorted(n for n in self._reachable() if n > TRUE)[::-1]:
+            r = reach.get(node, 0.0)
+            level = self._var[node]
+            p = self.probability[level]
+            low, high = self._low[node], self._high[node]
+            result[level] += r * (prob[high] - prob[low])
+            reach[high] = reach.get(high, 0.0) + r * p
+            reach[low] = reach.get(low, 0.0) + r * (1 - p)
+        return result
+
+    def _reachable(self):
+        seen, stack = set(), [self.root]
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                if node > TRUE:
+                    stack.extend((self._low[node], self._high[node]))
+        return seen
+
+    # ZDD of minimal cut sets (Rauzy)
+
+    def _zmk(self, level, low, high):
+        if high == 0:
+            return low
+        key = (level, low, high)
+        node = self._zunique.get(key)
+        if node is None:
+            node = len(self._zvar)
+            self._zvar.append(level)
+            self._zlow.append(low)
+            self._zhigh.append(high)
+            self._zunique[key] = node
+        return node
+
+    def _contains_empty(self, z):
+        while z > 1:
+            z = self._zlow[z]
+        return z == 1
+
+    def _without(self, p, q, cache):
+        """Sets of family p that contain no set of family q"""
+        if p == 0 or q == 1:
+            return 0
+        if q == 0:
+            return p
+        if p == 1:
+            return 0 if self._contains_empty(q) else 1
+        key = (p, q)
+        if key in cache:
+            return cache[key]
+        vp, vq = self._zvar[p], self._zvar[q]
+        if vp < vq:
+            result = self._zmk(vp, self._without(self._zlow[p], q, cache), self._without(self._zhigh[p], q, cache))
+        elif vp > vq:
+            result = self._without(p, self._zlow[q], cache)
+        else:
+            low = self._without(self._zlow[p], self._zlow[q], cache)
+            high = self._without(self._without(self._zhigh[p], self._zhigh[q], cache), self._zlow[q], cache)
+            result = self._zmk(vp, low, high)
+        cache[key] = result
+        return result
+
+    def _minsol(self, node, cache, without_cache):
+        if node <= TRUE:
+            return node
+        if node in cache:
+            return cache[node]
+        z0 = self._minsol(self._low[node], cache, without_cache)
+        z1 = self._minsol(self._high[node], cache, without_cache)
+        result = self._zmk(self._var[node], z0, self._without(z1, z0, without_cache))
+        cache[node] = result
+        return result
+
+    def cut_set_family(self):
+        """Root of the ZDD holding every minimal cut set"""
+        if self._cut_sets is None:
+            limit = sys.getrecursionlimit()
+            sys.setrecursionlimit(max(limit, 4 * len(self.order) + 1000))
+            try:
+                self._cut_sets = self._minsol(self.root, {}, {})
+            finally:
+                sys.setrecursionlimit(limit)
+        return self._cut_sets
+
+    def cut_set_counts(self):
+        """{order: number of minimal cut sets of that size}, counted on the ZDD"""
+        counts = {0: {}, 1: {0: 1}}
+
+        def count(z):
+            if z in counts:
+                return counts[z]
+            low, high = count(self._zlow[z]), count(self._zhigh[z])
+            result = dict(low)
+            for size, n in high.items():
+                result[size + 1] = result.get(size + 1, 0) + n
+            counts[z] = result
+            return result
+
+        for z in sorted(self._zreachable()):
+            count(z)
+        return dict(sorted(counts[self.cut_set_family()].items()))
+
+    def _zreachable(self):
+        seen, stack = set(), [self.cut_set_family()]
+        while stack:
+            z = stack.pop()
+            if z not in seen:
+                seen.add(z)
+                if z > 1:
+                    stack.extend((self._zlow[z], self._zhigh[z]))
+        return seen
+
+    def minimal_cut_sets(self, limit=1000):
+        """The most probable minimal cut sets as [(events, probability)], best first
+
+        Best-first search over the ZDD, so only the returned cut sets are expanded.
+        """
+        family = self.cut_set_family()
+        bound = self._zdd_max_products()
+        heap = [(-bound[family], 0, family, 1.0, ())]
+        counter = 1
+        found = []
+        while heap and len(found) < limit:
+            _, _, z, prob, events = heapq.heappop(heap)
+            if z == 1:
+                found.append(([self.order[i] for i in events], prob))
+                continue
+            if z == 0:
+                continue
+            level = self._zvar[z]
+            for child, p, chosen in ((self._zlow[z], prob, events),
+                                     (self._zhigh[z], prob * self.probability[level], events + (level,))):
+                if child != 0:
+                    heapq.heappush(heap, (-p * bound[child], counter, child, p, chosen))
+                    counter += 1
+        return found
+
+    def _zdd_max_products(self):
+        """Highest cut-set probability below each ZDD node"""
+        best = {0: 0.0, 1: 1.0}
+        for z in sorted(self._zreachable()):
+            if z > 1:
+                best[z] = max(best[self._zlow[z]], self.probability[self._zvar[z]] * best[self._zhigh[z]])
+        return best
+
+    def fussell_vesely(self):
+        """Share of the summed cut-set probability that involves each event (rare-event approximation)"""
+        family = self.cut_set_family()
+        nodes = sorted(z for z in self._zreachable() if z > 1)
+        below = {0: 0.0, 1: 1.0}
+        for z in nodes:
+            below[z] = below[self._zlow[z]] + self.probability[self._zvar[z]] * below[self._zhigh[z]]
+        total = below[family]
+        above = {family: 1.0}
+        share = [0.0] * len(self.order)
+        for z in reversed(nodes):
+            a = above.get(z, 0.0)
+            level = self._zvar[z]
+            via_high = a * self.probability[level]
+            share[level] += via_high * below[self._zhigh[z]]
+            above[self._zhigh[z]] = above.get(self._zhigh[z], 0.0) + via_high
+            above[self._zlow[z]] = above.get(self._zlow[z], 0.0) + a
+        return [s / total if total else 0.0 for s in share]
+
+    def importance(self):
+        """Per basic event: Birnbaum, criticality, Fussell-Vesely, RAW and RRW, by Fussell-Vesely"""
+        top = self.top_probability()
+        birnbaum = self.birnbaum()
+        fv = self.fussell_vesely()
+        rows = []
+        for i, name in enumerate(self.order):
+            p = self.probability[i]
+            given_failed = top + (1 - p) * birnbaum[i]
+            given_working = top - p * birnbaum[i]
+            rows.append({
+                'event': name,
+                'probability': p,
+                'birnbaum': birnbaum[i],
+                'criticality': birnbaum[i] * p / top if top else 0.0,
+                'fussell_vesely': fv[i],
+                'raw': given_failed / top if top else None,
+                'rrw': top / given_working if given_working > 0 else None,
+            })
+        return sorted(rows, key=lambda r: (-r['fussell_vesely'], -r['birnbaum'], r['event']))
+
+    def analysis(self, max_cut_sets=50):
+        """The fault_tree_analysis block of the task's output format, with real numbers"""
+        top = self.top_probability()
+        cut_sets = self.minimal_cut_sets(max_cut_sets)
+        descriptions = {name: (e.get('description') or name) for name, e in self.events.items()}
+        paths = []
+        for n, (events, prob) in enumerate(cut_sets, 1):
+            paths.append({
+                'path_id': f'PATH-{n:03d}',
+                'description': ' AND '.join(descriptions[e] for e in events),
+                'probability': prob,
+                'basic_events': events,
+                'critical': bool(top) and prob >= 0.1 * top,
+            })
+        return {'fault_tree_analysis': {
+            'top_event': self.top_event or self.top,
+            'top_probability': top,
+            'cut_set_counts': self.cut_set_counts(),
+            'failure_paths': paths,
+            'importance': self.importance(),
+        }}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Minimal cut sets, top-event probability and importance')
+    parser.add_argument('tree', help='fault tree YAML')
+    parser.add_argument('--cut-sets', type=int, default=20, help='most probable cut sets to list')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    tree = FaultTree.load(args.tree)
+    result = tree.analysis(args.cut_sets)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+    fta = result['fault_tree_analysis']
+    counts = ', '.join(f"{n} of order {k}" for k, n in list(fta['cut_set_counts'].items())[:5])
+    print(f"Top event: {fta['top_event']}  P = {fta['top_probability']:.6g}")
+    print(f"Minimal cut sets: {counts}  (BDD nodes: {tree.bdd_size})\n")
+    for path in fta['failure_paths']:
+        mark = '❌' if path['critical'] else '  '
+        print(f"{mark} {path['path_id']} {path['probability']:.3e}  {' & '.join(path['basic_events'])}")
+    print(f"\n{'event':<30} {'FV':>8} {'Birnbaum':>10} {'RAW':>9}")
+    for row in fta['importance'][:args.cut_sets]:
+        raw = f"{row['raw']:.2f}" if row['raw'] is not None else '-'
+        print(f"{row['event']:<30} {row['fussell_vesely']:>8.4f} {row['birnbaum']:>10.3e} {raw:>9}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Synthetic .bmad-core trees for benchmarks and scaling tests
+
+`generate_tree` writes a structurally valid tree with the requested number of
+agents, tasks, templates, stories and workflow steps. Content is derived from
+a seeded RNG, so the same arguments always give the same files.
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+import yaml
+
+from bmad_tools.core import SafeDumper, file_hash
+
+WORDS = """
+analysis architecture assumption boundary cache constraint criteria customer
+database decision dependency deploy design evaluation experiment failure
+feature hypothesis impact interface latency metric migration module network
+option performance priority queue regression requirement risk root schema
+service solution stakeholder storage story strategy system template test
+throughput trade-off validation workflow
+""".split()
+
+
+def _dump(data, **kwargs):
+    return yaml.dump(data, Dumper=SafeDumper, **kwargs)
+
+
+def _sentence(rng, words=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _paragraph(rng, sentences=4):
+    return ' '.join(_sentence(rng) for _ in range(sentences))
+
+
+def _agent_markdown(rng, agent_id, tasks, templates):
+    config = {
+        'activation-instructions': ['STEP 1: Read THIS ENTIRE FILE', 'STAY IN CHARACTER!'],
+        'agent': {'name': agent_id.title(), 'id': agent_id, 'title': 'Synthetic Agent', 'icon': '🤖',
+                  'whenToUse': _sentence(rng)},
+        'persona': {'role': _sentence(rng, 6), 'style': _sentence(rng, 6), 'identity': _sentence(rng),
+                    'focus': _sentence(rng, 8), 'core_principles': [_sentence(rng) for _ in range(5)]},
+        'commands': [{'help': 'Show numbered list of commands'}] +
+                    [{f'run-{t[:-3]}': f'Execute task {t}'} for t in tasks],
+        'dependencies': {'tasks': tasks, 'templates': templates},
+    }
+    body = _dump(config, sort_keys=False, allow_unicode=True)
+    return (f"# {agent_id}\n\nACTIVATION-NOTICE: Synthetic agent for benchmarking.\n\n"
+            f"## COMPLETE AGENT DEFINITION FOLLOWS - NO EXTERNAL FILES NEEDED\n\n```yaml\n{body}```\n")
+
+
+def _task_markdown(rng, name):
+    return (f"# {name}\n\n## ⚠️ CRITICAL EXECUTION NOTICE\n\n{_paragraph(rng)}\n\n"
+            f"## Process\n\n{_paragraph(rng, 6)}\n\n## Output\n\n```yaml\nresult:\n  summary: example\n```\n")
+
+
+def _template_sections(rng, depth, width):
+    sections = []
+    for i in range(width):
+        section = {'id': f'section-{depth}-{i}', 'title': _sentence(rng, 3), 'instruction': _sentence(rng)}
+        if depth > 0:
+            section['sections'] = _template_sections(rng, depth - 1, width)
+        sections.append(section)
+    return sections
+
+
+def _template_yaml(rng, template_id, elicit):
+    sections = _template_sections(rng, depth=2, width=3)
+    if elicit:
+        # Bury the elicitation point at the deepest, last position
+        sections[-1]['sections'][-1]['sections'][-1]['elicit'] = True
+    return _dump({
+        'template': {'id': template_id, 'name': template_id.replace('-', ' ').title(), 'version': 1.0,
+                     'output': {'format': 'markdown', 'filename': f'docs/{template_id}.md'}},
+        'workflow': {'mode': 'interactive', 'elicitation': 'advanced-elicitation'},
+        'sections': sections,
+    }, sort_keys=False)
+
+
+def _story_markdown(rng, number):
+    acs = '\n'.join(f"{i}. {_sentence(rng)}" for i in range(1, 6))
+    tasks = '\n'.join(f"- [ ] Task {i} (AC: {i})" for i in range(1, 6))
+    return (f"# Story {number}: {_sentence(rng, 4)}\n\n## Status\n\nDraft\n\n## Story\n\n{_paragraph(rng, 2)}\n\n"
+            f"## Acceptance Criteria\n\n{acs}\n\n## Tasks / Subtasks\n\n{tasks}\n\n"
+            f"## Dev Notes\n\n{_paragraph(rng, 5)}\n")
+
+
+def _workflow_yaml(workflow_id, steps, agents):
+    sequence = []
+    for i in range(steps):
+        step = {'agent': agents[i % len(agents)], 'creates': f'artifact-{i}.md', 'notes': f'Step {i + 1}'}
+        if i:
+            step['requires'] = [f'artifact-{i - 1}.md'] + ([f'artifact-{i // 2}.md'] if i > 2 else [])
+        sequence.append(step)
+    return _dump({'workflow': {'id': workflow_id, 'name': workflow_id.title(), 'type': 'synthetic',
+                               'sequence': sequence}}, sort_keys=False)
+
+
+def generate_tree(root, agents=10, tasks=50, templates=20, stories=50, workflow_steps=20, seed=0):
+    """Write a synthetic project with a .bmad-core tree under root; returns the .bmad-core path"""
+    rng = random.Random(seed)
+    root = Path(root)
+    base = root / '.bmad-core'
+    for folder in ('agents', 'tasks', 'templates', 'workflows', 'agent-teams'):
+        (base / folder).mkdir(parents=True, exist_ok=True)
+    story_dir = root / 'docs' / 'stories'
+    story_dir.mkdir(parents=True, exist_ok=True)
+
+    task_names = [f'task-{i:05d}.md' for i in range(tasks)]
+    template_names = [f'template-{i:05d}-tmpl.yaml' for i in range(templates)]
+    agent_ids = [f'agent-{i:05d}' for i in range(agents)]
+
+    written = []
+
+    def write(path, content):
+        path.write_text(content, encoding='utf-8')
+        written.append(path)
+
+    for name in task_names:
+        write(base / 'tasks' / name, _task_markdown(rng, name))
+    for i, name in enumerate(template_names):
+        write(base / 'templates' / name, _template_yaml(rng, name[:-len('-tmpl.yaml')], elicit=i % 4 != 3))
+    for agent_id in agent_ids:
+        own_tasks = sorted(rng.sample(task_names, min(len(task_names), 5)))
+        own_templates = sorted(rng.sample(template_names, min(len(template_names), 3)))
+        write(base / 'agents' / f'{agent_id}.md', _agent_markdown(rng, agent_id, own_tasks, own_templates))
+    for i in range(stories):
+        write(story_dir / f'1.{i + 1}.story.md', _story_markdown(rng, f'1.{i + 1}'))
+    if workflow_steps:
+        write(base / 'workflows' / 'synthetic-workflow.yaml',
+              _workflow_yaml('synthetic-workflow', workflow_steps, agent_ids or ['dev']))
+    write(base / 'agent-teams' / 'team-synthetic.yaml', _dump(
+        {'bundle': {'name': 'Team Synthetic'}, 'agents': ['*'], 'workflows': ['synthetic-workflow.yaml']}))
+    write(base / 'core-config.yaml', _dump({
+        'devStoryLocation': 'docs/stories', 'devLoadAlwaysFiles': [], 'devDebugLog': '.ai/debug-log.md'}))
+
+    manifest = {
+        'version': 'synthetic',
+        'install_type': 'full',
+        'files': [{'path': p.relative_to(root).as_posix(), 'hash': file_hash(p), 'modified': False}
+                  for p in written if p.is_relative_to(base)],
+    }
+    (base / 'install-manifest.yaml').write_text(_dump(manifest, sort_keys=False), encoding='utf-8')
+    return base
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic .bmad-core tree')
+    parser.add_argument('root', help='directory to create the project in')
+    parser.add_argument('--agents', type=int, default=10)
+    parser.add_argument('--tasks', type=int, default=50)
+    parser.add_argument('--templates', type=int, default=20)
+    parser.add_argument('--stories', type=int, default=50)
+    parser.add_argument('--workflow-steps', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    base = generate_tree(args.root, args.agents, args.tasks, args.templates, args.stories,
+                         args.workflow_steps, args.seed)
+    print(f"✅ Generated {base}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
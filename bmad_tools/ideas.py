@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate clustering of brainstorming ideas
+
+facilitate-brainstorming-session.md collects ideas from many techniques into
+the "Ideas Generated" lists of brainstorming-output-tmpl.yaml. With large
+groups most of them overlap. This groups near-duplicates locally so the
+convergent and synthesis steps only see one line per distinct idea:
+
+- Each idea becomes the set of 4-byte shingles of its sorted, stopword-free
+  tokens (independent of word order, robust to plurals and small rewordings).
+- MinHash signatures for all ideas are computed at once with NumPy
+  (multiply-shift hashing, 120 permutations).
+- LSH banding finds candidate pairs in linear time; each candidate is checked
+  against the estimated Jaccard similarity.
+- Verified pairs do not merge transitively (A~B and B~C would chain A and C
+  together): the best-connected ideas become cluster leaders, and every other
+  idea joins the leader it is most similar to.
+
+Input is a brainstorming results document (ideas under "Ideas Generated"
+headings, technique taken from the enclosing heading), a YAML/JSON list of
+strings or {idea, technique} mappings, or plain text with one idea per line.
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from bmad_tools.core import read_text
+from bmad_tools.retrieval import HEADING_RE, tokenize
+
+NUM_PERM = 120
+SHINGLE = 4
+DEFAULT_THRESHOLD = 0.5
+CHUNK = 65536
+FNV_PRIME = 0x100000001B3
+ITEM_RE = re.compile(r'^\s*(?:\d+[.)]|[-*+])\s+(.*\S)\s*$')
+
+
+def _has_text(value):
+    return value is not None and bool(str(value).strip())
+
+
+def _normalize(text):
+    normalized = ' '.join(sorted(tokenize(text))) or text.lower().strip()
+    return normalized.encode('utf-8').ljust(SHINGLE)
+
+
+def shingle_values(texts):
+    """(values, starts): every 4-byte shingle of every normalized idea packed into a uint64
+
+    Idea i owns values[starts[i]:starts[i + 1]]; repeated shingles do not
+    change a minimum, so they are not removed.
+    """
+    encoded = [_normalize(t) for t in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.uint64)
+    counts = lengths - SHINGLE + 1
+    starts = np.concatenate([[0], np.cumsum(counts)])
+    byte_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    positions = np.repeat(byte_starts - starts[:-1], counts) + np.arange(starts[-1])
+    values = np.zeros(len(positions), dtype=np.uint64)
+    for k in range(SHINGLE):
+        values = (values << np.uint64(8)) | data[positions + k]
+    return values, starts
+
+
+def _permutations(num_perm, seed=1):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+    return a, b
+
+
+def signatures(texts, num_perm=NUM_PERM):
+    """MinHash signature matrix (ideas x num_perm, uint32)"""
+    values, starts = shingle_values(texts)
+    # Hash each distinct shingle once, then take per-idea minima chunk by chunk
+    distinct, inverse = np.unique(values, return_inverse=True)
+    a, b = _permutations(num_perm)
+    table = np.empty((len(distinct), num_perm), dtype=np.uint32)
+    for first in range(0, len(distinct), CHUNK):
+        # Multiply-shift hashing: the top 32 bits of a*x + b (mod 2**64)
+        table[first:first + CHUNK] = (distinct[first:first + CHUNK, None] * a + b) >> np.uint64(32)
+    result = np.empty((len(texts), num_perm), dtype=np.uint32)
+    first = 0
+    while first < len(texts):
+        # Take ideas until the chunk holds about CHUNK shingles (at least one idea)
+        last = int(np.searchsorted(starts, starts[first] + CHUNK, side='right')) - 1
+        last = min(max(first + 1, last), len(texts))
+        block = table[inverse[starts[first]:starts[last]]]
+        result[first:last] = np.minimum.reduceat(block, starts[first:last] - starts[first], axis=0)
+        first = last
+    return result
+
+
+def lsh_shape(threshold, num_perm=NUM_PERM):
+    """(bands, rows) whose S-curve midpoint is the highest one at or below 0.9 x threshold"""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= 0.9 * threshold:
+            best = (bands, rows)
+    return best
+
+
+def candidate_pairs(sig, threshold=DEFAULT_THRESHOLD):
+    """Verified (i, j) pairs: same LSH bucket in some band and estimated Jaccard >= threshold"""
+    n, num_perm = sig.shape
+    bands, rows = lsh_shape(threshold, num_perm)
+    found = []
+    for band in range(bands):
+        keys = np.zeros(n, dtype=np.uint64)
+        for column in sig[:, band * rows:(band + 1) * rows].T:
+            keys = keys * np.uint64(FNV_PRIME) ^ column
+        _, leader, bucket = np.unique(keys, return_index=True, return_inverse=True)
+        leaders = leader[bucket.ravel()]
+        members = np.flatnonzero(leaders != np.arange(n))
+        if members.size:
+            found.append(np.stack([leaders[members], members], axis=1))
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    found = np.concatenate(found)
+    codes = np.unique(found[:, 0] * n + found[:, 1])
+    pairs = np.stack([codes // n, codes % n], axis=1)
+    similarity = (sig[pairs[:, 0]] == sig[pairs[:, 1]]).mean(axis=1)
+    return pairs[similarity >= threshold]
+
+
+def leader_labels(sig, pairs):
+    """Leader index for each idea; every idea is a verified pair of its leader
+
+    Ideas are taken by decreasing number of verified pairs; one that no leader
+    covers yet becomes a leader. Each other idea then joins its most similar
+    neighbouring leader, so a cluster never spans two ideas linked only
+    through a chain of intermediate ones.
+    """
+    n = len(sig)
+    labels = np.arange(n)
+    if not len(pairs):
+        return labels
+    edges = np.concatenate([pairs, pairs[:, ::-1]])
+    edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+    starts = np.searchsorted(edges[:, 0], np.arange(n + 1))
+    leader = np.zeros(n, dtype=bool)
+    covered = np.zeros(n, dtype=bool)
+    for i in np.argsort(-np.diff(starts), kind='stable'):
+        if not covered[i]:
+            leader[i] = covered[i] = True
+            covered[edges[starts[i]:starts[i + 1], 1]] = True
+    links = edges[leader[edges[:, 1]] & ~leader[edges[:, 0]]]
+    similarity = (sig[links[:, 0]] == sig[links[:, 1]]).mean(axis=1)
+    links = links[np.lexsort((-similarity, links[:, 0]))]
+    first = np.concatenate([[True], links[1:, 0] != links[:-1, 0]])
+    labels[links[first, 0]] = links[first, 1]
+    return labels
+
+
+def cluster(ideas, threshold=DEFAULT_THRESHOLD):
+    """Group near-duplicate ideas; returns clusters, largest first
+
+    ideas are strings or {'idea', 'technique'} mappings; entries without idea
+    text are skipped and `members` index the remaining ones. Each cluster is
+    {'idea': representative, 'count', 'techniques', 'variants', 'members'}.
+    """
+    ideas = [i if isinstance(i, dict) else {'idea': i} for i in ideas]
+    ideas = [dict(i, idea=str(i['idea']).strip()) for i in ideas if _has_text(i.get('idea'))]
+    if not ideas:
+        return []
+    texts = [i['idea'] for i in ideas]
+    sig = signatures(texts)
+    labels = leader_labels(sig, candidate_pairs(sig, threshold))
+
+    order = np.argsort(labels, kind='stable')
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    clusters = []
+    for group in np.split(order, bounds):
+        representative = int(labels[group[0]])
+        seen, variants = {texts[representative].lower()}, []
+        for i in group:
+            if texts[i].lower() not in seen:
+                seen.add(texts[i].lower())
+                variants.append(texts[i])
+        clusters.append({
+            'idea': texts[representative],
+            'count': len(group),
+            'techniques': sorted({ideas[i]['technique'] for i in group if ideas[i].get('technique')}),
+            'variants': variants,
+            'members': [int(i) for i in group],
+        })
+    clusters.sort(key=lambda c: (-c['count'], c['members'][0]))
+    return clusters
+
+
+def parse_markdown(text):
+    """Ideas from a brainstorming results document, tagged with their technique
+
+    List items under "Ideas Generated" headings are used when the document has
+    any; otherwise every list item. The technique is the nearest heading above
+    that is not an ideas heading, without its " - duration" suffix.
+    """
+    lines = text.split('\n')
+    structured = any(HEADING_RE.match(line) and 'ideas generated' in line.lower() for line in lines)
+    ideas, technique, collecting, in_fence = [], None, not structured, False
+    for line in lines:
+        if line.lstrip().startswith(('```', '~~~')):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        heading = HEADING_RE.match(line)
+        if heading:
+            title = heading.group(2).strip().rstrip(':')
+            if 'ideas generated' in title.lower():
+                collecting = True
+                continue
+            collecting = not structured
+            technique = title.rsplit(' - ', 1)[0].strip('*') or None
+            continue
+        item = ITEM_RE.match(line) if collecting else None
+        if item:
+            ideas.append({'idea': item.group(1), 'technique': technique})
+    return ideas
+
+
+def load_ideas(path):
+    """Ideas from a markdown document, a YAML/JSON list, or a text file with one idea per line"""
+    path = Path(path)
+    text = read_text(path)
+    if path.suffix in ('.md', '.markdown'):
+        return parse_markdown(text)
+    if path.suffix in ('.yaml', '.yml', '.json'):
+        data = yaml.safe_load(text) or []
+        if isinstance(data, dict):
+            data = data.get('ideas', [])
+        entries = [{'idea': d.get('idea') or d.get('text'), 'technique': d.get('technique')}
+                   if isinstance(d, dict) else {'idea': d} for d in data]
+        return [dict(e, idea=str(e['idea']).strip()) for e in entries if _has_text(e['idea'])]
+    return [{'idea': line.strip()} for line in text.split('\n') if line.strip()]
+
+
+def condense(ideas, threshold=DEFAULT_THRESHOLD):
+    """Summary for the output template: totals plus one entry per distinct idea"""
+    clusters = cluster(ideas, threshold)
+    return {
+        'total_ideas': sum(c['count'] for c in clusters),
+        'distinct_ideas': len(clusters),
+        'threshold': threshold,
+        'ideas': [{k: c[k] for k in ('idea', 'count', 'techniques', 'variants')} for c in clusters],
+    }
+
+
+def render_markdown(summary):
+    lines = [f"**Total Ideas Generated:** {summary['total_ideas']} ({summary['distinct_ideas']} distinct)", '']
+    for n, item in enumerate(summary['ideas'], 1):
+        extra = []
+        if item['count'] > 1:
+            extra.append(f"x{item['count']}")
+        if item['techniques']:
+            extra.append(', '.join(item['techniques']))
+        lines.append(f"{n}. {item['idea']}" + (f" ({'; '.join(extra)})" if extra else ''))
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Cluster near-duplicate brainstorming ideas')
+    parser.add_argument('source', help='brainstorming results .md, YAML/JSON list, or text with one idea per line')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='estimated Jaccard similarity at which ideas merge (default 0.5)')
+    parser.add_argument('--format', choices=['markdown', 'yaml', 'json'], default='markdown')
+    args = parser.parse_args(argv)
+    if not 0 < args.threshold <= 1:
+        parser.error('--threshold must be in (0, 1]')
+
+    try:
+        ideas = load_ideas(args.source)
+    except (OSError, yaml.YAMLError) as e:
+        print(f"❌ {e}")
+        return 1
+    summary = condense(ideas, args.threshold)
+    if args.format == 'json':
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    elif args.format == 'yaml':
+        print(yaml.safe_dump(summary, sort_keys=False, allow_unicode=True), end='')
+    else:
+        print(render_markdown(summary), end='')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Multi-criteria decision analysis for decision-analysis.md and solution-matrix-tmpl.yaml
+
+Scores an alternatives x criteria matrix with the weighted sum or TOPSIS,
+derives criterion weights from an AHP pairwise comparison matrix (with its
+consistency ratio), and runs a vectorized Monte Carlo sensitivity analysis:
+weights are drawn from a Dirichlet distribution centred on the stated weights
+and every draw is scored at once with NumPy. The result renders as the
+solution matrix and sensitivity tables the template asks for.
+
+Input is the YAML output format of decision-analysis.md:
+
+    criteria_definition:
+      - {name: Cost, weight: 0.3, direction: minimize}
+    alternatives_analysis:
+      - alternative: Option A
+        raw_scores: {Cost: 120000}
+    pairwise: [[1, 3], [0.333, 1]]   # optional AHP matrix in criteria order
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from bmad_tools.core import load_yaml
+
+METHODS = ['weighted-sum', 'topsis']
+
+# Saaty's random consistency index by matrix size
+RANDOM_INDEX = [0.0, 0.0, 0.0, 0.58, 0.90, 1.12, 1.24, 1.32, 1.41, 1.45, 1.49, 1.51, 1.48, 1.56, 1.57, 1.59]
+CONSISTENCY_LIMIT = 0.10
+BATCH = 4096
+
+
+class DecisionProblem:
+    """Alternatives, criteria, score matrix, weights and directions
+
+    Columns flagged in `normalized` already hold 0-1 scores with minimize
+    criteria reversed (the task's `scores`); they are used as they are.
+    """
+
+    def __init__(self, alternatives, criteria, scores, weights, directions, normalized=None):
+        self.alternatives = list(alternatives)
+        self.criteria = list(criteria)
+        self.scores = np.asarray(scores, dtype=float)
+        weights = np.asarray(weights, dtype=float)
+        if self.scores.shape != (len(self.alternatives), len(self.criteria)):
+            raise ValueError(f"score matrix is {self.scores.shape}, expected "
+                             f"({len(self.alternatives)}, {len(self.criteria)})")
+        if weights.shape != (len(self.criteria),) or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError('weights must be one non-negative value per criterion')
+        self.weights = weights / weights.sum()
+        self.normalized = (np.zeros(len(self.criteria), dtype=bool) if normalized is None
+                           else np.asarray(normalized, dtype=bool))
+        self.maximize = np.array([d != 'minimize' for d in directions]) | self.normalized
+
+
+def load_problem(source):
+    """DecisionProblem from a decision-analysis YAML file or dict
+
+    A criterion uses `raw_scores` when every alternative has a numeric raw
+    score for it, otherwise the already normalized `scores`.
+    """
+    data = load_yaml(source) if not isinstance(source, dict) else source
+    criteria_defs = data.get('criteria_definition') or []
+    criteria = [c['name'] for c in criteria_defs]
+    directions = [c.get('direction', 'maximize') for c in criteria_defs]
+    analysis = data.get('alternatives_analysis') or []
+    alternatives = [alt['alternative'] for alt in analysis]
+
+    columns, normalized = [], []
+    for name in criteria:
+        raw = [(alt.get('raw_scores') or {}).get(name) for alt in analysis]
+        use_raw = all(isinstance(v, (int, float)) for v in raw)
+        column = raw if use_raw else [(alt.get('scores') or {}).get(name) for alt in analysis]
+        for alt, value in zip(alternatives, column):
+            if not isinstance(value, (int, float)):
+                raise ValueError(f"{alt}: no numeric score for criterion '{name}'")
+        columns.append(column)
+        normalized.append(not use_raw)
+    rows = [list(row) for row in zip(*columns)] if criteria else [[] for _ in alternatives]
+
+    if data.get('pairwise'):
+        weights = ahp(data['pairwise'])['weights']
+    else:
+        weights = [c.get('weight', 1.0) for c in criteria_defs]
+    return DecisionProblem(alternatives, criteria, rows, weights, directions, normalized)
+
+
+def normalize(scores, maximize, normalized=None):
+    """Min-max normalization to 0-1 per criterion, reversed for minimize criteria
+
+    Columns flagged in `normalized` are returned unchanged.
+    """
+    low = scores.min(axis=0)
+    span = scores.max(axis=0) - low
+    safe = np.where(span > 0, span, 1.0)
+    norm = (scores - low) / safe
+    norm = np.where(maximize, norm, 1.0 - norm)
+    norm = np.where(span > 0, norm, 1.0)
+    return norm if normalized is None else np.where(normalized, scores, norm)
+
+
+def weighted_sum(problem, weights=None):
+    """Weighted-sum scores; weights may be (m,) or a batch (k, m) giving (k, n)"""
+    weights = problem.weights if weights is None else weights
+    return np.asarray(weights) @ normalize(problem.scores, problem.maximize, problem.normalized).T
+
+
+def topsis(problem, weights=None):
+    """TOPSIS closeness to the ideal solution; weights may be (m,) or a batch (k, m)
+
+    With non-negative weights the weighted ideal points are the weights times
+    the ideal points of the normalized matrix, so both distances reduce to one
+    matrix product with the squared weights instead of a (k, n, m) array.
+    """
+    weights = problem.weights if weights is None else np.asarray(weights)
+    norms = np.linalg.norm(problem.scores, axis=0)
+    r = problem.scores / np.where(norms > 0, norms, 1.0)
+    best = np.where(problem.maximize, r.max(axis=0), r.min(axis=0))
+    worst = np.where(problem.maximize, r.min(axis=0), r.max(axis=0))
+    squared = weights ** 2
+    d_best = np.sqrt(squared @ ((r - best) ** 2).T)
+    d_worst = np.sqrt(squared @ ((r - worst) ** 2).T)
+    total = d_best + d_worst
+    return np.where(total > 0, d_worst / np.where(total > 0, total, 1.0), 0.5)
+
+
+SCORERS = {'weighted-sum': weighted_sum, 'topsis': topsis}
+
+
+def ahp(pairwise):
+    """Priority weights and consistency of an AHP pairwise comparison matrix"""
+    matrix = np.asarray(pairwise, dtype=float)
+    n = matrix.shape[0]
+    if matrix.shape != (n, n) or (matrix <= 0).any():
+        raise ValueError('pairwise matrix must be square with positive entries')
+    values, vectors = np.linalg.eig(matrix)
+    principal = np.argmax(values.real)
+    weights = np.abs(vectors[:, principal].real)
+    weights = weights / weights.sum()
+    lambda_max = float(values[principal].real)
+    ci = (lambda_max - n) / (n - 1) if n > 1 else 0.0
+    ri = RANDOM_INDEX[n] if n < len(RANDOM_INDEX) else RANDOM_INDEX[-1]
+    cr = ci / ri if ri else 0.0
+    return {'weights': weights, 'lambda_max': lambda_max, 'consistency_index': ci,
+            'consistency_ratio': cr, 'consistent': cr <= CONSISTENCY_LIMIT}
+
+
+def ranks(scores):
+    """1-based ranks (1 = best) along the last axis"""
+    order = np.argsort(-scores, axis=-1, kind='stable')
+    result = np.empty_like(order)
+    np.put_along_axis(result, order, np.arange(1, scores.shape[-1] + 1), axis=-1)
+    return result
+
+
+def monte_carlo(problem, method='weighted-sum', draws=20000, concentration=50.0, seed=None):
+    """Weight-uncertainty sensitivity: Dirichlet(concentration * weights) draws, scored in batches
+
+    Higher concentration means weights stay closer to the stated ones.
+    """
+    rng = np.random.default_rng(seed)
+    scorer = SCORERS[method]
+    alpha = np.maximum(problem.weights * concentration * len(problem.weights), 1e-3)
+    n = len(problem.alternatives)
+    wins = np.zeros(n)
+    rank_counts = np.zeros((n, n))
+    score_sum = np.zeros(n)
+    score_sq = np.zeros(n)
+    for start in range(0, draws, BATCH):
+        weights = rng.dirichlet(alpha, size=min(BATCH, draws - start))
+        scores = scorer(problem, weights)
+        r = ranks(scores)
+        wins += np.bincount(np.argmax(scores, axis=1), minlength=n)
+        rank_counts += np.bincount((np.arange(n) * n + r - 1).ravel(), minlength=n * n).reshape(n, n)
+        score_sum += scores.sum(axis=0)
+        score_sq += (scores ** 2).sum(axis=0)
+
+    mean = score_sum / draws
+    cumulative = rank_counts.cumsum(axis=1) / draws
+    baseline = scorer(problem)
+    best = int(np.argmax(baseline))
+    win_probability = wins / draws
+    return {
+        'method': method,
+        'draws': draws,
+        'baseline_scores': baseline,
+        'baseline_best': problem.alternatives[best],
+        'win_probability': win_probability,
+        'mean_rank': (rank_counts * np.arange(1, n + 1)).sum(axis=1) / draws,
+        'rank_p5': (cumulative >= 0.05).argmax(axis=1) + 1,
+        'rank_p95': (cumulative >= 0.95).argmax(axis=1) + 1,
+        'score_mean': mean,
+        'score_std': np.sqrt(np.maximum(score_sq / draws - mean ** 2, 0.0)),
+        'robustness': robustness(win_probability[best]),
+    }
+
+
+def robustness(probability):
+    """high / medium / low from the baseline winner's win probability"""
+    return 'high' if probability >= 0.8 else 'medium' if probability >= 0.6 else 'low'
+
+
+def weight_thresholds(problem, method='weighted-sum', steps=1001):
+    """Per criterion: the weights (others rescaled proportionally) at which the winner changes"""
+    scorer = SCORERS[method]
+    best = int(np.argmax(scorer(problem)))
+    grid = np.linspace(0.0, 1.0, steps)
+    results = []
+    for j, name in enumerate(problem.criteria):
+        rest = np.delete(problem.weights, j)
+        rest = rest / rest.sum() if rest.sum() > 0 else np.full(len(rest), 1.0 / max(len(rest), 1))
+        weights = np.insert(np.outer(1.0 - grid, rest), j, grid, axis=1)
+        winners = np.argmax(scorer(problem, weights), axis=1)
+        changed = grid[winners != best]
+        current = float(problem.weights[j])
+        below = changed[changed < current]
+        above = changed[changed > current]
+        results.append({
+            'criterion': name,
+            'current_weight': round(current, 4),
+            'threshold_below': round(float(below.max()), 4) if below.size else None,
+            'threshold_above': round(float(above.min()), 4) if above.size else None,
+            'robust': not (below.size and current - below.max() < 0.2 * current) and
+                      not (above.size and above.min() - current < 0.2 * current),
+        })
+    return results
+
+
+def analyze(problem, method='weighted-sum', draws=20000, concentration=50.0, seed=None):
+    """Scores, ranks, Monte Carlo sensitivity and weight thresholds in one result dict"""
+    result = monte_carlo(problem, method, draws, concentration, seed)
+    result['weighted_sum'] = weighted_sum(problem)
+    result['topsis'] = topsis(problem)
+    result['rank'] = ranks(result['baseline_scores'])
+    result['thresholds'] = weight_thresholds(problem, method)
+    return result
+
+
+def render_matrix(problem, result):
+    """Markdown solution matrix and sensitivity tables ready to paste into the document"""
+    header = ' | '.join(f"{c} ({w:.2f})" for c, w in zip(problem.criteria, problem.weights))
+    lines = [f"| Solution | {header} | Weighted Score | TOPSIS | Rank | P(best) |",
+             '|' + '---|' * (len(problem.criteria) + 5)]
+    order = np.argsort(result['rank'])
+    for i in order:
+        cells = ' | '.join(f"{v:g}" for v in problem.scores[i])
+        lines.append(f"| {problem.alternatives[i]} | {cells} | **{result['weighted_sum'][i]:.3f}** | "
+                     f"{result['topsis'][i]:.3f} | {result['rank'][i]} | {result['win_probability'][i]:.1%} |")
+
+    lines += ['', f"### Sensitivity ({result['draws']} weight draws, {result['method']})", '',
+              '| Solution | Mean Rank | Rank 90% Interval | Score Mean ± SD |', '|---|---|---|---|']
+    for i in order:
+        lines.append(f"| {problem.alternatives[i]} | {result['mean_rank'][i]:.2f} | "
+                     f"{result['rank_p5'][i]}-{result['rank_p95'][i]} | "
+                     f"{result['score_mean'][i]:.3f} ± {result['score_std'][i]:.3f} |")
+
+    lines += ['', '| Criterion | Current Weight | Winner Changes Below | Winner Changes Above | Robust |',
+              '|---|---|---|---|---|']
+    for t in result['thresholds']:
+        below = '-' if t['threshold_below'] is None else f"{t['threshold_below']:.2f}"
+        above = '-' if t['threshold_above'] is None else f"{t['threshold_above']:.2f}"
+        lines.append(f"| {t['criterion']} | {t['current_weight']:.2f} | {below} | {above} | "
+                     f"{'yes' if t['robust'] else 'no'} |")
+    lines += ['', f"**Overall robustness:** {result['robustness']} — {result['baseline_best']} wins "
+              f"{result['win_probability'][problem.alternatives.index(result['baseline_best'])]:.1%} of draws"]
+    return '\n'.join(lines) + '\n'
+
+
+def _jsonable(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Score a decision matrix with sensitivity analysis')
+    parser.add_argument('decision', help='decision-analysis YAML (criteria_definition, alternatives_analysis)')
+    parser.add_argument('--method', choices=METHODS, default='weighted-sum')
+    parser.add_argument('--draws', type=int, default=20000)
+    parser.add_argument('--concentration', type=float, default=50.0, help='weight certainty (higher = tighter)')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    data = load_yaml(args.decision)
+    problem = load_problem(data)
+    result = analyze(problem, args.method, args.draws, args.concentration, args.seed)
+    if data.get('pairwise'):
+        consistency = ahp(data['pairwise'])
+        result['ahp'] = consistency
+    if args.json:
+        result['alternatives'] = problem.alternatives
+        result['criteria'] = problem.criteria
+        print(json.dumps(_jsonable(result), indent=2))
+    else:
+        print(render_matrix(problem, result), end='')
+        if 'ahp' in result:
+            mark = '✅' if result['ahp']['consistent'] else '❌'
+            print(f"\n{mark} AHP consistency ratio {result['ahp']['consistency_ratio']:.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
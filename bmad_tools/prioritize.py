@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Time-budgeted test-scenario prioritizer for test-design.md
+
+data/test-priorities-matrix.md and data/test-levels-framework.md are parsed
+once into scoring rules: the P0-P3 criteria and examples, the
+increase/decrease adjustments, the "when to use" rules per test level and
+each level's speed. Scenarios from a test design (YAML `test_scenario`
+entries or the markdown scenario tables) are then scored in bulk. Missing
+priorities, levels and runtimes are inferred from those rules.
+
+For a CI time budget, the highest-value subset is picked by solving the 0/1
+knapsack exactly on integer costs: runtimes in multiples of their greatest
+common millisecond step. Only when that would need more than 10000 cells are
+runtimes rounded up to 1/10000 of the budget instead - the selection then
+never overruns but may fall slightly short of the optimum. Several pipeline
+stages can be cut in one run:
+
+    python -m bmad_tools.prioritize test-design.yaml --stage commit=120 --stage nightly=3600
+"""
+
+import argparse
+import functools
+import json
+import math
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from bmad_tools.core import BMAD_CORE, file_hash, load_yaml, read_text
+
+PRIORITIES = ['P0', 'P1', 'P2', 'P3']
+# Geometric weights: one scenario outweighs several of the next priority down
+PRIORITY_VALUE = {'P0': 1000.0, 'P1': 100.0, 'P2': 10.0, 'P3': 1.0}
+DEFAULT_PRIORITY = 'P2'
+LEVELS = ['unit', 'integration', 'e2e']
+LEVEL_ALIASES = {'unit': 'unit', 'int': 'integration', 'integration': 'integration', 'e2e': 'e2e',
+                 'end-to-end': 'e2e'}
+# Seconds per scenario for the speed each level's characteristics describe
+SPEED_SECONDS = {'fast': 1.0, 'moderate': 10.0, 'slow': 60.0}
+ADJUSTMENT = 2.0
+RISK_BONUS = 0.25
+MAX_CELLS = 10000
+STOPWORDS = {'and', 'the', 'for', 'with', 'from', 'into', 'that', 'this', 'are', 'not', 'can', 'has', 'have',
+             'its', 'any', 'all', 'per', 'via', 'when', 'than', 'more', 'less', 'what', 'which', 'between'}
+SCENARIO_ID_RE = re.compile(r'\b\d+\.\d+-(UNIT|INT|E2E)-\d+\b', re.IGNORECASE)
+RUNTIME_RE = re.compile(r'^\s*([\d.]+)\s*(ms|s|sec|secs|seconds?|m|min|mins|minutes?|h|hours?)?\s*$', re.IGNORECASE)
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*$')
+LABEL_RE = re.compile(r'^\*\*(.+?):?\*\*:?\s*$')
+BULLET_RE = re.compile(r'^\s*[-*]\s+(.+?)\s*$')
+
+
+def stems(text):
+    """Content-word stems (first five letters) used for rule matching"""
+    words = re.findall(r'[a-z0-9]+', str(text).lower())
+    return {w[:5] for w in words if len(w) >= 3 and w not in STOPWORDS}
+
+
+def _rule(text):
+    text = re.sub(r'\(.*?\)', '', text)
+    return tuple(sorted(stems(text)))
+
+
+def _matches(rule, text_stems):
+    hits = sum(1 for s in rule if s in text_stems)
+    return bool(rule) and hits >= min(2, len(rule))
+
+
+def _sections(text):
+    """[(heading, lines)] for every markdown heading"""
+    sections, heading, lines = [], None, []
+    for line in text.split('\n'):
+        match = HEADING_RE.match(line)
+        if match:
+            if heading is not None:
+                sections.append((heading, lines))
+            heading, lines = match.group(2), []
+        else:
+            lines.append(line)
+    if heading is not None:
+        sections.append((heading, lines))
+    return sections
+
+
+def _labelled_bullets(lines):
+    """{label: [bullet text]} for bold '**Label:**' blocks"""
+    found, label = {}, None
+    for line in lines:
+        match = LABEL_RE.match(line.strip())
+        if match:
+            label = match.group(1).strip().lower()
+            continue
+        bullet = BULLET_RE.match(line)
+        if bullet and label:
+            found.setdefault(label, []).append(bullet.group(1))
+    return found
+
+
+def _bullets(lines):
+    return [m.group(1) for m in map(BULLET_RE.match, lines) if m]
+
+
+class Rules:
+    """Scoring rules parsed from the priorities matrix and levels framework"""
+
+    def __init__(self, priority_rules, increase, decrease, level_rules, level_seconds):
+        self.priority_rules = priority_rules
+        self.increase = increase
+        self.decrease = decrease
+        self.level_rules = level_rules
+        self.level_seconds = level_seconds
+
+    @classmethod
+    def parse(cls, priorities_text, levels_text):
+        priority_rules = {p: [] for p in PRIORITIES}
+        increase, decrease = [], []
+        for heading, lines in _sections(priorities_text):
+            match = re.match(r'(P[0-3])\b', heading)
+            if match:
+                labelled = _labelled_bullets(lines)
+                for label in ('criteria', 'examples'):
+                    priority_rules[match.group(1)].extend(_rule(b) for b in labelled.get(label, []))
+            elif heading.lower().startswith('increase priority'):
+                increase.extend(_rule(b) for b in _bullets(lines))
+            elif heading.lower().startswith('decrease priority'):
+                decrease.extend(_rule(b) for b in _bullets(lines))
+
+        level_rules = {level: [] for level in LEVELS}
+        level_seconds = {}
+        for heading, lines in _sections(levels_text):
+            match = re.match(r'(?:Favor\s+)?(Unit|Integration|End-to-End|E2E)\s+Tests\b', heading, re.IGNORECASE)
+            if not match:
+                continue
+            level = LEVEL_ALIASES[match.group(1).lower()]
+            labelled = _labelled_bullets(lines)
+            level_rules[level].extend(_rule(b) for b in labelled.get('when to use', []))
+            if heading.lower().startswith('favor'):
+                level_rules[level].extend(_rule(b) for b in _bullets(lines))
+            for bullet in labelled.get('characteristics', []):
+                speed = next((s for s in SPEED_SECONDS if s in bullet.lower()), None)
+                if speed and level not in level_seconds:
+                    level_seconds[level] = SPEED_SECONDS[speed]
+        for level in LEVELS:
+            level_seconds.setdefault(level, SPEED_SECONDS['moderate'])
+        return cls(priority_rules, increase, decrease, level_rules, level_seconds)
+
+    def infer_priority(self, text_stems):
+        for priority in PRIORITIES:
+            if any(_matches(rule, text_stems) for rule in self.priority_rules[priority]):
+                return priority
+        return DEFAULT_PRIORITY
+
+    def infer_level(self, text_stems):
+        best, best_hits = 'unit', 0
+        for level in LEVELS:
+            hits = sum(1 for rule in self.level_rules[level] if _matches(rule, text_stems))
+            if hits > best_hits:
+                best, best_hits = level, hits
+        return best
+
+    def score(self, scenario):
+        """The scenario with priority, level, runtime and value filled in"""
+        text = ' '.join(str(scenario.get(k) or '') for k in
+                        ('description', 'test', 'scenario', 'requirement', 'justification', 'component', 'tags'))
+        text_stems = stems(text)
+        inferred = []
+
+        priority = str(scenario.get('priority') or '').upper()[:2]
+        if priority not in PRIORITY_VALUE:
+            priority = self.infer_priority(text_stems)
+            inferred.append('priority')
+
+        level = LEVEL_ALIASES.get(str(scenario.get('level') or '').strip().lower())
+        id_match = SCENARIO_ID_RE.search(str(scenario.get('id', '')))
+        if level is None and id_match:
+            level = LEVEL_ALIASES[id_match.group(1).lower()]
+        if level is None:
+            level = self.infer_level(text_stems)
+            inferred.append('level')
+
+        runtime = parse_runtime(next((scenario[k] for k in ('runtime', 'estimated_runtime', 'duration')
+                                      if scenario.get(k) not in (None, '')), None))
+        if runtime is None:
+            runtime = self.level_seconds[level]
+            inferred.append('runtime')
+
+        value = PRIORITY_VALUE[priority]
+        if any(_matches(rule, text_stems) for rule in self.increase):
+            value *= ADJUSTMENT
+        if any(_matches(rule, text_stems) for rule in self.decrease):
+            value /= ADJUSTMENT
+        risks = scenario.get('mitigates_risks') or []
+        value *= 1 + RISK_BONUS * len(risks if isinstance(risks, list) else [risks])
+
+        return dict(scenario, id=str(scenario.get('id', '')), priority=priority, level=level,
+                    runtime=runtime, value=value, inferred=inferred)
+
+    def score_all(self, scenarios):
+        return [self.score(s) for s in scenarios]
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_cached(priorities_path, priorities_hash, levels_path, levels_hash):
+    return Rules.parse(read_text(priorities_path), read_text(levels_path))
+
+
+def load_rules(base_path=BMAD_CORE):
+    """Rules from the core data files, parsed once per file content"""
+    priorities = str(Path(base_path) / 'data' / 'test-priorities-matrix.md')
+    levels = str(Path(base_path) / 'data' / 'test-levels-framework.md')
+    return _parse_cached(priorities, file_hash(priorities), levels, file_hash(levels))
+
+
+def parse_runtime(value):
+    """Seconds from a number or '500ms', '30s', '2m', '1h'"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = RUNTIME_RE.match(str(value))
+    if not match:
+        raise ValueError(f"cannot parse runtime '{value}'")
+    number, unit = float(match.group(1)), (match.group(2) or 's').lower()
+    if unit == 'ms':
+        return number / 1000
+    if unit.startswith('m'):
+        return number * 60
+    if unit.startswith('h'):
+        return number * 3600
+    return number
+
+
+def _table_rows(text):
+    """Scenario dicts from markdown tables with an ID column"""
+    rows, header, requirement = [], None, None
+    for line in text.split('\n'):
+        stripped = line.strip()
+        heading = HEADING_RE.match(stripped)
+        if heading:
+            ac = re.match(r'(AC\s*\d+)', heading.group(2))
+            if ac:
+                requirement = ac.group(1).replace(' ', '')
+            continue
+        if not stripped.startswith('|'):
+            header = None
+            continue
+        cells = [c.strip() for c in stripped.strip('|').split('|')]
+        if header is None:
+            header = [c.lower() for c in cells]
+            if 'id' not in header:
+                header = None
+            continue
+        if all(re.fullmatch(r':?-+:?', c) for c in cells if c):
+            continue
+        row = dict(zip(header, cells))
+        if 'test' in row and 'description' not in row:
+            row['description'] = row.pop('test')
+        if requirement and not row.get('requirement'):
+            row['requirement'] = requirement
+        rows.append(row)
+    return rows
+
+
+def load_scenarios(path):
+    """Scenarios from a test-design YAML file or markdown document"""
+    path = Path(path)
+    if path.suffix.lower() in ('.md', '.markdown'):
+        return _table_rows(read_text(path))
+    data = load_yaml(path)
+    if isinstance(data, dict):
+        data = data.get('test_scenarios') or data.get('scenarios') or (data.get('test_design') or {}).get(
+            'scenarios') or []
+    return [item.get('test_scenario', item) for item in data or []]
+
+
+def knapsack(values, costs, capacity):
+    """Indexes of the 0/1 knapsack optimum for integer costs
+
+    Dynamic programming over capacity with NumPy; the per-item choice rows are
+    bit-packed so thousands of items fit in a few megabytes.
+    """
+    best = np.zeros(capacity + 1)
+    take = np.zeros((len(values), (capacity + 8) // 8), dtype=np.uint8)
+    row = np.zeros(capacity + 1, dtype=bool)
+    for i, (value, cost) in enumerate(zip(values, costs)):
+        if cost > capacity:
+            continue
+        candidate = best[:capacity + 1 - cost] + value
+        better = candidate > best[cost:]
+        row[:] = False
+        row[cost:] = better
+        take[i] = np.packbits(row)
+        best[cost:] = np.where(better, candidate, best[cost:])
+    chosen, remaining = [], capacity
+    for i in range(len(values) - 1, -1, -1):
+        if (take[i, remaining >> 3] >> (7 - (remaining & 7))) & 1:
+            chosen.append(i)
+            remaining -= costs[i]
+    return chosen[::-1]
+
+
+def execution_order(scenarios):
+    """The task's recommended order: by priority, then unit, integration, e2e, then fastest"""
+    return sorted(scenarios, key=lambda s: (PRIORITIES.index(s['priority']), LEVELS.index(s['level']),
+                                            s['runtime'], s['id']))
+
+
+def _integer_costs(runtimes, budget):
+    """(costs, capacity) in the runtimes' common millisecond step, or None if that exceeds MAX_CELLS
+
+    Exact whenever every runtime is a whole number of milliseconds.
+    """
+    millis = [round(r * 1000) for r in runtimes]
+    if any(m <= 0 or abs(m - r * 1000) > 1e-6 * m for m, r in zip(millis, runtimes)):
+        return None
+    step = functools.reduce(math.gcd, millis)
+    capacity = math.floor(budget * 1000 / step + 1e-9)
+    if capacity > MAX_CELLS:
+        return None
+    return [m // step for m in millis], capacity
+
+
+def select(scored, budget):
+    """Highest-value subset of scored scenarios that runs within budget seconds
+
+    Optimal when the runtimes share a millisecond step that fits MAX_CELLS;
+    otherwise costs are scaled to MAX_CELLS and rounded up, which stays within
+    budget but may miss the optimum by a few scenarios.
+    """
+    if budget < 0:
+        raise ValueError(f"budget must not be negative, got {budget}")
+    total_value = sum(s['value'] for s in scored)
+    if sum(s['runtime'] for s in scored) <= budget:
+        chosen = list(scored)
+    elif budget == 0:
+        chosen = [s for s in scored if s['runtime'] <= 0]
+    else:
+        free = [s for s in scored if s['runtime'] <= 0]
+        paid = [s for s in scored if s['runtime'] > 0]
+        exact = _integer_costs([s['runtime'] for s in paid], budget)
+        if exact:
+            costs, capacity = exact
+        else:
+            # Rounding costs up keeps the real runtime of the selection within budget
+            unit = budget / MAX_CELLS
+            costs = [max(1, math.ceil(s['runtime'] / unit - 1e-9)) for s in paid]
+            capacity = MAX_CELLS
+        chosen = free + [paid[i] for i in knapsack([s['value'] for s in paid], costs, capacity)]
+    chosen_ids = {id(s) for s in chosen}
+    dropped = [s for s in scored if id(s) not in chosen_ids]
+    return {
+        'budget': budget,
+        'runtime': sum(s['runtime'] for s in chosen),
+        'value_share': sum(s['value'] for s in chosen) / total_value if total_value else 1.0,
+        'selected': execution_order(chosen),
+        'dropped': execution_order(dropped),
+        'by_priority': {p: [sum(1 for s in chosen if s['priority'] == p), sum(1 for s in scored if s['priority'] == p)]
+                        for p in PRIORITIES},
+    }
+
+
+def plan(scenarios, stages, rules=None):
+    """{stage: selection} for {stage: budget seconds}"""
+    scored = (rules or load_rules()).score_all(scenarios)
+    return {name: select(scored, budget) for name, budget in stages.items()}
+
+
+def _parse_budget(text):
+    try:
+        seconds = parse_runtime(text.strip())
+    except ValueError:
+        seconds = None
+    if seconds is None or seconds < 0:
+        raise argparse.ArgumentTypeError(f"budget must be a non-negative time such as 600, 90s or 10m, not '{text}'")
+    return seconds
+
+
+def _parse_stage(text):
+    name, _, budget = text.rpartition('=')
+    if not name:
+        raise argparse.ArgumentTypeError(f"stage must look like name=600 or name=10m, not '{text}'")
+    return name, _parse_budget(budget)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pick the highest-value test scenarios for a CI time budget')
+    parser.add_argument('scenarios', help='test design YAML or markdown')
+    parser.add_argument('--budget', type=_parse_budget, help='time budget (600, 90s, 10m)')
+    parser.add_argument('--stage', type=_parse_stage, action='append', default=[], help='name=budget, repeatable')
+    parser.add_argument('--base-path', default=str(BMAD_CORE))
+    parser.add_argument('--ids', action='store_true', help='print only the selected IDs in execution order')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    stages = dict(args.stage)
+    if args.budget is not None:
+        stages['budget'] = args.budget
+    if not stages:
+        parser.error('give --budget or at least one --stage')
+
+    result = plan(load_scenarios(args.scenarios), stages, load_rules(args.base_path))
+    if args.json:
+        print(json.dumps(result, indent=2, default=str))
+        return 0
+    if args.ids:
+        for name, selection in result.items():
+            if len(result) > 1:
+                print(f"# {name}")
+            print('\n'.join(s['id'] for s in selection['selected']))
+        return 0
+    for name, selection in result.items():
+        counts = '  '.join(f"{p}: {n}/{total}" for p, (n, total) in selection['by_priority'].items() if total)
+        print(f"{name}: {len(selection['selected'])} scenarios, {selection['runtime']:.1f}s of "
+              f"{selection['budget']:.0f}s, {selection['value_share']:.1%} of value  ({counts})")
+        dropped_p0 = [s['id'] for s in selection['dropped'] if s['priority'] == 'P0']
+        if dropped_p0:
+            print(f"  ❌ P0 scenarios over budget: {', '.join(dropped_p0)}")
+    summary = {name: {'selected': [s['id'] for s in sel['selected']]} for name, sel in result.items()}
+    print(yaml.safe_dump(summary, sort_keys=False), end='')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Relevance-ranked selection of architecture and PRD shard sections for the dev agent
+
+Sharded documents under `architectureShardedLocation` and `prdShardedLocation`
+are split into heading sections and indexed locally with BM25. The index is
+stored as JSON next to the dev debug log and only re-reads shard files whose
+content hash changed. Given the current story, `select_context` returns the
+`devLoadAlwaysFiles` in full (the guaranteed minimum) plus the best-scoring
+sections that still fit the token budget. No network access is involved.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import sys
+from pathlib import Path
+
+from bmad_tools.core import BMAD_CORE, load_core_config, read_text
+
+INDEX_VERSION = 1
+DEFAULT_INDEX = Path('.ai') / 'shard-index.json'
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9_\-]*[a-z0-9]|[a-z0-9]')
+STOPWORDS = frozenset("""
+a an and are as at be but by can do for from has have if in into is it its must
+not of on or should so such than that the their then there these this to was
+were will with within without you your we our i all any each may use used using
+""".split())
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token)"""
+    return max(1, len(text) // 4) if text else 0
+
+
+def tokenize(text):
+    """Lower-cased word tokens without stopwords"""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def split_sections(content):
+    """Split markdown into (heading path, text) sections, ignoring headings inside code fences"""
+    sections = []
+    stack = []
+    lines = []
+    in_fence = False
+
+    def flush():
+        text = '\n'.join(lines).strip('\n')
+        if text.strip():
+            sections.append((' > '.join(title for _, title in stack), text))
+
+    for line in content.split('\n'):
+        if line.lstrip().startswith('```'):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_RE.match(line)
+        if match:
+            flush()
+            lines = []
+            level = len(match.group(1))
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, match.group(2)))
+        lines.append(line)
+    flush()
+    return sections
+
+
+def _content_hash(text):
+    return hashlib.md5(text.encode('utf-8')).hexdigest()[:16]
+
+
+class ShardIndex:
+    """BM25 index over the sections of sharded documents"""
+
+    def __init__(self, project_root='.'):
+        self.project_root = Path(project_root)
+        self.files = {}   # relative path -> {'hash': ..., 'sections': [...]}
+        self._stats = None
+
+    @classmethod
+    def load(cls, path, project_root='.'):
+        """Load a persisted index, or an empty one if missing or outdated"""
+        index = cls(project_root)
+        path = Path(path)
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                index.files = data.get('files', {})
+        return index
+
+    def save(self, path):
+        """Persist the index as JSON with a stable key order"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files}, f, sort_keys=True)
+
+    def update(self, locations):
+        """Re-index changed shard files under the given folders; returns the changed paths"""
+        seen = set()
+        changed = []
+        for location in locations:
+            folder = self.project_root / location
+            if not folder.is_dir():
+                continue
+            for path in sorted(folder.rglob('*.md')):
+                rel = path.relative_to(self.project_root).as_posix()
+                seen.add(rel)
+                content = read_text(path)
+                digest = _content_hash(content)
+                if self.files.get(rel, {}).get('hash') == digest:
+                    continue
+                sections = []
+                for heading, text in split_sections(content):
+                    terms = {}
+                    for term in tokenize(heading + '\n' + text):
+                        terms[term] = terms.get(term, 0) + 1
+                    sections.append({
+                        'heading': heading,
+                        'text': text,
+                        'tokens': estimate_tokens(text),
+                        'length': sum(terms.values()),
+                        'terms': terms,
+                    })
+                self.files[rel] = {'hash': digest, 'sections': sections}
+                changed.append(rel)
+        for rel in [r for r in self.files if r not in seen]:
+            del self.files[rel]
+            changed.append(rel)
+        if changed:
+            self._stats = None
+        return changed
+
+    def _corpus_stats(self):
+        if self._stats is None:
+            df = {}
+            total_length = 0
+            count = 0
+            for entry in self.files.values():
+                for section in entry['sections']:
+                    count += 1
+                    total_length += section['length']
+                    for term in section['terms']:
+                        df[term] = df.get(term, 0) + 1
+            self._stats = (df, count, (total_length / count) if count else 0.0)
+        return self._stats
+
+    def search(self, query):
+        """All sections scored against the query text, best first"""
+        df, count, avg_length = self._corpus_stats()
+        query_terms = set(tokenize(query))
+        idf = {t: math.log(1 + (count - df[t] + 0.5) / (df[t] + 0.5)) for t in query_terms if t in df}
+        results = []
+        for rel in sorted(self.files):
+            for position, section in enumerate(self.files[rel]['sections']):
+                score = 0.0
+                norm = K1 * (1 - B + B * section['length'] / avg_length) if avg_length else K1
+                for term, weight in idf.items():
+                    tf = section['terms'].get(term)
+                    if tf:
+                        score += weight * tf * (K1 + 1) / (tf + norm)
+                if score > 0:
+                    results.append({
+                        'file': rel,
+                        'position': position,
+                        'heading': section['heading'],
+                        'text': section['text'],
+                        'tokens': section['tokens'],
+                        'score': round(score, 6),
+                    })
+        results.sort(key=lambda r: (-r['score'], r['file'], r['position']))
+        return results
+
+
+def current_story(project_root='.', base_path=BMAD_CORE):
+    """Most recently modified story under devStoryLocation, or None"""
+    config = load_core_config(base_path)
+    folder = Path(project_root) / config.get('devStoryLocation', 'docs/stories')
+    stories = sorted(folder.glob('*.md'), key=lambda p: (p.stat().st_mtime, p.name)) if folder.is_dir() else []
+    return stories[-1] if stories else None
+
+
+def shard_locations(config):
+    """Sharded architecture and PRD folders configured in core-config.yaml"""
+    locations = []
+    for key, folder_key in (('architecture', 'architectureShardedLocation'), ('prd', 'prdShardedLocation')):
+        section = config.get(key) or {}
+        if section.get(f'{key}Sharded', True) and section.get(folder_key):
+            locations.append(section[folder_key])
+    return locations
+
+
+def select_context(story_text, index, always_files, budget, project_root='.'):
+    """Always-load files plus the most relevant sections that fit within budget tokens"""
+    project_root = Path(project_root)
+    always = []
+    used = 0
+    for rel in always_files:
+        path = project_root / rel
+        if path.exists():
+            text = read_text(path)
+            always.append({'file': rel, 'text': text, 'tokens': estimate_tokens(text)})
+            used += always[-1]['tokens']
+
+    always_set = set(always_files)
+    picked = []
+    for result in index.search(story_text):
+        if result['file'] in always_set:
+            continue
+        if used + result['tokens'] > budget:
+            continue
+        picked.append(result)
+        used += result['tokens']
+
+    picked.sort(key=lambda r: (r['file'], r['position']))
+    return {'always': always, 'sections': picked, 'tokens': used, 'budget': budget}
+
+
+def render_context(selection):
+    """Markdown context block with a source reference per section"""
+    parts = []
+    for item in selection['always']:
+        parts.append(f"<!-- [Source: {item['file']}] -->\n{item['text'].strip()}\n")
+    for item in selection['sections']:
+        anchor = item['heading'].split(' > ')[-1] if item['heading'] else ''
+        parts.append(f"<!-- [Source: {item['file']}#{anchor}] score={item['score']} -->\n{item['text'].strip()}\n")
+    return '\n'.join(parts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Select relevant architecture/PRD sections for a story')
+    parser.add_argument('--story', help='story file (defaults to the newest file in devStoryLocation)')
+    parser.add_argument('--budget', type=int, default=12000, help='token budget for the whole selection')
+    parser.add_argument('--project-root', default='.')
+    parser.add_argument('--base-path', default=str(BMAD_CORE))
+    parser.add_argument('--index', help=f'index file (default: <project-root>/{DEFAULT_INDEX})')
+    parser.add_argument('--build-only', action='store_true', help='refresh the index and exit')
+    parser.add_argument('--json', action='store_true', help='print the selection as JSON')
+    args = parser.parse_args(argv)
+
+    config = load_core_config(args.base_path)
+    index_path = Path(args.index) if args.index else Path(args.project_root) / DEFAULT_INDEX
+    index = ShardIndex.load(index_path, args.project_root)
+    changed = index.update(shard_locations(config))
+    if changed or not index_path.exists():
+        index.save(index_path)
+    if args.build_only:
+        print(f"✅ Indexed {len(index.files)} shard files ({len(changed)} changed)")
+        return 0
+
+    story = Path(args.story) if args.story else current_story(args.project_root, args.base_path)
+    if story is None or not story.exists():
+        print("❌ No story found", file=sys.stderr)
+        return 1
+
+    selection = select_context(read_text(story), index, config.get('devLoadAlwaysFiles') or [],
+                               args.budget, args.project_root)
+    if args.json:
+        print(json.dumps(selection, indent=2))
+    else:
+        sys.stdout.write(render_context(selection))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
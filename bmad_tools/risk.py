@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo risk simulation for risk-profile.md
+
+Takes a risk register (YAML or CSV) where each risk has an occurrence
+probability, an impact on the task's 1-3 scale (a fixed value or a triangular
+/ uniform range) and an optional correlation group. Occurrences within a group
+are tied together with a one-factor Gaussian copula, so risks that share a
+cause tend to fire together. The whole register is simulated at once with
+NumPy in fixed-size chunks:
+
+- exposure percentiles of the summed impact (P50 ... P99),
+- each risk's contribution to the tail (its share of the mean exposure in
+  the worst 10% of draws), which ranks what actually drives the risk,
+- a gate recommendation with the task's deterministic score mapping plus an
+  optional appetite on P90 exposure, emitted as the qa-gate `risk_summary`.
+
+Every chunk has its own seed, so results are identical with any number of
+worker processes.
+
+    risks:
+      - {id: SEC-001, title: XSS on profile form, probability: 0.4, impact: high, group: auth}
+      - {id: PERF-001, title: Slow dashboard, probability: medium, impact: {low: 1, mode: 2, high: 3}}
+    correlation: {auth: 0.6}
+    appetite: {concerns: 4, fail: 8}   # optional, on P90 exposure
+
+CSV registers give a group's correlation in a `correlation` (or `rho`) column;
+`--correlation group=rho` overrides either format. Groups of several risks
+without a correlation are simulated independently and reported as a warning.
+"""
+
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+import yaml
+
+from bmad_tools.core import load_yaml
+
+# Mid-points of the task's probability bands (<30%, 30-70%, >70%)
+PROBABILITY_LEVELS = {'low': 0.15, 'medium': 0.5, 'high': 0.85}
+IMPACT_LEVELS = {'low': 1.0, 'medium': 2.0, 'high': 3.0}
+CATEGORIES = {'TECH': 'technical', 'SEC': 'security', 'PERF': 'performance', 'DATA': 'data',
+              'BUS': 'business', 'OPS': 'operational'}
+PERCENTILES = [50, 80, 90, 95, 99]
+TAIL_PERCENTILE = 90
+KEEP_PERCENTILE = 80
+CHUNK = 8192
+GATE_ORDER = ['PASS', 'CONCERNS', 'FAIL']
+
+
+def _level(value, levels, what):
+    text = str(value).strip().lower().split(' ')[0]
+    if text in levels:
+        return levels[text]
+    raise ValueError(f"{what} '{value}' is not a number or one of {', '.join(levels)}")
+
+
+def parse_probability(value):
+    """Occurrence probability from a number in [0, 1] or a level name"""
+    try:
+        probability = float(value)
+    except (TypeError, ValueError):
+        return _level(value, PROBABILITY_LEVELS, 'probability')
+    if not 0 <= probability <= 1:
+        raise ValueError(f"probability {value} is outside [0, 1]")
+    return probability
+
+
+def _impact_value(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _level(value, IMPACT_LEVELS, 'impact')
+
+
+def parse_impact(value):
+    """(low, mode, high, uniform) from a number, level name or {low, [mode,] high} range"""
+    if not isinstance(value, dict):
+        fixed = _impact_value(value)
+        return fixed, fixed, fixed, False
+    low, high = _impact_value(value['low']), _impact_value(value['high'])
+    if low > high:
+        raise ValueError(f"impact range {value} has low > high")
+    if value.get('mode') in (None, ''):
+        return low, (low + high) / 2, high, True
+    mode = _impact_value(value['mode'])
+    if not low <= mode <= high:
+        raise ValueError(f"impact mode {mode} is outside [{low}, {high}]")
+    return low, mode, high, False
+
+
+def score_level(probability, impact):
+    """The task's probability x impact score, each on the 1-3 scale"""
+    p_level = 3 if probability > 0.7 else 2 if probability >= 0.3 else 1
+    i_level = int(min(3, max(1, round(impact))))
+    return p_level * i_level
+
+
+def priority(score):
+    if score >= 9:
+        return 'critical'
+    if score >= 6:
+        return 'high'
+    if score >= 4:
+        return 'medium'
+    if score >= 2:
+        return 'low'
+    return 'minimal'
+
+
+class RiskRegister:
+    """Risks as parallel NumPy arrays, ready to simulate"""
+
+    def __init__(self, risks, correlation=None, appetite=None):
+        if not risks:
+            raise ValueError('risk register is empty')
+        self.risks = []
+        correlation = dict(_row_correlation(risks), **(correlation or {}))
+        self.appetite = appetite or {}
+        groups = sorted({str(r['group']) for r in risks if r.get('group')})
+        sizes = {g: sum(1 for r in risks if str(r.get('group')) == g) for g in groups}
+        self.warnings = [f"group {g} has {sizes[g]} risks but no correlation; they are simulated independently"
+                         for g in groups if sizes[g] > 1 and g not in correlation]
+        low, mode, high, uniform, probability, group_index, rho = [], [], [], [], [], [], []
+        seen = set()
+        for r in risks:
+            rid = str(r['id'])
+            if rid in seen:
+                raise ValueError(f"duplicate risk id {rid}")
+            seen.add(rid)
+            p = parse_probability(r['probability'])
+            a, c, b, flat = parse_impact(r['impact'])
+            group = str(r['group']) if r.get('group') else None
+            r_rho = float(correlation.get(group, 0.0)) if group else 0.0
+            if not 0 <= r_rho < 1:
+                raise ValueError(f"correlation for group {group} must be in [0, 1)")
+            probability.append(p)
+            low.append(a)
+            mode.append(c)
+            high.append(b)
+            uniform.append(flat)
+            group_index.append(groups.index(group) if group else len(groups))
+            rho.append(r_rho)
+            impact_mean = (a + b) / 2 if flat else (a + b + c) / 3
+            self.risks.append({
+                'id': rid,
+                'title': r.get('title', rid),
+                'category': r.get('category') or CATEGORIES.get(rid.split('-')[0].upper(), 'other'),
+                'group': group,
+                'probability': p,
+                'impact_mean': impact_mean,
+                'score': score_level(p, impact_mean),
+            })
+        for r in self.risks:
+            r['priority'] = priority(r['score'])
+        self.groups = groups
+        low, mode, high, uniform = np.array(low), np.array(mode), np.array(high), np.array(uniform)
+        width = high - low
+        self.model = {
+            'threshold': np.array([_normal_quantile(p) for p in probability], dtype=np.float32),
+            'low': low, 'high': high, 'width': width, 'rise': width * (mode - low), 'fall': width * (high - mode),
+            'split': np.divide(mode - low, width, out=np.full(len(width), 0.5), where=width > 0),
+            'uniform': uniform, 'any_uniform': bool(uniform.any()), 'group': np.array(group_index, dtype=np.intp),
+            'loading': np.sqrt(rho).astype(np.float32), 'idiosyncratic': np.sqrt(1 - np.array(rho)).astype(np.float32),
+            'correlated': any(rho), 'groups': len(groups) + 1,
+        }
+
+    @classmethod
+    def from_dict(cls, data, correlation=None):
+        register = data.get('risk_register', data)
+        return cls(register.get('risks') or [], dict(register.get('correlation') or {}, **(correlation or {})),
+                   register.get('appetite'))
+
+    @classmethod
+    def load(cls, path, correlation=None):
+        """Register from YAML or CSV; correlation ({group: rho}) overrides the file's values"""
+        path = Path(path)
+        if path.suffix.lower() == '.csv':
+            return cls(read_csv(path), correlation)
+        return cls.from_dict(load_yaml(path), correlation)
+
+    def __len__(self):
+        return len(self.risks)
+
+
+def _row_correlation(risks):
+    """{group: rho} from risks that carry their group's `correlation` (e.g. a CSV column)"""
+    found = {}
+    for r in risks:
+        value = r.get('correlation')
+        if value in (None, '') or not r.get('group'):
+            continue
+        group, value = str(r['group']), float(value)
+        if found.setdefault(group, value) != value:
+            raise ValueError(f"group {group} has conflicting correlations {found[group]} and {value}")
+    return found
+
+
+def read_csv(path):
+    """Risks from a CSV with id, title, probability, impact
+    [, impact_low, impact_high, group, correlation (or rho), category]"""
+    risks = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            row = {k.strip().lower(): (v or '').strip() for k, v in row.items() if k}
+            impact = row.get('impact', '')
+            if row.get('impact_low') and row.get('impact_high'):
+                impact = {'low': row['impact_low'], 'mode': impact, 'high': row['impact_high']}
+            risks.append({'id': row['id'], 'title': row.get('title') or row['id'], 'probability': row['probability'],
+                          'impact': impact, 'group': row.get('group') or None,
+                          'correlation': row.get('correlation') or row.get('rho') or None,
+                          'category': row.get('category') or None})
+    return risks
+
+
+def _normal_quantile(p):
+    if p <= 0:
+        return -np.inf
+    if p >= 1:
+        return np.inf
+    return NormalDist().inv_cdf(p)
+
+
+def _simulate_chunk(model, seed, n, tail_cut=None):
+    """Losses for n draws from one seed
+
+    Returns the per-draw totals, per-risk loss sums and the sparse losses of
+    the chunk's worst draws (at or above its own KEEP_PERCENTILE). With
+    tail_cut given, returns per-risk loss sums over draws at or above it.
+    Impacts are only drawn where a risk occurs and aggregated with bincount,
+    so no dense draws x risks loss matrix is built.
+    """
+    rng = np.random.default_rng(seed)
+    m = len(model['threshold'])
+    z = rng.standard_normal((n, m), dtype=np.float32)
+    if model['correlated']:
+        z *= model['idiosyncratic']
+        z += rng.standard_normal((n, model['groups']), dtype=np.float32)[:, model['group']] * model['loading']
+    rows, cols = np.nonzero(z < model['threshold'])
+
+    # Triangular inverse CDF with per-risk constants; uniform ranges are linear
+    u = rng.random(len(cols))
+    split = model['split'][cols]
+    impact = np.where(u < split,
+                      model['low'][cols] + np.sqrt(u * model['rise'][cols]),
+                      model['high'][cols] - np.sqrt((1 - u) * model['fall'][cols]))
+    if model['any_uniform']:
+        flat = model['uniform'][cols]
+        impact[flat] = model['low'][cols[flat]] + u[flat] * model['width'][cols[flat]]
+
+    totals = np.bincount(rows, weights=impact, minlength=n)
+    if tail_cut is not None:
+        keep = (totals >= tail_cut)[rows]
+        return np.bincount(cols[keep], weights=impact[keep], minlength=m)
+    local_cut = float(np.percentile(totals, KEEP_PERCENTILE))
+    keep = (totals >= local_cut)[rows]
+    worst = (local_cut, rows[keep], cols[keep].astype(np.int32), impact[keep].astype(np.float32))
+    return totals, np.bincount(cols, weights=impact, minlength=m), worst
+
+
+def _run(model, seeds, sizes, jobs, tail_cut=None):
+    if jobs <= 1 or len(seeds) < 2:
+        return [_simulate_chunk(model, s, n, tail_cut) for s, n in zip(seeds, sizes)]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_simulate_chunk, [model] * len(seeds), seeds, sizes, [tail_cut] * len(seeds)))
+
+
+def simulate(register, draws=100_000, seed=None, jobs=1):
+    """Exposure percentiles and per-risk mean and tail contributions"""
+    sizes = [min(CHUNK, draws - start) for start in range(0, draws, CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    model = register.model
+    m = len(register)
+
+    chunks = _run(model, seeds, sizes, jobs)
+    totals = np.concatenate([t for t, _, _ in chunks])
+    expected = sum(s for _, s, _ in chunks) / draws
+    tail_cut = float(np.percentile(totals, TAIL_PERCENTILE))
+
+    # Each chunk kept its own worst draws; only a chunk whose kept set does not
+    # reach down to the global cut is regenerated from its seed
+    tail_sum = np.zeros(m)
+    redo = []
+    for (chunk_totals, _, (local_cut, rows, cols, impact)), s, n in zip(chunks, seeds, sizes):
+        if local_cut <= tail_cut:
+            keep = (chunk_totals >= tail_cut)[rows]
+            tail_sum += np.bincount(cols[keep], weights=impact[keep], minlength=m)
+        else:
+            redo.append((s, n))
+    if redo:
+        tail_sum += sum(_run(model, [s for s, _ in redo], [n for _, n in redo], jobs, tail_cut))
+    tail = tail_sum / max(int((totals >= tail_cut).sum()), 1)
+    tail_total = float(tail.sum())
+
+    exposure = {'mean': float(totals.mean())}
+    for q, value in zip(PERCENTILES, np.percentile(totals, PERCENTILES)):
+        exposure[f'p{q}'] = float(value)
+    exposure['tail_mean'] = tail_total
+    exposure['max'] = float(totals.max())
+
+    risks = []
+    for i, r in enumerate(register.risks):
+        risks.append(dict(r, expected=float(expected[i]), tail_contribution=float(tail[i]),
+                          tail_share=float(tail[i] / tail_total) if tail_total else 0.0))
+    risks.sort(key=lambda r: (-r['tail_contribution'], -r['score'], r['id']))
+    return {'draws': draws, 'tail_percentile': TAIL_PERCENTILE, 'exposure': exposure, 'risks': risks}
+
+
+def recommend_gate(result, appetite=None):
+    """(gate, reasons) from the task's score mapping and an optional P90 exposure appetite"""
+    gate, reasons = 'PASS', []
+    top = max(result['risks'], key=lambda r: r['score'])
+    if top['score'] >= 9:
+        gate = 'FAIL'
+        reasons.append(f"{top['id']} scores {top['score']} (critical)")
+    elif top['score'] >= 6:
+        gate = 'CONCERNS'
+        reasons.append(f"{top['id']} scores {top['score']} (high)")
+    p90 = result['exposure']['p90']
+    for level in ('fail', 'concerns'):
+        limit = (appetite or {}).get(level)
+        if limit is not None and p90 > float(limit):
+            candidate = level.upper()
+            if GATE_ORDER.index(candidate) > GATE_ORDER.index(gate):
+                gate = candidate
+            reasons.append(f"P90 exposure {p90:.2f} exceeds the {level} appetite of {limit}")
+            break
+    return gate, reasons
+
+
+def risk_summary(result, appetite=None):
+    """Gate status and the qa-gate risk_summary block"""
+    risks = result['risks']
+    gate, reasons = recommend_gate(result, appetite)
+    totals = {level: sum(1 for r in risks if r['priority'] == level) for level in ('critical', 'high', 'medium', 'low')}
+    by_score = sorted(risks, key=lambda r: (-r['score'], -r['tail_contribution']))
+    must_fix = [r['title'] for r in by_score
+                if r['priority'] == 'critical' or (r['priority'] == 'high' and r['category'] in ('security', 'data'))]
+    monitor = [r['title'] for r in by_score
+               if r['title'] not in must_fix and (r['priority'] in ('high', 'medium') or r['tail_share'] >= 0.1)]
+    summary = {'totals': totals}
+    if by_score[0]['score'] >= 2:
+        summary['highest'] = {'id': by_score[0]['id'], 'score': by_score[0]['score'], 'title': by_score[0]['title']}
+    summary['recommendations'] = {'must_fix': must_fix, 'monitor': monitor}
+    exposure = result['exposure']
+    summary['simulation'] = {'draws': result['draws'], 'mean': round(exposure['mean'], 3),
+                             'p50': round(exposure['p50'], 3), 'p90': round(exposure['p90'], 3),
+                             'p95': round(exposure['p95'], 3), 'tail_mean': round(exposure['tail_mean'], 3),
+                             'top_drivers': [r['id'] for r in risks[:3] if r['tail_contribution'] > 0]}
+    status = '; '.join(reasons) if reasons else 'No high or critical risks and exposure within appetite.'
+    return {'gate': gate, 'status_reason': status, 'risk_summary': summary}
+
+
+def render_matrix(result):
+    """The task's risk matrix table, with each risk's share of tail exposure"""
+    lines = ['| Risk ID | Description | Probability | Impact | Score | Priority | Tail share |',
+             '| ------- | ----------- | ----------- | ------ | ----- | -------- | ---------- |']
+    for r in sorted(result['risks'], key=lambda r: (-r['score'], -r['tail_contribution'])):
+        lines.append(f"| {r['id']} | {r['title']} | {r['probability']:.0%} | {r['impact_mean']:.1f} | "
+                     f"{r['score']} | {r['priority'].capitalize()} | {r['tail_share']:.0%} |")
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Monte Carlo exposure, tail drivers and gate for a risk register')
+    parser.add_argument('register', help='risk register YAML or CSV')
+    parser.add_argument('--draws', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--jobs', type=int, default=1, help='worker processes')
+    parser.add_argument('--correlation', action='append', default=[], metavar='GROUP=RHO',
+                        help='correlation of a group (overrides the register; repeatable)')
+    parser.add_argument('--json', action='store_true', help='full result as JSON')
+    args = parser.parse_args(argv)
+
+    correlation = {}
+    for item in args.correlation:
+        group, _, rho = item.partition('=')
+        try:
+            correlation[group.strip()] = float(rho)
+        except ValueError:
+            parser.error(f"--correlation expects GROUP=RHO, got '{item}'")
+    register = RiskRegister.load(args.register, correlation)
+    for warning in register.warnings:
+        print(f"⚠️ {warning}", file=sys.stderr)
+    result = simulate(register, args.draws, args.seed, args.jobs)
+    gate = risk_summary(result, register.appetite)
+    if args.json:
+        print(json.dumps(dict(result, **gate), indent=2))
+        return 0
+    exposure = result['exposure']
+    print(f"Simulated {len(register)} risks x {args.draws} draws")
+    print('Exposure: ' + '  '.join(f"P{q}={exposure[f'p{q}']:.2f}" for q in PERCENTILES)
+          + f"  mean={exposure['mean']:.2f}\n")
+    print(render_matrix(result))
+    print('# risk_summary (paste into gate file):')
+    print(yaml.safe_dump({'risk_summary': gate['risk_summary']}, sort_keys=False), end='')
+    icon = {'PASS': '✅', 'CONCERNS': '⚠️', 'FAIL': '❌'}[gate['gate']]
+    print(f"{icon} Gate: {gate['gate']} - {gate['status_reason']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
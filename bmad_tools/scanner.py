@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Parallel incremental codebase scanner for the document-project task
+
+Walks a brownfield repository once and extracts, per file, the language, line
+count, imports and entry-point markers; manifests (package.json,
+requirements.txt, pyproject.toml, go.mod, Cargo.toml, pom.xml, ...) supply
+dependencies and frameworks. Per-file facts are cached by content hash in
+`.ai/scan-cache.json`, and files whose size and mtime are unchanged are not
+even read, so a rescan only touches what changed. Changed files are parsed in
+worker processes.
+
+The report aggregates languages, frameworks, entry points and module
+structure (top-level modules with their internal dependencies) and renders
+the tech-stack and source-tree sections document-project.md asks for.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+CACHE_VERSION = 1
+DEFAULT_CACHE = Path('.ai') / 'scan-cache.json'
+MAX_FILE_BYTES = 2 * 1024 * 1024
+
+IGNORED_DIRS = frozenset("""
+.git .hg .svn node_modules __pycache__ .venv venv env .tox .nox .mypy_cache .pytest_cache
+dist build target out .next .nuxt coverage vendor .idea .vscode .ai .gradle bin obj
+""".split())
+
+LANGUAGES = {
+    '.py': 'Python', '.js': 'JavaScript', '.mjs': 'JavaScript', '.cjs': 'JavaScript', '.jsx': 'JavaScript',
+    '.ts': 'TypeScript', '.tsx': 'TypeScript', '.go': 'Go', '.rs': 'Rust', '.java': 'Java', '.kt': 'Kotlin',
+    '.rb': 'Ruby', '.php': 'PHP', '.cs': 'C#', '.c': 'C', '.h': 'C', '.cpp': 'C++', '.cc': 'C++',
+    '.hpp': 'C++', '.swift': 'Swift', '.scala': 'Scala', '.sh': 'Shell', '.sql': 'SQL',
+    '.vue': 'Vue', '.svelte': 'Svelte', '.dart': 'Dart', '.ex': 'Elixir', '.exs': 'Elixir',
+}
+
+MANIFESTS = frozenset([
+    'package.json', 'requirements.txt', 'pyproject.toml', 'setup.py', 'Pipfile', 'go.mod',
+    'Cargo.toml', 'pom.xml', 'build.gradle', 'build.gradle.kts', 'Gemfile', 'composer.json',
+])
+
+# dependency name -> (category, display name)
+FRAMEWORKS = {
+    'react': ('Frontend', 'React'), 'next': ('Frontend', 'Next.js'), 'vue': ('Frontend', 'Vue'),
+    'nuxt': ('Frontend', 'Nuxt'), '@angular/core': ('Frontend', 'Angular'), 'svelte': ('Frontend', 'Svelte'),
+    'express': ('Backend', 'Express'), 'fastify': ('Backend', 'Fastify'), '@nestjs/core': ('Backend', 'NestJS'),
+    'koa': ('Backend', 'Koa'), 'django': ('Backend', 'Django'), 'flask': ('Backend', 'Flask'),
+    'fastapi': ('Backend', 'FastAPI'), 'rails': ('Backend', 'Rails'), 'laravel/framework': ('Backend', 'Laravel'),
+    'org.springframework.boot': ('Backend', 'Spring Boot'), 'github.com/gin-gonic/gin': ('Backend', 'Gin'),
+    'actix-web': ('Backend', 'Actix Web'), 'axum': ('Backend', 'Axum'),
+    'sqlalchemy': ('Database', 'SQLAlchemy'), 'prisma': ('Database', 'Prisma'),
+    '@prisma/client': ('Database', 'Prisma'), 'typeorm': ('Database', 'TypeORM'),
+    'mongoose': ('Database', 'Mongoose'), 'sequelize': ('Database', 'Sequelize'),
+    'psycopg2': ('Database', 'PostgreSQL (psycopg2)'), 'pg': ('Database', 'PostgreSQL (pg)'),
+    'redis': ('Database', 'Redis'), 'jest': ('Testing', 'Jest'), 'vitest': ('Testing', 'Vitest'),
+    'mocha': ('Testing', 'Mocha'), 'pytest': ('Testing', 'pytest'), 'cypress': ('Testing', 'Cypress'),
+    '@playwright/test': ('Testing', 'Playwright'), 'rspec': ('Testing', 'RSpec'),
+    'webpack': ('Build', 'Webpack'), 'vite': ('Build', 'Vite'), 'typescript': ('Language', 'TypeScript'),
+    'tailwindcss': ('Frontend', 'Tailwind CSS'), 'celery': ('Backend', 'Celery'),
+    'pydantic': ('Backend', 'Pydantic'), 'tokio': ('Runtime', 'Tokio'),
+}
+
+IMPORT_PATTERNS = {
+    'Python': [re.compile(r'^\s*from\s+(\.*[\w.]*)\s+import\b', re.M), re.compile(r'^\s*import\s+([\w.]+)', re.M)],
+    'JavaScript': [re.compile(r'''(?:import|export)\s[^'"]*?from\s*['"]([^'"]+)['"]'''),
+                   re.compile(r'''(?:require|import)\(\s*['"]([^'"]+)['"]\s*\)'''),
+                   re.compile(r'''^\s*import\s+['"]([^'"]+)['"]''', re.M)],
+    'Go': [re.compile(r'^\s*(?:import\s+)?(?:\w+\s+)?"([\w./\-]+)"\s*$', re.M)],
+    'Rust': [re.compile(r'^\s*(?:pub\s+)?use\s+([\w:]+)', re.M), re.compile(r'^\s*extern\s+crate\s+(\w+)', re.M)],
+    'Java': [re.compile(r'^\s*import\s+(?:static\s+)?([\w.]+)\s*;', re.M)],
+    'Ruby': [re.compile(r'''^\s*require(?:_relative)?\s+['"]([^'"]+)['"]''', re.M)],
+}
+IMPORT_PATTERNS['TypeScript'] = IMPORT_PATTERNS['JavaScript']
+IMPORT_PATTERNS['Vue'] = IMPORT_PATTERNS['JavaScript']
+IMPORT_PATTERNS['Svelte'] = IMPORT_PATTERNS['JavaScript']
+IMPORT_PATTERNS['Kotlin'] = IMPORT_PATTERNS['Java']
+
+ENTRY_MARKERS = {
+    'Python': re.compile(r'''^if\s+__name__\s*==\s*['"]__main__['"]''', re.M),
+    'Go': re.compile(r'^func\s+main\s*\(\s*\)', re.M),
+    'Rust': re.compile(r'^\s*(?:async\s+)?fn\s+main\s*\(', re.M),
+    'Java': re.compile(r'public\s+static\s+void\s+main\s*\('),
+    'C#': re.compile(r'static\s+(?:async\s+)?\S+\s+Main\s*\('),
+}
+ENTRY_NAMES = frozenset(['main', 'index', 'app', 'server', 'manage', 'cli', '__main__', 'wsgi', 'asgi'])
+TEST_NAME_RE = re.compile(r'(^test_|_test\.|\.test\.|\.spec\.|Test\.java$|_spec\.rb$)')
+
+
+def _hash_bytes(data):
+    return hashlib.md5(data).hexdigest()[:16]
+
+
+def parse_manifest(name, text):
+    """{'dependencies': {name: version}, 'entry_points': [..]} from one manifest file"""
+    deps = {}
+    entries = []
+    if name == 'package.json':
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = {}
+        for key in ('dependencies', 'devDependencies', 'peerDependencies'):
+            deps.update(data.get(key) or {})
+        for key in ('main', 'module'):
+            if isinstance(data.get(key), str):
+                entries.append(data[key])
+        bins = data.get('bin')
+        entries.extend([bins] if isinstance(bins, str) else list((bins or {}).values()))
+    elif name == 'requirements.txt':
+        for line in text.splitlines():
+            match = re.match(r'^\s*([A-Za-z0-9_.\-\[\]]+)\s*([=<>!~].*)?$', line.split('#')[0])
+            if match and not line.strip().startswith('-'):
+                deps[re.sub(r'\[.*\]', '', match.group(1)).lower()] = (match.group(2) or '').strip()
+    elif name == 'pyproject.toml':
+        data = {}
+        if tomllib:
+            try:
+                data = tomllib.loads(text)
+            except ValueError:
+                data = {}
+        project = data.get('project') or {}
+        for spec in project.get('dependencies') or []:
+            match = re.match(r'^\s*([A-Za-z0-9_.\-]+)\s*(.*)$', spec)
+            if match:
+                deps[match.group(1).lower()] = match.group(2).strip()
+        poetry = ((data.get('tool') or {}).get('poetry') or {}).get('dependencies') or {}
+        deps.update({k.lower(): v if isinstance(v, str) else '' for k, v in poetry.items() if k != 'python'})
+        entries.extend(str(v) for v in (project.get('scripts') or {}).values())
+    elif name == 'go.mod':
+        for match in re.finditer(r'^\s*(?:require\s+)?([\w.\-]+\.[\w./\-]+)\s+(v[\w.\-+]+)', text, re.M):
+            deps[match.group(1)] = match.group(2)
+    elif name == 'Cargo.toml':
+        try:
+            data = tomllib.loads(text) if tomllib else {}
+        except ValueError:
+            data = {}
+        for key in ('dependencies', 'dev-dependencies'):
+            for dep, spec in (data.get(key) or {}).items():
+                deps[dep] = spec if isinstance(spec, str) else (spec or {}).get('version', '')
+    elif name == 'pom.xml':
+        for match in re.finditer(r'<groupId>([^<]+)</groupId>\s*<artifactId>([^<]+)</artifactId>'
+                                 r'(?:\s*<version>([^<]+)</version>)?', text):
+            deps[match.group(1)] = match.group(3) or ''
+            deps[f'{match.group(1)}:{match.group(2)}'] = match.group(3) or ''
+    elif name == 'Gemfile':
+        for match in re.finditer(r'''^\s*gem\s+['"]([^'"]+)['"](?:\s*,\s*['"]([^'"]+)['"])?''', text, re.M):
+            deps[match.group(1)] = match.group(2) or ''
+    elif name == 'composer.json':
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = {}
+        deps.update(data.get('require') or {})
+        deps.update(data.get('require-dev') or {})
+    return {'dependencies': deps, 'entry_points': entries}
+
+
+def scan_file(root, rel):
+    """Facts for one file: hash, language, lines, imports, entry point and test flags"""
+    path = Path(root) / rel
+    stat = path.stat()
+    facts = {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+    if stat.st_size > MAX_FILE_BYTES:
+        facts.update({'hash': None, 'language': None, 'lines': 0, 'skipped': 'too large'})
+        return rel, facts
+    data = path.read_bytes()
+    facts['hash'] = _hash_bytes(data)
+    text = data.decode('utf-8', errors='replace')
+    name = path.name
+    language = LANGUAGES.get(path.suffix.lower())
+    facts['language'] = language
+    facts['lines'] = text.count('\n') + (1 if text and not text.endswith('\n') else 0)
+    if name in MANIFESTS:
+        facts['manifest'] = parse_manifest(name, text)
+    if language:
+        imports = []
+        for pattern in IMPORT_PATTERNS.get(language, []):
+            imports.extend(pattern.findall(text))
+        facts['imports'] = sorted(set(i for i in imports if i))
+        marker = ENTRY_MARKERS.get(language)
+        facts['entry'] = bool(marker and marker.search(text)) or path.stem in ENTRY_NAMES
+        facts['test'] = bool(TEST_NAME_RE.search(name)) or 'tests' in Path(rel).parts
+    return rel, facts
+
+
+def _scan_batch(args):
+    root, batch = args
+    results = []
+    for rel in batch:
+        try:
+            results.append(scan_file(root, rel))
+        except OSError:
+            continue
+    return results
+
+
+def walk(root, ignored=IGNORED_DIRS):
+    """Relative paths and (size, mtime) of every file below root, skipping vendored/build folders"""
+    found = {}
+    stack = [Path(root)]
+    while stack:
+        folder = stack.pop()
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in ignored and not entry.name.startswith('.'):
+                    stack.append(Path(entry.path))
+            elif entry.is_file(follow_symlinks=False):
+                stat = entry.stat()
+                found[Path(entry.path).relative_to(root).as_posix()] = (stat.st_size, stat.st_mtime_ns)
+    return found
+
+
+class CodebaseScanner:
+    """Incremental scanner with a JSON per-file fact cache"""
+
+    def __init__(self, root='.', cache_path=None, jobs=None):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path else self.root / DEFAULT_CACHE
+        self.jobs = jobs or os.cpu_count() or 1
+        self.files = {}
+        if self.cache_path.exists():
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.files = data.get('files', {})
+
+    def save(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'files': self.files}, f, separators=(',', ':'))
+        tmp.replace(self.cache_path)
+
+    def update(self):
+        """Re-scan new or modified files and drop deleted ones; returns (changed, removed) paths"""
+        current = walk(self.root)
+        stale = [rel for rel, (size, mtime) in current.items()
+                 if rel not in self.files or (self.files[rel]['size'], self.files[rel]['mtime']) != (size, mtime)]
+        removed = [rel for rel in self.files if rel not in current]
+        for rel in removed:
+            del self.files[rel]
+
+        changed = []
+        for rel, facts in self._scan(sorted(stale)):
+            previous = self.files.get(rel)
+            self.files[rel] = facts
+            if previous is None or previous.get('hash') != facts.get('hash'):
+                changed.append(rel)
+        return changed, removed
+
+    def _scan(self, paths):
+        if self.jobs <= 1 or len(paths) < 200:
+            return _scan_batch((str(self.root), paths))
+        size = max(50, len(paths) // (self.jobs * 4))
+        batches = [(str(self.root), paths[i:i + size]) for i in range(0, len(paths), size)]
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            return [item for result in pool.map(_scan_batch, batches) for item in result]
+
+    def report(self, module_depth=1):
+        """Aggregated languages, frameworks, entry points and module structure"""
+        return build_report(self.files, module_depth)
+
+
+def _module_of(rel, depth):
+    parts = rel.split('/')[:-1]
+    return '/'.join(parts[:depth]) if parts else '.'
+
+
+def _resolve_import(rel, name, language, depth, top_level):
+    """The internal module an import points at, or None for external imports"""
+    if language in ('JavaScript', 'TypeScript', 'Vue', 'Svelte'):
+        if not name.startswith('.'):
+            return None
+        target = os.path.normpath(os.path.join(os.path.dirname(rel), name)).replace(os.sep, '/')
+        return _module_of(target + '/x', depth) if not target.startswith('..') else None
+    if language == 'Python':
+        if name.startswith('.'):
+            return _module_of(rel, depth)
+        head = name.split('.')[0]
+        if head in top_level:
+            return _module_of('/'.join(name.split('.')[:depth]) + '/x', depth)
+    return None
+
+
+def _external_name(name, language):
+    if language == 'Python':
+        return None if name.startswith('.') else name.split('.')[0]
+    if language in ('JavaScript', 'TypeScript', 'Vue', 'Svelte'):
+        if name.startswith(('.', '/')):
+            return None
+        parts = name.split('/')
+        return '/'.join(parts[:2]) if name.startswith('@') else parts[0]
+    return name.split('::')[0] if language == 'Rust' else name
+
+
+def build_report(files, module_depth=1):
+    """Aggregate per-file facts into the scan report"""
+    languages = {}
+    modules = {}
+    entry_points = []
+    manifests = {}
+    external = Counter()
+    top_level = {rel.split('/')[0] for rel in files if '/' in rel} | \
+        {Path(rel).stem for rel in files if '/' not in rel and rel.endswith('.py')}
+
+    for rel in sorted(files):
+        facts = files[rel]
+        if 'manifest' in facts:
+            manifests[rel] = facts['manifest']
+        language = facts.get('language')
+        if not language:
+            continue
+        stats = languages.setdefault(language, {'files': 0, 'lines': 0})
+        stats['files'] += 1
+        stats['lines'] += facts['lines']
+
+        module = _module_of(rel, module_depth)
+        info = modules.setdefault(module, {'files': 0, 'lines': 0, 'tests': 0, 'languages': Counter(),
+                                           'depends_on': set()})
+        info['files'] += 1
+        info['lines'] += facts['lines']
+        info['tests'] += facts.get('test', False)
+        info['languages'][language] += facts['lines']
+        if facts.get('entry') and not facts.get('test'):
+            entry_points.append(rel)
+        for name in facts.get('imports', []):
+            target = _resolve_import(rel, name, language, module_depth, top_level)
+            if target is not None:
+                if target != module:
+                    info['depends_on'].add(target)
+            elif not facts.get('test'):
+                ext = _external_name(name, language)
+                if ext:
+                    external[ext] += 1
+
+    frameworks = {}
+    for rel, manifest in manifests.items():
+        for dep, version in manifest['dependencies'].items():
+            if dep in FRAMEWORKS and FRAMEWORKS[dep][1] not in frameworks:
+                category, display = FRAMEWORKS[dep]
+                frameworks[display] = {'name': display, 'category': category,
+                                       'version': str(version or ''), 'source': rel}
+        for entry in manifest['entry_points']:
+            entry_rel = os.path.normpath(os.path.join(os.path.dirname(rel), entry)).replace(os.sep, '/')
+            if entry_rel in files and entry_rel not in entry_points:
+                entry_points.append(entry_rel)
+    # Frameworks that are imported but not declared in a scanned manifest
+    for name in external:
+        key = name.lower()
+        if key in FRAMEWORKS and FRAMEWORKS[key][1] not in frameworks:
+            category, display = FRAMEWORKS[key]
+            frameworks[display] = {'name': display, 'category': category, 'version': '', 'source': 'imports'}
+
+    total_lines = sum(s['lines'] for s in languages.values())
+    return {
+        'files': len(files),
+        'source_files': sum(s['files'] for s in languages.values()),
+        'lines': total_lines,
+        'languages': dict(sorted(languages.items(), key=lambda kv: -kv[1]['lines'])),
+        'frameworks': sorted(frameworks.values(), key=lambda f: (f['category'], f['name'])),
+        'manifests': sorted(manifests),
+        'entry_points': sorted(entry_points),
+        'modules': {
+            name: {'files': m['files'], 'lines': m['lines'], 'tests': m['tests'],
+                   'language': m['languages'].most_common(1)[0][0],
+                   'depends_on': sorted(m['depends_on'])}
+            for name, m in sorted(modules.items())
+        },
+        'external_imports': dict(external.most_common(30)),
+    }
+
+
+def render_tech_stack(report):
+    """Markdown for the 'Actual Tech Stack' section"""
+    lines = ['## Actual Tech Stack', '', '| Category | Technology | Version | Notes |',
+             '| -------- | ---------- | ------- | ----- |']
+    for language, stats in report['languages'].items():
+        lines.append(f"| Language | {language} | | {stats['files']} files, {stats['lines']} lines |")
+    for fw in report['frameworks']:
+        lines.append(f"| {fw['category']} | {fw['name']} | {fw['version']} | from {fw['source']} |")
+    return '\n'.join(lines) + '\n'
+
+
+def render_source_tree(report):
+    """Markdown for the 'Source Tree and Module Organization' section"""
+    lines = ['## Source Tree and Module Organization', '', '### Entry Points', '']
+    lines += [f"- `{e}`" for e in report['entry_points']] or ['- none detected']
+    lines += ['', '### Modules', '', '| Module | Language | Files | Lines | Tests | Depends on |',
+              '| ------ | -------- | ----- | ----- | ----- | ---------- |']
+    for name, m in report['modules'].items():
+        depends = ', '.join(f'`{d}`' for d in m['depends_on'])
+        lines.append(f"| `{name}` | {m['language']} | {m['files']} | {m['lines']} | {m['tests']} | {depends} |")
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Scan a codebase for document-project')
+    parser.add_argument('root', nargs='?', default='.')
+    parser.add_argument('--cache', help=f'fact cache (default: <root>/{DEFAULT_CACHE})')
+    parser.add_argument('--jobs', type=int, default=None)
+    parser.add_argument('--depth', type=int, default=1, help='directory depth that defines a module')
+    parser.add_argument('--json', action='store_true', help='print the full report as JSON')
+    args = parser.parse_args(argv)
+
+    scanner = CodebaseScanner(args.root, args.cache, args.jobs)
+    changed, removed = scanner.update()
+    scanner.save()
+    report = scanner.report(args.depth)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(render_tech_stack(report))
+        print(render_source_tree(report))
+    print(f"✅ Scanned {report['files']} files ({len(changed)} changed, {len(removed)} removed)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
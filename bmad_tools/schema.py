@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Declarative schemas for agents, templates, workflows and teams
+
+Each artifact kind is described by a nested schema literal below. Schemas are
+compiled once into plain validator closures that walk the composed YAML node
+tree, so every problem is reported with its file, YAML path and line number,
+and validation carries on past the first error. `validate_tree` checks a whole
+.bmad-core folder in one pass; installers can call `validate_file` or
+`validate_text` directly.
+"""
+
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import yaml
+
+from bmad_tools.core import BMAD_CORE, IMPLICIT_ARTIFACTS, SafeLoader, read_text
+from bmad_tools.tracing import span, traced
+
+# Schema literals
+#
+#   {'type': 'map', 'required': {key: schema}, 'optional': {key: schema}}
+#   {'type': 'list', 'items': schema, 'min': n}
+#   {'type': 'str' | 'number' | 'bool' | 'scalar' | 'any'}
+#   {'ref': name}          a named schema from DEFINITIONS (allows recursion)
+#   {'any_of': [schema]}   the first alternative whose type matches is used
+#
+# Map keys that are not listed are allowed; BMad files carry many free-form keys.
+
+STR = {'type': 'str'}
+SCALAR = {'type': 'scalar'}
+ANY = {'type': 'any'}
+STR_LIST = {'type': 'list', 'items': STR}
+STR_OR_LIST = {'any_of': [STR, STR_LIST]}
+
+AGENT = {'type': 'map', 'required': {
+    'agent': {'type': 'map', 'required': {'id': STR, 'name': STR, 'title': STR},
+              'optional': {'icon': STR, 'whenToUse': STR, 'customization': ANY}},
+    'persona': {'type': 'map', 'required': {'role': STR},
+                'optional': {'style': STR, 'identity': STR, 'focus': STR,
+                             'core_principles': {'any_of': [STR_LIST, STR]}}},
+    'commands': {'any_of': [{'type': 'list', 'items': {'any_of': [STR, {'type': 'map'}]}, 'min': 1},
+                            {'type': 'map'}]},
+    'dependencies': {'type': 'map', 'optional': {
+        kind: STR_LIST for kind in ('data', 'utils', 'checklists', 'templates', 'tasks', 'workflows')}},
+}, 'optional': {
+    'activation-instructions': {'any_of': [{'type': 'list'}, STR]},
+}}
+
+SECTION = {'type': 'map', 'required': {'id': STR}, 'optional': {
+    'title': STR,
+    'instruction': STR,
+    'elicit': {'type': 'bool'},
+    'repeatable': {'type': 'bool'},
+    'type': STR,
+    'template': STR,
+    'owner': STR,
+    'editors': STR_LIST,
+    'sections': {'type': 'list', 'items': {'ref': 'section'}},
+}}
+
+TEMPLATE = {'type': 'map', 'required': {
+    'template': {'type': 'map', 'required': {
+        'id': STR,
+        'name': STR,
+        'version': SCALAR,
+        'output': {'type': 'map', 'required': {'format': STR},
+                   'optional': {'filename': STR, 'title': STR}},
+    }},
+}, 'optional': {
+    'workflow': {'type': 'map', 'required': {'mode': STR}, 'optional': {'elicitation': STR}},
+    'sections': {'type': 'list', 'items': {'ref': 'section'}, 'min': 1},
+}}
+
+WORKFLOW_STEP = {'type': 'map', 'optional': {
+    'agent': STR,
+    'creates': STR,
+    'requires': STR_OR_LIST,
+    'optional': {'type': 'bool'},
+    'optional_steps': STR_LIST,
+    'notes': STR,
+    'condition': STR,
+}}
+
+WORKFLOW = {'type': 'map', 'required': {
+    'workflow': {'type': 'map', 'required': {
+        'id': STR,
+        'name': STR,
+        'sequence': {'type': 'list', 'items': WORKFLOW_STEP, 'min': 1},
+    }, 'optional': {
+        'description': STR,
+        'type': STR,
+        'project_types': STR_LIST,
+    }},
+}}
+
+TEAM = {'type': 'map', 'required': {
+    'bundle': {'type': 'map', 'required': {'name': STR}, 'optional': {'icon': STR, 'description': STR}},
+    'agents': {'type': 'list', 'items': STR, 'min': 1},
+}, 'optional': {
+    'workflows': {'any_of': [STR_LIST, {'type': 'null'}]},
+}}
+
+DEFINITIONS = {'section': SECTION}
+
+# kind: (folder, glob, schema)
+KINDS = {
+    'agent': ('agents', '*.md', AGENT),
+    'template': ('templates', '*.yaml', TEMPLATE),
+    'workflow': ('workflows', '*.yaml', WORKFLOW),
+    'team': ('agent-teams', '*.yaml', TEAM),
+}
+
+SCALAR_TAGS = {
+    'str': {'tag:yaml.org,2002:str'},
+    'number': {'tag:yaml.org,2002:int', 'tag:yaml.org,2002:float'},
+    'bool': {'tag:yaml.org,2002:bool'},
+    'null': {'tag:yaml.org,2002:null'},
+}
+NODE_TYPES = {'map': yaml.MappingNode, 'list': yaml.SequenceNode}
+
+
+class SchemaError:
+    """One validation problem"""
+
+    __slots__ = ('file', 'path', 'line', 'message')
+
+    def __init__(self, file, path, line, message):
+        self.file = file
+        self.path = path
+        self.line = line
+        self.message = message
+
+    def as_dict(self):
+        return {'file': self.file, 'path': self.path, 'line': self.line, 'message': self.message}
+
+    def __str__(self):
+        return f"{self.file}:{self.line}: {self.path or '<root>'}: {self.message}"
+
+    def __repr__(self):
+        return f"SchemaError({self})"
+
+
+def _join(path, key):
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else str(key)
+
+
+def _type_name(node):
+    if isinstance(node, yaml.MappingNode):
+        return 'map'
+    if isinstance(node, yaml.SequenceNode):
+        return 'list'
+    for name, tags in SCALAR_TAGS.items():
+        if node.tag in tags:
+            return name
+    return 'scalar'
+
+
+def _type_matches(expected, node):
+    if expected == 'any':
+        return True
+    if expected in NODE_TYPES:
+        return isinstance(node, NODE_TYPES[expected])
+    if not isinstance(node, yaml.ScalarNode):
+        return False
+    if expected == 'scalar':
+        return node.tag not in SCALAR_TAGS['null']
+    return node.tag in SCALAR_TAGS[expected]
+
+
+def compile_schema(schema, definitions=None, _compiled=None):
+    """Turn a schema literal into validator(node, path, errors) where errors collects (path, node, message)"""
+    definitions = DEFINITIONS if definitions is None else definitions
+    compiled = {} if _compiled is None else _compiled
+
+    if 'ref' in schema:
+        name = schema['ref']
+        if name not in compiled:
+            compiled[name] = None
+            compiled[name] = compile_schema(definitions[name], definitions, compiled)
+
+        def validate_ref(node, path, errors):
+            compiled[name](node, path, errors)
+        return validate_ref
+
+    if 'any_of' in schema:
+        options = [(alt.get('type'), compile_schema(alt, definitions, compiled)) for alt in schema['any_of']]
+        expected = ' or '.join(alt.get('type', alt.get('ref', '?')) for alt in schema['any_of'])
+
+        def validate_any(node, path, errors):
+            for type_name, validator in options:
+                if type_name is None or _type_matches(type_name, node):
+                    validator(node, path, errors)
+                    return
+            errors.append((path, node, f"expected {expected}, got {_type_name(node)}"))
+        return validate_any
+
+    expected = schema.get('type', 'any')
+
+    if expected == 'map':
+        required = [(key, compile_schema(s, definitions, compiled)) for key, s in schema.get('required', {}).items()]
+        optional = {key: compile_schema(s, definitions, compiled) for key, s in schema.get('optional', {}).items()}
+        checks = dict(required, **optional)
+        required_keys = [key for key, _ in required]
+
+        def validate_map(node, path, errors):
+            if not isinstance(node, yaml.MappingNode):
+                errors.append((path, node, f"expected map, got {_type_name(node)}"))
+                return
+            seen = set()
+            for key_node, value_node in node.value:
+                key = key_node.value
+                if key in seen:
+                    errors.append((_join(path, key), key_node, 'duplicate key'))
+                seen.add(key)
+                check = checks.get(key)
+                if check is not None:
+                    check(value_node, _join(path, key), errors)
+            for key in required_keys:
+                if key not in seen:
+                    errors.append((_join(path, key), node, 'required key missing'))
+        return validate_map
+
+    if expected == 'list':
+        item_check = compile_schema(schema['items'], definitions, compiled) if 'items' in schema else None
+        minimum = schema.get('min', 0)
+
+        def validate_list(node, path, errors):
+            if not isinstance(node, yaml.SequenceNode):
+                errors.append((path, node, f"expected list, got {_type_name(node)}"))
+                return
+            if len(node.value) < minimum:
+                errors.append((path, node, f"expected at least {minimum} item(s)"))
+            if item_check is not None:
+                for i, item in enumerate(node.value):
+                    item_check(item, _join(path, i), errors)
+        return validate_list
+
+    def validate_scalar(node, path, errors):
+        if not _type_matches(expected, node):
+            errors.append((path, node, f"expected {expected}, got {_type_name(node)}"))
+    return validate_scalar
+
+
+def _mapping_get(node, key):
+    if isinstance(node, yaml.MappingNode):
+        for key_node, value_node in node.value:
+            if key_node.value == key:
+                return value_node
+    return None
+
+
+def _scalars(node):
+    if isinstance(node, yaml.ScalarNode):
+        return [node.value]
+    if isinstance(node, yaml.SequenceNode):
+        return [n.value for n in node.value if isinstance(n, yaml.ScalarNode)]
+    return []
+
+
+def check_template(root, errors):
+    """Templates with sections must declare how they are driven (workflow.mode)"""
+    if _mapping_get(root, 'sections') is not None and _mapping_get(root, 'workflow') is None:
+        errors.append(('workflow', root, 'required key missing (template has sections)'))
+
+
+def check_workflow(root, errors):
+    """Every required file artifact of a non-optional step is created by an earlier step
+
+    Names without an extension (all_artifacts_in_project, existing_ui_analysis)
+    describe project state rather than a produced file and are not checked.
+    """
+    sequence = _mapping_get(_mapping_get(root, 'workflow'), 'sequence')
+    if not isinstance(sequence, yaml.SequenceNode):
+        return
+    created = set()
+    for i, step in enumerate(sequence.value):
+        if _mapping_get(step, 'agent') is None:
+            continue
+        optional = _mapping_get(step, 'optional')
+        if not (optional is not None and optional.value in ('true', 'True', 'yes')):
+            requires = _mapping_get(step, 'requires')
+            for name in _scalars(requires):
+                if '.' in name and name not in IMPLICIT_ARTIFACTS and name not in created:
+                    errors.append((f"workflow.sequence[{i}].requires", requires,
+                                   f"'{name}' is not created by an earlier step"))
+        created.update(_scalars(_mapping_get(step, 'creates')))
+
+
+CHECKS = {'template': [check_template], 'workflow': [check_workflow]}
+VALIDATORS = {kind: compile_schema(schema) for kind, (_, _, schema) in KINDS.items()}
+
+
+def _yaml_source(kind, text):
+    """(yaml text, line offset) for a file of the given kind"""
+    if kind != 'agent':
+        return text, 0
+    start = text.find('```yaml')
+    if start == -1:
+        return None, 0
+    end = text.find('```', start + 6)
+    if end == -1:
+        return None, 0
+    return text[start + 7:end], text.count('\n', 0, start + 7)
+
+
+@traced('schema.validate', 'rule', lambda kind, text, file='<string>': {'file': file})
+def validate_text(kind, text, file='<string>'):
+    """Validate the content of one artifact; returns a list of SchemaError"""
+    source, offset = _yaml_source(kind, text)
+    if source is None:
+        return [SchemaError(file, '', 1, 'no ```yaml block found')]
+    try:
+        with span('schema.parse', 'yaml'):
+            root = yaml.compose(source, Loader=SafeLoader)
+    except yaml.YAMLError as e:
+        mark = getattr(e, 'problem_mark', None)
+        line = offset + mark.line + 1 if mark else offset + 1
+        return [SchemaError(file, '', line, f"invalid YAML: {getattr(e, 'problem', None) or e}")]
+    if root is None:
+        return [SchemaError(file, '', offset + 1, 'document is empty')]
+
+    found = []
+    with span('schema.rules', 'rule', kind=kind):
+        VALIDATORS[kind](root, '', found)
+        for check in CHECKS.get(kind, []):
+            check(root, found)
+    return [SchemaError(file, path, offset + node.start_mark.line + 1, message) for path, node, message in found]
+
+
+def kind_of(path, base_path=BMAD_CORE):
+    """Artifact kind of a file inside a .bmad-core tree, or None"""
+    path = Path(path)
+    try:
+        folder = path.relative_to(base_path).parts[0]
+    except (ValueError, IndexError):
+        folder = path.parent.name
+    for kind, (kind_folder, pattern, _) in KINDS.items():
+        if folder == kind_folder and path.match(pattern):
+            return kind
+    return None
+
+
+def validate_file(path, kind=None, base_path=BMAD_CORE):
+    """Validate one file; kind is inferred from its folder when not given"""
+    kind = kind or kind_of(path, base_path)
+    if kind is None:
+        raise ValueError(f"{path}: not an agent, template, workflow or team file")
+    return validate_text(kind, read_text(path), str(path))
+
+
+def _validate_batch(batch):
+    return [e.as_dict() for kind, path in batch for e in validate_text(kind, read_text(path), path)]
+
+
+def tree_files(base_path=BMAD_CORE):
+    """(kind, path) for every schema-checked file in the tree"""
+    files = []
+    for kind, (folder, pattern, _) in KINDS.items():
+        files.extend((kind, str(p)) for p in sorted((Path(base_path) / folder).glob(pattern)))
+    return files
+
+
+@traced('schema.validate_tree', 'rule')
+def validate_tree(base_path=BMAD_CORE, jobs=1):
+    """Validate every agent, template, workflow and team in one pass; returns a list of SchemaError
+
+    jobs > 1 spreads large trees over worker processes.
+    """
+    files = tree_files(base_path)
+    if jobs <= 1 or len(files) < 1000:
+        errors = []
+        for kind, path in files:
+            errors.extend(validate_text(kind, read_text(path), path))
+        return errors
+    size = max(16, len(files) // (jobs * 4))
+    batches = [files[i:i + size] for i in range(0, len(files), size)]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return [SchemaError(**e) for result in pool.map(_validate_batch, batches) for e in result]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Validate .bmad-core agents, templates, workflows and teams')
+    parser.add_argument('files', nargs='*', help='specific files (default: the whole tree)')
+    parser.add_argument('--base-path', default=str(BMAD_CORE))
+    parser.add_argument('--jobs', type=int, default=1, help='worker processes for very large trees')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.files:
+        errors = [e for f in args.files for e in validate_file(f, base_path=args.base_path)]
+        checked = len(args.files)
+    else:
+        errors = validate_tree(args.base_path, args.jobs)
+        checked = len(tree_files(args.base_path))
+
+    if args.json:
+        print(json.dumps([e.as_dict() for e in errors], indent=2, ensure_ascii=False))
+    else:
+        for error in errors:
+            print(f"❌ {error}")
+        if not errors:
+            print(f"✅ {checked} files valid")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Section-level concurrent editing of story files
+
+A story file is split into the sections of templates/story-tmpl.yaml (level-2
+headings, plus deeper headings whose title is a template section). Each
+section has a version: a hash of its content. Agents read a section, remember
+its version and submit edits against it:
+
+- An edit applies only if the section still has the version the agent saw.
+  Otherwise the whole batch is rejected with EditConflict (optimistic
+  concurrency), unless the section already holds exactly the new content.
+- Appends (Change Log rows, completion notes, file lists) never conflict.
+- Everything else in the file is re-read under a lock and written back as it
+  is on disk, so dev and QA editing different sections at the same time both
+  land instead of the last writer winning.
+- The template's `editors` decide who may touch a section
+  (dev -> dev-agent, qa -> qa-agent, sm -> scrum-master).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are not serialized
+    fcntl = None
+
+from bmad_tools.core import BMAD_CORE, load_yaml, read_text
+
+DEFAULT_TEMPLATE = BMAD_CORE / 'templates' / 'story-tmpl.yaml'
+ROLE_ALIASES = {'dev': 'dev-agent', 'qa': 'qa-agent', 'sm': 'scrum-master'}
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+FENCE_RE = re.compile(r'^\s*(```|~~~)')
+PREAMBLE = ''
+
+
+class EditConflict(Exception):
+    """One or more sections changed since the editing agent read them"""
+
+    def __init__(self, path, conflicts):
+        self.path = str(path)
+        self.conflicts = conflicts
+        names = ', '.join(c['section'] for c in conflicts)
+        super().__init__(f"{self.path}: sections changed since they were read: {names}")
+
+
+def section_version(body):
+    """Version of a section's content, ignoring surrounding blank lines"""
+    return hashlib.md5(body.strip().encode('utf-8')).hexdigest()[:16]
+
+
+def slugify(title):
+    return re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
+
+
+def template_rules(template_path=DEFAULT_TEMPLATE):
+    """{section id: {title, level, order, parent, owner, editors}} from the story template"""
+    rules = {}
+
+    def walk(sections, level, parent):
+        for section in sections or []:
+            rules[section['id']] = {'title': section.get('title', section['id']), 'level': level,
+                                    'order': len(rules), 'parent': parent, 'owner': section.get('owner'),
+                                    'editors': list(section.get('editors') or [])}
+            walk(section.get('sections'), level + 1, section['id'])
+
+    walk(load_yaml(template_path).get('sections'), 2, None)
+    return rules
+
+
+def parse_sections(text, rules):
+    """[{id, title, level, heading, body}] in document order; the first entry is the preamble"""
+    by_title = {r['title'].lower(): sid for sid, r in rules.items()}
+    sections = [{'id': PREAMBLE, 'title': '', 'level': 1, 'heading': '', 'body': ''}]
+    in_fence = False
+    for line in text.splitlines(keepends=True):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_RE.match(line.rstrip('\n'))
+        if match:
+            level, title = len(match.group(1)), match.group(2)
+            known = by_title.get(title.lower())
+            if level == 2 or (level > 2 and known):
+                sections.append({'id': known or slugify(title), 'title': title, 'level': level,
+                                 'heading': line if line.endswith('\n') else line + '\n', 'body': ''})
+                continue
+        sections[-1]['body'] += line
+    return sections
+
+
+def render_sections(sections):
+    text = ''.join(s['heading'] + s['body'] for s in sections)
+    return text.rstrip('\n') + '\n'
+
+
+def _format_body(content):
+    content = content.strip('\n')
+    return f'\n{content}\n\n' if content.strip() else '\n'
+
+
+def _append_body(body, content):
+    existing = body.rstrip('\n')
+    addition = content.strip('\n')
+    return _format_body(f'{existing}\n{addition}' if existing.strip() else addition)
+
+
+class StoryFile:
+    """A story file edited section by section with optimistic concurrency"""
+
+    def __init__(self, path, template_path=DEFAULT_TEMPLATE):
+        self.path = Path(path)
+        self.rules = template_rules(template_path)
+        self.lock_path = self.path.with_name(f'.{self.path.name}.lock')
+
+    def _read(self):
+        return parse_sections(read_text(self.path) if self.path.exists() else '', self.rules)
+
+    def sections(self):
+        """{id: {title, version, content, owner, editors}} for every section in the file"""
+        found = {}
+        for s in self._read()[1:]:
+            rule = self.rules.get(s['id'], {})
+            found[s['id']] = {'title': s['title'], 'version': section_version(s['body']),
+                              'content': s['body'].strip('\n'), 'owner': rule.get('owner'),
+                              'editors': rule.get('editors', [])}
+        return found
+
+    def versions(self):
+        return {sid: s['version'] for sid, s in self.sections().items()}
+
+    def read(self, section):
+        """(content, version) of one section; ('', None) if it is not in the file yet"""
+        s = self.sections().get(section)
+        return (s['content'], s['version']) if s else ('', None)
+
+    def can_edit(self, agent, section):
+        if agent is None:
+            return True
+        role = ROLE_ALIASES.get(agent, agent)
+        return role in self.rules.get(section, {}).get('editors', [])
+
+    @contextmanager
+    def _locked(self):
+        with open(self.lock_path, 'a') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def apply(self, edits, agent=None):
+        """Apply a batch of edits atomically; returns the new version of each edited section
+
+        Each edit is {'section', 'content', 'base'} (replace the section if its
+        version is still base; base None means the section must not exist yet)
+        or {'section', 'append'}. agent None skips the editor check.
+        """
+        denied = sorted({e['section'] for e in edits if not self.can_edit(agent, e['section'])})
+        if denied:
+            raise PermissionError(f"{agent} may not edit {', '.join(denied)} in {self.path}")
+
+        with self._locked():
+            sections = self._read()
+            conflicts = []
+            for edit in edits:
+                current = self._find(sections, edit['section'])
+                if 'append' in edit:
+                    if current is None:
+                        current = self._insert(sections, edit['section'])
+                    current['body'] = _append_body(current['body'], edit['append'])
+                    continue
+                actual = section_version(current['body']) if current else None
+                if actual != edit.get('base'):
+                    if current is not None and current['body'].strip() == edit['content'].strip():
+                        continue
+                    conflicts.append({'section': edit['section'], 'expected': edit.get('base'), 'actual': actual})
+                    continue
+                if current is None:
+                    current = self._insert(sections, edit['section'])
+                current['body'] = _format_body(edit['content'])
+            if conflicts:
+                raise EditConflict(self.path, conflicts)
+            self._write(render_sections(sections))
+        return {e['section']: section_version(self._find(sections, e['section'])['body']) for e in edits}
+
+    def edit(self, section, content, base, agent=None):
+        """Replace one section; returns its new version"""
+        return self.apply([{'section': section, 'content': content, 'base': base}], agent)[section]
+
+    def append(self, section, content, agent=None):
+        """Append to one section; returns its new version"""
+        return self.apply([{'section': section, 'append': content}], agent)[section]
+
+    @staticmethod
+    def _find(sections, section_id):
+        return next((s for s in sections[1:] if s['id'] == section_id), None)
+
+    def _insert(self, sections, section_id):
+        """Add an empty section at its template position, creating missing parents"""
+        rule = self.rules.get(section_id)
+        if rule is None:
+            raise ValueError(f"{section_id} is not a story template section")
+        if rule['parent'] and self._find(sections, rule['parent']) is None:
+            self._insert(sections, rule['parent'])
+        new = {'id': section_id, 'title': rule['title'], 'level': rule['level'],
+               'heading': f"{'#' * rule['level']} {rule['title']}\n", 'body': '\n'}
+        position = len(sections)
+        for i, s in enumerate(sections[1:], 1):
+            other = self.rules.get(s['id'])
+            if other and other['order'] > rule['order']:
+                position = i
+                break
+        previous = sections[position - 1]
+        if previous['body'].strip():
+            previous['body'] = previous['body'].rstrip('\n') + '\n\n'
+        elif previous['heading']:
+            previous['body'] = '\n'
+        sections.insert(position, new)
+        return new
+
+    def _write(self, text):
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f'.{self.path.name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            # mkstemp creates the file 0600; keep the story's own permissions
+            shutil.copymode(self.path, tmp)
+            os.replace(tmp, self.path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Read and edit story file sections with conflict detection')
+    parser.add_argument('command', choices=['show', 'get', 'set', 'append'])
+    parser.add_argument('story', help='story markdown file')
+    parser.add_argument('section', nargs='?', help='template section id, e.g. file-list')
+    parser.add_argument('--agent', help='dev, qa, sm or a template role')
+    parser.add_argument('--base', help='version the edit is based on (from show/get)')
+    parser.add_argument('--text', help='new content (default: stdin)')
+    parser.add_argument('--template', default=str(DEFAULT_TEMPLATE))
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    story = StoryFile(args.story, args.template)
+    if args.command == 'show':
+        sections = story.sections()
+        if args.json:
+            print(json.dumps({k: {f: v[f] for f in ('title', 'version', 'editors')} for k, v in sections.items()},
+                             indent=2))
+        else:
+            for sid, s in sections.items():
+                print(f"{s['version']}  {sid:<24} {', '.join(s['editors']) or '-'}")
+        return 0
+    if not args.section:
+        parser.error(f'{args.command} needs a section')
+    if args.command == 'get':
+        content, version = story.read(args.section)
+        print(json.dumps({'section': args.section, 'version': version, 'content': content}, indent=2)
+              if args.json else f"version: {version}\n\n{content}")
+        return 0
+
+    content = args.text if args.text is not None else sys.stdin.read()
+    try:
+        if args.command == 'append':
+            version = story.append(args.section, content, args.agent)
+        else:
+            version = story.edit(args.section, content, args.base, args.agent)
+    except (EditConflict, PermissionError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ {args.section} updated (version {version})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Persisted requirements-to-test traceability index (trace-requirements.md / qa-gate.md)
+
+The index links three kinds of artifact:
+
+- PRD requirements: `FR<n>` / `NFR<n>` bullets in the PRD shards
+- story acceptance criteria: the numbered list under `## Acceptance Criteria`
+  of every story in devStoryLocation, plus the FR/NFR ids each story mentions
+- test cases: test files that reference `<epic>.<story>-AC<n>`, test-design
+  scenario ids (`1.3-UNIT-001`) or requirement ids
+
+It lives in a SQLite database and is updated per file: only files whose
+content hash changed are re-parsed. Coverage gaps and the `trace:` block of a
+gate file can then be answered for a whole epic with a single query.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+from bmad_tools.core import BMAD_CORE, load_core_config, read_text
+
+DEFAULT_PATH = Path('.ai') / 'trace-index.sqlite'
+
+TEST_GLOBS = ['**/*test*.*', '**/*spec*.*']
+TEST_SUFFIXES = {'.py', '.ts', '.tsx', '.js', '.jsx', '.go', '.java', '.kt', '.rb', '.cs', '.rs', '.php', '.swift'}
+
+REQUIREMENT_RE = re.compile(r'^\s*(?:[-*]\s*)?["\']?\*{0,2}((?:N?FR)\d+)\*{0,2}\s*:\s*(.+?)["\']?\s*$')
+REQUIREMENT_REF_RE = re.compile(r'\b(N?FR\d+)\b')
+STORY_FILE_RE = re.compile(r'^(\d+)\.(\d+)')
+STORY_TITLE_RE = re.compile(r'^#\s*Story\s+(\d+)\.(\d+)\s*:?\s*(.*)$', re.MULTILINE)
+AC_ITEM_RE = re.compile(r'^\s*(?:(\d+)[.)]|[-*]\s*(?:\[[ xX]\]\s*)?(?:\*\*)?AC\s*(\d+)(?:\*\*)?\s*:?)\s*(.+)$')
+TEST_AC_RE = re.compile(r'\b(\d+)\.(\d+)[-_: ]*AC[-_ ]?(\d+)\b', re.IGNORECASE)
+SCENARIO_RE = re.compile(r'\b(\d+)\.(\d+)-(UNIT|INT|E2E)-(\d{3})\b')
+TEST_NAME_RE = re.compile(
+    r'^\s*(?:async\s+)?(?:def\s+(test\w*)|(?:it|test|describe)\s*\(\s*[\'"`](.+?)[\'"`]|func\s+(Test\w+))')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, kind TEXT NOT NULL, hash TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS requirements (id TEXT NOT NULL, text TEXT NOT NULL, file TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS epic_requirements (epic INTEGER NOT NULL, requirement TEXT NOT NULL, file TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS stories (id TEXT NOT NULL, epic INTEGER NOT NULL, title TEXT, file TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS criteria (story TEXT NOT NULL, ac TEXT NOT NULL, text TEXT NOT NULL, file TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS story_requirements (story TEXT NOT NULL, requirement TEXT NOT NULL, file TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS tests (
+    file TEXT NOT NULL, test_case TEXT NOT NULL, level TEXT NOT NULL,
+    story TEXT, ac TEXT, requirement TEXT
+);
+CREATE INDEX IF NOT EXISTS tests_story ON tests (story, ac);
+CREATE INDEX IF NOT EXISTS tests_requirement ON tests (requirement);
+CREATE INDEX IF NOT EXISTS stories_epic ON stories (epic);
+"""
+
+OWNED_TABLES = ['requirements', 'epic_requirements', 'stories', 'criteria', 'story_requirements', 'tests']
+
+
+def _digest(text):
+    return hashlib.md5(text.encode('utf-8')).hexdigest()[:16]
+
+
+def test_level(path, scenario_level=None):
+    """unit, integration or e2e from a scenario id or the test file path"""
+    if scenario_level:
+        return {'UNIT': 'unit', 'INT': 'integration', 'E2E': 'e2e'}[scenario_level]
+    lowered = str(path).lower()
+    if 'e2e' in lowered or 'end-to-end' in lowered:
+        return 'e2e'
+    if 'integration' in lowered or '/int/' in lowered:
+        return 'integration'
+    return 'unit'
+
+
+def parse_prd(content):
+    """(requirements, epic number or None, referenced requirement ids) from one PRD shard"""
+    requirements = []
+    for line in content.split('\n'):
+        match = REQUIREMENT_RE.match(line)
+        if match:
+            requirements.append((match.group(1), match.group(2).strip()))
+    epic = re.search(r'^#+\s*Epic\s+(\d+)', content, re.MULTILINE | re.IGNORECASE)
+    refs = sorted(set(REQUIREMENT_REF_RE.findall(content)))
+    return requirements, int(epic.group(1)) if epic else None, refs
+
+
+def parse_story(path, content):
+    """(story id, epic, title, [(ac, text)], [requirement ids]) or None if not a story"""
+    title_match = STORY_TITLE_RE.search(content)
+    name_match = STORY_FILE_RE.match(Path(path).name)
+    if title_match:
+        epic, number, title = title_match.group(1), title_match.group(2), title_match.group(3).strip()
+    elif name_match:
+        epic, number, title = name_match.group(1), name_match.group(2), ''
+    else:
+        return None
+
+    criteria = []
+    in_section = False
+    for line in content.split('\n'):
+        if line.startswith('## '):
+            in_section = line[3:].strip().lower().startswith('acceptance criteria')
+            continue
+        if in_section and not line.startswith((' ', '\t')):
+            match = AC_ITEM_RE.match(line)
+            if match:
+                criteria.append((f'AC{match.group(1) or match.group(2)}', match.group(3).strip()))
+    refs = sorted(set(REQUIREMENT_REF_RE.findall(content)))
+    return f'{epic}.{number}', int(epic), title, criteria, refs
+
+
+def parse_tests(path, content):
+    """Rows (test_case, level, story, ac, requirement) for every reference in a test file"""
+    rows = []
+    current = Path(path).name
+    for line in content.split('\n'):
+        name = TEST_NAME_RE.match(line)
+        if name:
+            current = next(g for g in name.groups() if g)
+        for epic, story, ac in TEST_AC_RE.findall(line):
+            rows.append((current, test_level(path), f'{epic}.{story}', f'AC{int(ac)}', None))
+        for epic, story, level, _ in SCENARIO_RE.findall(line):
+            rows.append((current, test_level(path, level), f'{epic}.{story}', None, None))
+        for requirement in REQUIREMENT_REF_RE.findall(line):
+            rows.append((current, test_level(path), None, None, requirement))
+    return sorted(set(rows), key=lambda r: tuple(str(v) for v in r))
+
+
+class TraceIndex:
+    """SQLite-backed traceability index with per-file incremental updates"""
+
+    def __init__(self, path=DEFAULT_PATH, project_root='.'):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.project_root = Path(project_root)
+        self._db = sqlite3.connect(str(self.path), timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _sources(self, prd_dirs, story_dirs, test_dirs):
+        found = {}
+        for folder in prd_dirs:
+            for path in sorted((self.project_root / folder).rglob('*.md')):
+                found[path] = 'prd'
+        for folder in story_dirs:
+            for path in sorted((self.project_root / folder).glob('*.md')):
+                found[path] = 'story'
+        for folder in test_dirs:
+            root = self.project_root / folder
+            for pattern in TEST_GLOBS:
+                for path in root.glob(pattern):
+                    if path.is_file() and path.suffix in TEST_SUFFIXES and 'node_modules' not in path.parts:
+                        found.setdefault(path, 'test')
+        return found
+
+    def update(self, prd_dirs=(), story_dirs=(), test_dirs=()):
+        """Re-parse new or changed files and drop deleted ones; returns the changed paths"""
+        known = dict(self._db.execute('SELECT path, hash FROM files').fetchall())
+        sources = self._sources(prd_dirs, story_dirs, test_dirs)
+        changed = []
+        with self._db:
+            for path, kind in sorted(sources.items()):
+                rel = path.relative_to(self.project_root).as_posix()
+                try:
+                    content = read_text(path)
+                except UnicodeDecodeError:
+                    continue
+                digest = _digest(content)
+                if known.pop(rel, None) == digest:
+                    continue
+                self._forget(rel)
+                getattr(self, f'_index_{kind}')(rel, content)
+                self._db.execute('INSERT OR REPLACE INTO files (path, kind, hash) VALUES (?, ?, ?)',
+                                 (rel, kind, digest))
+                changed.append(rel)
+            for rel in known:
+                self._forget(rel)
+                self._db.execute('DELETE FROM files WHERE path = ?', (rel,))
+                changed.append(rel)
+        return changed
+
+    def update_from_config(self, base_path=BMAD_CORE, test_dirs=('tests', 'test', 'src')):
+        """Update using the PRD and story locations from core-config.yaml"""
+        config = load_core_config(base_path)
+        prd = config.get('prd') or {}
+        prd_dirs = [prd['prdShardedLocation']] if prd.get('prdShardedLocation') else []
+        story_dirs = [config.get('devStoryLocation', 'docs/stories')]
+        return self.update(prd_dirs, story_dirs, [d for d in test_dirs if (self.project_root / d).is_dir()])
+
+    def _forget(self, rel):
+        for table in OWNED_TABLES:
+            self._db.execute(f'DELETE FROM {table} WHERE file = ?', (rel,))
+
+    def _index_prd(self, rel, content):
+        requirements, epic, refs = parse_prd(content)
+        self._db.executemany('INSERT INTO requirements (id, text, file) VALUES (?, ?, ?)',
+                             [(rid, text, rel) for rid, text in requirements])
+        if epic is not None:
+            self._db.executemany('INSERT INTO epic_requirements (epic, requirement, file) VALUES (?, ?, ?)',
+                                 [(epic, r, rel) for r in refs])
+
+    def _index_story(self, rel, content):
+        parsed = parse_story(rel, content)
+        if parsed is None:
+            return
+        story_id, epic, title, criteria, refs = parsed
+        self._db.execute('INSERT INTO stories (id, epic, title, file) VALUES (?, ?, ?, ?)',
+                         (story_id, epic, title, rel))
+        self._db.executemany('INSERT INTO criteria (story, ac, text, file) VALUES (?, ?, ?, ?)',
+                             [(story_id, ac, text, rel) for ac, text in criteria])
+        self._db.executemany('INSERT INTO story_requirements (story, requirement, file) VALUES (?, ?, ?)',
+                             [(story_id, r, rel) for r in refs])
+
+    def _index_test(self, rel, content):
+        self._db.executemany(
+            'INSERT INTO tests (file, test_case, level, story, ac, requirement) VALUES (?, ?, ?, ?, ?, ?)',
+            [(rel,) + row for row in parse_tests(rel, content)])
+
+    def epic_coverage(self, epic):
+        """Per-story AC coverage and uncovered requirements for one epic, in one query pass"""
+        epic = int(epic)
+        rows = self._db.execute("""
+            SELECT c.story, c.ac, c.text, t.level, t.file, t.test_case
+            FROM stories s
+            JOIN criteria c ON c.story = s.id
+            LEFT JOIN tests t ON t.story = c.story AND t.ac = c.ac
+            WHERE s.epic = ?
+            ORDER BY c.story, c.ac, t.file, t.test_case
+        """, (epic,)).fetchall()
+
+        stories = {}
+        for story, ac, text, level, test_file, test_case in rows:
+            entry = stories.setdefault(story, {}).setdefault(ac, {'ac': ac, 'text': text, 'tests': []})
+            if test_file:
+                entry['tests'].append({'file': test_file, 'test_case': test_case, 'level': level})
+
+        result = {'epic': epic, 'stories': {}, 'uncovered_requirements': []}
+        for story, criteria in sorted(stories.items(), key=lambda kv: _story_sort_key(kv[0])):
+            for entry in criteria.values():
+                entry['coverage'] = classify(entry['tests'])
+            result['stories'][story] = sorted(criteria.values(), key=lambda e: int(e['ac'][2:]))
+
+        requirement_rows = self._db.execute("""
+            SELECT r.requirement,
+                   (SELECT COUNT(*) FROM tests t WHERE t.requirement = r.requirement) +
+                   (SELECT COUNT(*) FROM story_requirements sr
+                      JOIN tests t ON t.story = sr.story AND t.ac IS NOT NULL
+                      WHERE sr.requirement = r.requirement) AS hits
+            FROM (SELECT requirement FROM epic_requirements WHERE epic = ?
+                  UNION SELECT sr.requirement FROM story_requirements sr
+                        JOIN stories s ON s.id = sr.story WHERE s.epic = ?) r
+            ORDER BY r.requirement
+        """, (epic, epic)).fetchall()
+        result['uncovered_requirements'] = [r for r, hits in requirement_rows if not hits]
+        return result
+
+    def gate_trace(self, story):
+        """The `trace:` block of a qa-gate file for one story"""
+        epic = int(str(story).split('.')[0])
+        criteria = self.epic_coverage(epic)['stories'].get(str(story), [])
+        totals = {'requirements': len(criteria), 'full': 0, 'partial': 0, 'none': 0}
+        uncovered = []
+        for entry in criteria:
+            bucket = {'full': 'full', 'none': 'none'}.get(entry['coverage'], 'partial')
+            totals[bucket] += 1
+            if bucket == 'none':
+                uncovered.append({'ac': entry['ac'], 'reason': 'No test references this acceptance criterion'})
+        return {'trace': {'totals': totals, 'uncovered': uncovered}}
+
+
+def classify(tests):
+    """Coverage level per trace-requirements.md: full, unit, integration or none"""
+    levels = {t['level'] for t in tests}
+    if not levels:
+        return 'none'
+    has_unit = 'unit' in levels
+    has_higher = bool(levels & {'integration', 'e2e'})
+    if has_unit and has_higher:
+        return 'full'
+    return 'unit' if has_unit else 'integration'
+
+
+def _story_sort_key(story_id):
+    return tuple(int(p) for p in story_id.split('.'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Requirements-to-test traceability index')
+    parser.add_argument('command', choices=['update', 'coverage', 'gate'])
+    parser.add_argument('--epic', help='epic number for coverage')
+    parser.add_argument('--story', help='story id (e.g. 1.3) for gate')
+    parser.add_argument('--index', default=str(DEFAULT_PATH))
+    parser.add_argument('--project-root', default='.')
+    parser.add_argument('--base-path', default=str(BMAD_CORE))
+    parser.add_argument('--tests', nargs='+', default=['tests', 'test', 'src'], help='folders holding tests')
+    args = parser.parse_args(argv)
+
+    with TraceIndex(args.index, args.project_root) as index:
+        changed = index.update_from_config(args.base_path, args.tests)
+        if args.command == 'update':
+            print(f"✅ Trace index updated ({len(changed)} files changed)")
+        elif args.command == 'coverage':
+            if not args.epic:
+                parser.error('coverage needs --epic')
+            print(json.dumps(index.epic_coverage(args.epic), indent=2))
+        else:
+            if not args.story:
+                parser.error('gate needs --story')
+            print(json.dumps(index.gate_trace(args.story), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
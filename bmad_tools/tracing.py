@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Lightweight span tracing for validation and workflow runs
+
+Code marks phases with `span(name, cat)` blocks or the `@traced` decorator.
+While no tracer is active both reduce to a global check and a shared no-op
+object, so instrumented hot paths cost next to nothing. With a tracer active
+every span is recorded with its thread, nesting and self time, and can be
+exported as Chrome trace-event JSON (chrome://tracing, Perfetto) or as a flat
+hotspot table.
+
+Tracing a whole run without touching code:
+
+    python -m bmad_tools.tracing --chrome trace.json -m bmad_tools.schema
+    BMAD_TRACE=trace.json python -m bmad_tools.bench --scales 100
+"""
+
+import argparse
+import atexit
+import functools
+import json
+import os
+import runpy
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_tracer = None
+
+
+class _NullSpan:
+    """Span used while tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start', 'child_ns')
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.child_ns = 0
+
+    def set(self, **args):
+        """Attach arguments shown in the trace viewer"""
+        self.args = dict(self.args or {}, **args)
+
+    def __enter__(self):
+        self.tracer._stack().append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        duration = end - self.start
+        stack = self.tracer._stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_ns += duration
+        self.tracer.events.append((self.name, self.cat, self.start, duration, duration - self.child_ns,
+                                   threading.get_ident(), self.args))
+        return False
+
+
+class Tracer:
+    """Collects finished spans from every thread"""
+
+    def __init__(self):
+        self.events = []
+        self.origin = time.perf_counter_ns()
+        self._local = threading.local()
+        self._threads = {}
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+            self._threads[threading.get_ident()] = threading.current_thread().name
+        return stack
+
+    def chrome_events(self):
+        """Trace events in the Chrome trace-event format (complete 'X' events, microseconds)"""
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                  for tid, name in self._threads.items()]
+        for name, cat, start, duration, _, tid, args in self.events:
+            event = {'name': name, 'cat': cat, 'ph': 'X', 'pid': pid, 'tid': tid,
+                     'ts': (start - self.origin) / 1000, 'dur': duration / 1000}
+            if args:
+                event['args'] = {k: v if isinstance(v, (int, float, bool)) else str(v) for k, v in args.items()}
+            events.append(event)
+        return events
+
+    def write_chrome(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.chrome_events(), 'displayTimeUnit': 'ms'}, f)
+
+    def hotspots(self):
+        """Per span name: count, total, self, mean and max time in ms, by self time descending"""
+        table = {}
+        for name, cat, _, duration, self_ns, _, _ in self.events:
+            row = table.setdefault(name, {'name': name, 'cat': cat, 'count': 0, 'total': 0, 'self': 0, 'max': 0})
+            row['count'] += 1
+            row['total'] += duration
+            row['self'] += self_ns
+            row['max'] = max(row['max'], duration)
+        rows = []
+        for row in table.values():
+            rows.append({'name': row['name'], 'cat': row['cat'], 'count': row['count'],
+                         'total_ms': round(row['total'] / 1e6, 3), 'self_ms': round(row['self'] / 1e6, 3),
+                         'mean_ms': round(row['total'] / row['count'] / 1e6, 4),
+                         'max_ms': round(row['max'] / 1e6, 3)})
+        return sorted(rows, key=lambda r: -r['self_ms'])
+
+
+def span(name, cat='app', **args):
+    """Context manager timing a block; a shared no-op while tracing is off"""
+    tracer = _tracer
+    if tracer is None:
+        return NULL_SPAN
+    return _Span(tracer, name, cat, args or None)
+
+
+def traced(name=None, cat='app', args=None):
+    """Decorator recording each call as a span
+
+    args, when given, is called with the function's arguments (only while
+    tracing) and returns a dict of span arguments.
+    """
+    def decorate(fn):
+        label = name or f'{fn.__module__}.{fn.__qualname__}'
+
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            tracer = _tracer
+            if tracer is None:
+                return fn(*a, **kw)
+            with _Span(tracer, label, cat, args(*a, **kw) if args else None):
+                return fn(*a, **kw)
+        return wrapper
+    return decorate
+
+
+def enable(tracer=None):
+    """Start recording into tracer (a new one by default); returns it"""
+    global _tracer
+    _tracer = tracer or Tracer()
+    return _tracer
+
+
+def disable():
+    """Stop recording; returns the tracer that was active"""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def active():
+    return _tracer
+
+
+@contextmanager
+def tracing():
+    """Record spans for the duration of a with block"""
+    tracer = enable()
+    try:
+        yield tracer
+    finally:
+        disable()
+
+
+def format_hotspots(rows, top=20):
+    """Plain-text hotspot table"""
+    lines = [f"{'span':<40} {'cat':<9} {'count':>7} {'total ms':>10} {'self ms':>10} {'mean ms':>9} {'max ms':>9}"]
+    for r in rows[:top]:
+        lines.append(f"{r['name'][:40]:<40} {r['cat']:<9} {r['count']:>7} {r['total_ms']:>10.3f} "
+                     f"{r['self_ms']:>10.3f} {r['mean_ms']:>9.4f} {r['max_ms']:>9.3f}")
+    return '\n'.join(lines)
+
+
+def _finish(tracer, chrome_path, top):
+    if chrome_path:
+        tracer.write_chrome(chrome_path)
+    print(format_hotspots(tracer.hotspots(), top), file=sys.stderr)
+    if chrome_path:
+        print(f"✅ Chrome trace written to {chrome_path}", file=sys.stderr)
+
+
+def _enable_from_environment():
+    path = os.environ.get('BMAD_TRACE')
+    if path and _tracer is None:
+        tracer = enable()
+        atexit.register(_finish, tracer, path, 20)
+
+
+if __name__ != '__main__':
+    _enable_from_environment()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run a module or script with span tracing enabled')
+    parser.add_argument('--chrome', help='write Chrome trace-event JSON here')
+    parser.add_argument('--top', type=int, default=20, help='rows in the hotspot table')
+    parser.add_argument('-m', dest='module', help='run a module as with python -m')
+    parser.add_argument('target', nargs=argparse.REMAINDER, help='script and arguments, or module arguments')
+    args = parser.parse_args(argv)
+    if not args.module and not args.target:
+        parser.error('give -m module or a script path')
+
+    # Instrumented modules import bmad_tools.tracing, which is a different module object from __main__
+    from bmad_tools import tracing as instrumented
+    tracer = instrumented.enable()
+    code = 0
+    try:
+        if args.module:
+            sys.argv = [args.module] + args.target
+            runpy.run_module(args.module, run_name='__main__', alter_sys=True)
+        else:
+            sys.argv = args.target
+            runpy.run_path(args.target[0], run_name='__main__')
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        instrumented.disable()
+        _finish(tracer, args.chrome, args.top)
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())